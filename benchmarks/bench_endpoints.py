@@ -0,0 +1,183 @@
+"""
+End-to-end benchmark: API endpoints and MCP tools against fake JIRA and Groq
+
+Runs the real Flask app and MCP tools in-process with FakeJira and FakeGroq
+(see fakes.py), sending requests from concurrent threads, and reports
+latency percentiles and throughput per scenario. No credentials needed;
+the real data/ directory is not touched.
+
+Run with:
+    python benchmarks/bench_endpoints.py
+    python benchmarks/bench_endpoints.py --tickets 5000 --jira-latency-ms 150 --llm-latency-ms 800 \\
+        --requests 100 --concurrency 16 --only query,statistics
+    python benchmarks/bench_endpoints.py --llm-failure-rate 0.1 --llm-rate-limit-rate 0.1 --json results.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from fakes import FakeGroq, FakeJira, fake_services  # noqa: E402
+from load_test import QUERIES, percentile  # noqa: E402
+
+
+def scenarios(api: Any, mcp: Any, keys: List[str]) -> Dict[str, Callable[[int], bool]]:
+    """Named request functions; each sends request ``i`` and returns whether it succeeded"""
+    client = api.app.test_client
+
+    def query(i: int) -> bool:
+        response = client().post("/api/query", json={"query": f"{QUERIES[i % len(QUERIES)]} (#{i})"})
+        return response.status_code == 200
+
+    def batch_query(i: int) -> bool:
+        response = client().post("/api/query/batch", json={
+            "queries": [f"{q} (#{i})" for q in QUERIES[:4]]
+        })
+        return response.status_code == 200 and b'"failed": 0' in response.data
+
+    def tickets_search(i: int) -> bool:
+        response = client().post("/api/tickets/search", json={"max_results": 50, "days_back": 30})
+        return response.status_code == 200
+
+    def tickets_batch(i: int) -> bool:
+        response = client().post("/api/tickets/batch", json={"keys": keys[i % 10 * 20:(i % 10 + 1) * 20]})
+        return response.status_code == 200
+
+    def statistics(i: int) -> bool:
+        response = client().post("/api/analytics/statistics", json={"days_back": 30})
+        return response.status_code == 200
+
+    def insights(i: int) -> bool:
+        response = client().post("/api/insights", json={"days_back": 30})
+        return response.status_code == 200
+
+    def mcp_search(i: int) -> bool:
+        return bool(mcp.search_historical_tickets(QUERIES[i % len(QUERIES)], max_results=50))
+
+    def mcp_details(i: int) -> bool:
+        return not mcp.get_multiple_ticket_details(keys[i % 10 * 20:(i % 10 + 1) * 20])["missing"]
+
+    def mcp_statistics(i: int) -> bool:
+        return "error" not in mcp.get_ticket_statistics(days_back=30)
+
+    return {
+        "query": query,
+        "query_batch": batch_query,
+        "tickets_search": tickets_search,
+        "tickets_batch": tickets_batch,
+        "statistics": statistics,
+        "insights": insights,
+        "mcp_search_historical_tickets": mcp_search,
+        "mcp_get_multiple_ticket_details": mcp_details,
+        "mcp_get_ticket_statistics": mcp_statistics,
+    }
+
+
+def run_scenario(send: Callable[[int], bool], total: int, concurrency: int) -> Dict[str, float]:
+    """Send ``total`` requests with ``concurrency`` threads"""
+    def timed(i: int) -> Optional[float]:
+        started = time.perf_counter()
+        try:
+            ok = send(i)
+        except Exception:
+            ok = False
+        return (time.perf_counter() - started) * 1000 if ok else None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(timed, range(total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [r for r in results if r is not None]
+    return {
+        "requests": total,
+        "errors": total - len(latencies),
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--tickets", type=int, default=2000, help="Fake JIRA corpus size")
+    parser.add_argument("--jira-latency-ms", type=float, default=100)
+    parser.add_argument("--jira-jitter-ms", type=float, default=50)
+    parser.add_argument("--jira-failure-rate", type=float, default=0.0)
+    parser.add_argument("--jira-cloud", action="store_true", help="Fake Jira Cloud (cursor pagination)")
+    parser.add_argument("--llm-latency-ms", type=float, default=500)
+    parser.add_argument("--llm-jitter-ms", type=float, default=250)
+    parser.add_argument("--llm-tokens-per-second", type=float, default=0)
+    parser.add_argument("--llm-failure-rate", type=float, default=0.0)
+    parser.add_argument("--llm-rate-limit-rate", type=float, default=0.0, help="Fraction of LLM calls answered 429")
+    parser.add_argument("--keep-rate-limits", action="store_true", help="Apply llm.rate_limit from config.yaml")
+    parser.add_argument("--requests", type=int, default=50, help="Requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--only", help="Comma-separated scenarios to run")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    jira = FakeJira(
+        tickets=args.tickets,
+        latency_ms=args.jira_latency_ms,
+        jitter_ms=args.jira_jitter_ms,
+        failure_rate=args.jira_failure_rate,
+        cloud=args.jira_cloud
+    )
+    llm = FakeGroq(
+        latency_ms=args.llm_latency_ms,
+        jitter_ms=args.llm_jitter_ms,
+        tokens_per_second=args.llm_tokens_per_second,
+        failure_rate=args.llm_failure_rate,
+        rate_limit_rate=args.llm_rate_limit_rate
+    )
+
+    with tempfile.TemporaryDirectory() as data_dir, fake_services(data_dir, jira, llm):
+        from backend import api
+        from backend.llm_dispatch import LLMDispatcher
+        from mcp_server import jira_mcp_server as mcp
+
+        api.init_components()
+        if api.llm_agent is None:
+            sys.exit("Components failed to initialize")
+        if not args.keep_rate_limits:
+            api.llm_agent.dispatcher = LLMDispatcher(max_retries=3, backoff_seconds=0.05)
+
+        keys = list(jira.by_key)
+        selected = scenarios(api, mcp, keys)
+        if args.only:
+            selected = {name: selected[name] for name in args.only.split(",")}
+
+        print(
+            f"{args.tickets} tickets, JIRA {args.jira_latency_ms:.0f}ms, LLM {args.llm_latency_ms:.0f}ms, "
+            f"{args.requests} requests x {args.concurrency} threads\n"
+        )
+        print(f"{'scenario':<34}{'req/s':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+
+        results: Dict[str, Dict[str, float]] = {}
+        for name, send in selected.items():
+            stats = run_scenario(send, args.requests, args.concurrency)
+            results[name] = stats
+            print(
+                f"{name:<34}{stats['throughput']:8.1f}{stats['p50']:10.0f}{stats['p95']:10.0f}"
+                f"{stats['p99']:10.0f}{stats['errors']:8.0f}"
+            )
+
+        print(f"\nJIRA calls: {dict(jira.calls)}  LLM calls: {dict(llm.calls)}")
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump({"config": vars(args), "results": results}, f, indent=2)
+
+        api.shutdown_components()
+
+
+if __name__ == "__main__":
+    main()
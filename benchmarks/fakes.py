@@ -0,0 +1,464 @@
+"""
+In-process stand-ins for JIRA and Groq
+
+FakeJira answers the ``jira.JIRA`` calls JiraClient makes (search, enhanced
+search and issue lookups), and AsyncJiraClient's REST calls, from a synthetic
+corpus; FakeGroq is a LangChain chat model that returns well-formed answers
+for each of the agent's prompts.
+Both have configurable latency and failure injection, so the API and MCP
+tools can be exercised and timed without credentials.
+
+Example:
+    with fake_services(data_dir, FakeJira(tickets=2000, latency_ms=150), FakeGroq(latency_ms=800)):
+        from backend import api
+        api.init_components()
+"""
+
+import asyncio
+import contextlib
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from unittest import mock
+
+import httpx
+from jira.exceptions import JIRAError
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from pydantic import PrivateAttr
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+JIRA_URL = "https://fake-jira.example.com"
+
+STATUSES = ["Open", "In Progress", "Resolved", "Done", "Closed"]
+PRIORITIES = ["Highest", "High", "Medium", "Low"]
+ISSUE_TYPES = ["Bug", "Task", "Story", "Support"]
+RESOLUTIONS = [None, "Fixed", "Done", "Won't Fix"]
+PEOPLE = [f"Engineer {i}" for i in range(25)]
+LABELS = ["api", "auth", "database", "frontend", "performance", "billing", "mobile"]
+WORDS = (
+    "login timeout error database connection pool exhausted request failed retry "
+    "user session token expired cache invalidation deploy rollback latency spike "
+    "export report csv payment webhook upload photo crash dashboard search index"
+).split()
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def _jira_time(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+def synthetic_issues(
+    count: int,
+    projects: Sequence[str] = ("PROD", "TECH", "SUP"),
+    days: int = 120,
+    seed: int = 7
+) -> List[Dict[str, Any]]:
+    """Raw REST (v2) issues spread over the last ``days`` days, newest first"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    issues = []
+    for i in range(count):
+        key = f"{projects[i % len(projects)]}-{i // len(projects) + 1}"
+        created = now - timedelta(days=rng.uniform(0, days))
+        updated = min(now, created + timedelta(hours=rng.uniform(0, 240)))
+        resolution = rng.choice(RESOLUTIONS)
+        issues.append({
+            "key": key,
+            "fields": {
+                "summary": _sentence(rng, 8),
+                "description": _sentence(rng, 80),
+                "issuetype": {"name": rng.choice(ISSUE_TYPES)},
+                "status": {"name": rng.choice(STATUSES[2:] if resolution else STATUSES[:2])},
+                "resolution": {"name": resolution} if resolution else None,
+                "created": _jira_time(created),
+                "updated": _jira_time(updated),
+                "priority": {"name": rng.choice(PRIORITIES)},
+                "assignee": {"displayName": rng.choice(PEOPLE)},
+                "reporter": {"displayName": rng.choice(PEOPLE)},
+                "labels": rng.sample(LABELS, 2),
+                "comment": {"comments": [
+                    {
+                        "author": {"displayName": rng.choice(PEOPLE)},
+                        "body": _sentence(rng, 40),
+                        "created": _jira_time(updated)
+                    }
+                    for _ in range(rng.randint(0, 6))
+                ]}
+            }
+        })
+    issues.sort(key=lambda issue: issue["fields"]["updated"], reverse=True)
+    return issues
+
+
+class FakeJira:
+    """
+    Stand-in for ``jira.JIRA`` serving a synthetic corpus
+
+    Understands the JQL JiraClient generates: project, issuetype and status
+    filters, ``key in (...)`` and ``updated >=`` with a date or a relative
+    offset (``-90d``, ``-5m``). Results are ordered by ``updated`` descending.
+
+    Args:
+        tickets: Corpus size
+        latency_ms: Delay per request
+        jitter_ms: Random extra delay per request (uniform, 0..jitter_ms)
+        failure_rate: Fraction of requests failing with a 503 JIRAError
+        cloud: Behave like Jira Cloud (cursor pagination)
+    """
+
+    def __init__(
+        self,
+        tickets: int = 1000,
+        projects: Sequence[str] = ("PROD", "TECH", "SUP"),
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        failure_rate: float = 0.0,
+        cloud: bool = False,
+        seed: int = 7
+    ):
+        self.issues = synthetic_issues(tickets, projects, seed=seed)
+        self.by_key = {issue["key"]: issue for issue in self.issues}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.failure_rate = failure_rate
+        self._is_cloud = cloud
+        self.calls: Counter = Counter()
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs) -> "FakeJira":
+        """Act as the ``JIRA`` class: every client shares this instance"""
+        return self
+
+    def _start(self, name: str) -> Tuple[float, bool]:
+        """Count a request; returns its delay in seconds and whether it fails"""
+        with self._lock:
+            self.calls[name] += 1
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            fail = self._rng.random() < self.failure_rate
+        return delay / 1000, fail
+
+    def _request(self, name: str):
+        delay, fail = self._start(name)
+        time.sleep(delay)
+        if fail:
+            raise JIRAError("Injected failure", status_code=503)
+
+    def _matching(self, jql: str) -> List[Dict[str, Any]]:
+        condition = re.split(r"\s+ORDER BY\s+", jql, flags=re.IGNORECASE)[0]
+        projects = set(re.findall(r"project\s*=\s*'?(\w+)'?", condition))
+        types = set(re.findall(r"issuetype\s*=\s*'([^']+)'", condition))
+        statuses = set(re.findall(r"status\s*=\s*'([^']+)'", condition))
+        keys_match = re.search(r"key\s+in\s*\(([^)]*)\)", condition, flags=re.IGNORECASE)
+        keys = {k.strip(" '\"") for k in keys_match.group(1).split(",")} if keys_match else None
+
+        since = None
+        relative = re.search(r"updated\s*>=\s*-(\d+)([dm])", condition)
+        absolute = re.search(r"updated\s*>=\s*['\"]([\d-]+(?: [\d:]+)?)['\"]", condition)
+        if relative:
+            amount, unit = int(relative.group(1)), relative.group(2)
+            delta = timedelta(days=amount) if unit == "d" else timedelta(minutes=amount)
+            since = _jira_time(datetime.now(timezone.utc) - delta)
+        elif absolute:
+            since = absolute.group(1).replace(" ", "T")
+
+        def keep(issue: Dict[str, Any]) -> bool:
+            fields = issue["fields"]
+            return (
+                (not projects or issue["key"].split("-")[0] in projects)
+                and (not types or fields["issuetype"]["name"] in types)
+                and (not statuses or fields["status"]["name"] in statuses)
+                and (keys is None or issue["key"] in keys)
+                and (since is None or fields["updated"] >= since)
+            )
+
+        return [issue for issue in self.issues if keep(issue)]
+
+    @staticmethod
+    def _project(issue: Dict[str, Any], fields: Optional[Any]) -> Dict[str, Any]:
+        if not fields:
+            return issue
+        if isinstance(fields, str):
+            fields = fields.split(",")
+        return {"key": issue["key"], "fields": {f: issue["fields"].get(f) for f in fields}}
+
+    def search_issues(
+        self,
+        jql: str,
+        startAt: int = 0,
+        maxResults: int = 50,
+        fields: Optional[Any] = None,
+        json_result: bool = True,
+        **kwargs
+    ) -> Dict[str, Any]:
+        self._request("search")
+        return self._offset_page(jql, startAt, maxResults, fields)
+
+    def _offset_page(self, jql: str, startAt: int, maxResults: int, fields: Optional[Any]) -> Dict[str, Any]:
+        matching = self._matching(jql)
+        page = matching[startAt:startAt + maxResults]
+        return {
+            "startAt": startAt,
+            "maxResults": maxResults,
+            "total": len(matching),
+            "issues": [self._project(issue, fields) for issue in page]
+        }
+
+    def enhanced_search_issues(
+        self,
+        jql: str,
+        nextPageToken: Optional[str] = None,
+        maxResults: int = 50,
+        fields: Optional[Any] = None,
+        json_result: bool = True,
+        **kwargs
+    ) -> Dict[str, Any]:
+        self._request("search")
+        return self._cursor_page(jql, nextPageToken, maxResults, fields)
+
+    def _cursor_page(
+        self, jql: str, nextPageToken: Optional[str], maxResults: int, fields: Optional[Any]
+    ) -> Dict[str, Any]:
+        matching = self._matching(jql)
+        start = int(nextPageToken or 0)
+        page = matching[start:start + maxResults]
+        end = start + len(page)
+        result: Dict[str, Any] = {
+            "issues": [self._project(issue, fields) for issue in page],
+            "isLast": end >= len(matching)
+        }
+        if not result["isLast"]:
+            result["nextPageToken"] = str(end)
+        return result
+
+    def issue(self, key: str, fields: Optional[Any] = None) -> SimpleNamespace:
+        self._request("issue")
+        if key not in self.by_key:
+            raise JIRAError("Issue does not exist", status_code=404)
+        return SimpleNamespace(raw=self._project(self.by_key[key], fields), key=key)
+
+    def transport(self) -> httpx.MockTransport:
+        """httpx transport serving AsyncJiraClient's REST calls from the same corpus and counters"""
+        async def handle(request: httpx.Request) -> httpx.Response:
+            path, params = request.url.path, request.url.params
+            if path == "/rest/api/2/serverInfo":
+                return httpx.Response(200, json={"deploymentType": "Cloud" if self._is_cloud else "Server"})
+
+            kind = "issue" if path.startswith("/rest/api/2/issue/") else "search"
+            delay, fail = self._start(kind)
+            await asyncio.sleep(delay)
+            if fail:
+                return httpx.Response(503, json={"errorMessages": ["Injected failure"]})
+
+            size = int(params.get("maxResults", 50))
+            if kind == "issue":
+                key = path.rsplit("/", 1)[1]
+                if key not in self.by_key:
+                    return httpx.Response(404, json={"errorMessages": ["Issue does not exist"]})
+                return httpx.Response(200, json=self._project(self.by_key[key], params.get("fields")))
+            if path == "/rest/api/2/search/jql":
+                return httpx.Response(200, json=self._cursor_page(
+                    params["jql"], params.get("nextPageToken"), size, params.get("fields")
+                ))
+            return httpx.Response(200, json=self._offset_page(
+                params["jql"], int(params.get("startAt", 0)), size, params.get("fields")
+            ))
+
+        return httpx.MockTransport(handle)
+
+
+class FakeRateLimitError(Exception):
+    """Shaped like the Groq SDK's 429 error (status code and Retry-After)"""
+
+    status_code = 429
+
+    def __init__(self, retry_after: float):
+        super().__init__("Rate limit reached (injected)")
+        self.response = SimpleNamespace(headers={"retry-after": str(retry_after)})
+
+
+class FakeGroq(BaseChatModel):
+    """
+    Stand-in for ``ChatGroq`` answering the agent's prompts
+
+    Recognises the analysis, matching, resolution and insights prompts and
+    returns JSON (or text) in the shape each one asks for; matching picks
+    the first candidates listed in the prompt. Reports usage like Groq does.
+
+    Args:
+        latency_ms: Time to first token
+        jitter_ms: Random extra latency (uniform, 0..jitter_ms)
+        tokens_per_second: Output pace after the first token (0 = instant)
+        failure_rate: Fraction of calls raising an error (exercises fallbacks)
+        rate_limit_rate: Fraction of calls raising a 429 (exercises retries)
+    """
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    tokens_per_second: float = 0.0
+    failure_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: float = 0.05
+    seed: int = 7
+
+    _rng: random.Random = PrivateAttr()
+    _lock: threading.Lock = PrivateAttr()
+    _calls: Counter = PrivateAttr()
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+        self._calls = Counter()
+
+    def __call__(self, *args, **kwargs) -> "FakeGroq":
+        """Act as the ``ChatGroq`` class: every agent shares this instance"""
+        return self
+
+    @property
+    def calls(self) -> Counter:
+        """Calls made, by prompt kind"""
+        return self._calls
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-groq"
+
+    @staticmethod
+    def _kind(prompt: str) -> str:
+        if "Analyze the following user query" in prompt:
+            return "analysis"
+        if "Similar Historical Tickets:" in prompt:
+            return "resolution"
+        if "Historical Tickets:" in prompt:
+            return "matching"
+        if "Partial Insights:" in prompt:
+            return "insights_reduce"
+        return "insights"
+
+    def _reply(self, kind: str, prompt: str) -> str:
+        if kind == "analysis":
+            query = prompt.split("User Query:", 1)[-1].split("\n\n", 1)[0].strip()
+            terms = [w for w in re.findall(r"[a-z]{4,}", query.lower())][:5]
+            return (
+                '{"main_problem": "%s", "key_terms": [%s], "issue_type": "bug", '
+                '"priority": "medium", "summary": "%s"}'
+                % (query[:80].replace('"', "'"), ", ".join(f'"{t}"' for t in terms), query[:60].replace('"', "'"))
+            )
+        if kind == "matching":
+            keys = list(dict.fromkeys(re.findall(r"\[([A-Z][A-Z0-9]*-\d+)\]", prompt)))[:5]
+            matches = ", ".join(
+                '{"ticket_key": "%s", "relevance_score": %d, "reasoning": "Similar symptoms", '
+                '"has_solution": true, "solution_summary": "Restart the affected service"}' % (key, 9 - i)
+                for i, key in enumerate(keys)
+            )
+            return '{"matches": [%s]}' % matches
+        if kind == "resolution":
+            keys = list(dict.fromkeys(re.findall(r"[A-Z][A-Z0-9]*-\d+", prompt)))[:3]
+            return (
+                "Based on similar tickets (" + ", ".join(keys) + "), this is a known issue. "
+                "1. Check the service logs for the failing request. "
+                "2. Clear the cache and restart the affected service. "
+                "3. If the problem persists, roll back the last deploy and escalate to the owning team."
+            )
+        return (
+            '{"common_issues": ["login timeout", "connection pool exhausted"], '
+            '"common_resolutions": ["restart service", "increase pool size"], '
+            '"recommendations": ["document the restart procedure"]}'
+        )
+
+    def _prepare(self, messages: List[BaseMessage]) -> Tuple[str, str]:
+        prompt = "\n".join(str(m.content) for m in messages)
+        kind = self._kind(prompt)
+        with self._lock:
+            self._calls[kind] += 1
+            delay = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+            roll = self._rng.random()
+        time.sleep(delay / 1000)
+        if roll < self.rate_limit_rate:
+            raise FakeRateLimitError(self.retry_after_seconds)
+        if roll < self.rate_limit_rate + self.failure_rate:
+            raise RuntimeError("Injected LLM failure")
+        return prompt, self._reply(kind, prompt)
+
+    @staticmethod
+    def _usage(prompt: str, reply: str) -> Dict[str, int]:
+        input_tokens, output_tokens = len(prompt) // 4, len(reply) // 4
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens
+        }
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        prompt, reply = self._prepare(messages)
+        if self.tokens_per_second:
+            time.sleep(len(reply) / 4 / self.tokens_per_second)
+        message = AIMessage(content=reply, usage_metadata=self._usage(prompt, reply))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                run_manager: Any = None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        _, reply = self._prepare(messages)
+        for word in re.findall(r"\S+\s*", reply):
+            if self.tokens_per_second:
+                time.sleep(max(1, len(word) // 4) / self.tokens_per_second)
+            yield ChatGenerationChunk(message=AIMessageChunk(content=word))
+
+
+@contextlib.contextmanager
+def fake_services(data_dir: str, jira: FakeJira, llm: FakeGroq) -> Iterator[None]:
+    """
+    Point the app at the fakes while the context is active
+
+    Credentials are set to dummies, ``jira.JIRA``, AsyncJiraClient's HTTP
+    transport and ``ChatGroq`` are replaced by the fakes, and the ticket
+    mirror and index files are kept under ``data_dir`` so the real ``data/``
+    directory is never touched.
+    Must be entered before ``backend.api`` or the MCP server is imported.
+    """
+    from backend import async_jira_client, llm_agent, ticket_store
+
+    real_store = ticket_store.TicketStore
+    real_async_client = async_jira_client.AsyncJiraClient
+
+    class IsolatedTicketStore(real_store):  # type: ignore[misc, valid-type]
+        def __init__(self, path: str):
+            super().__init__(os.path.join(data_dir, os.path.basename(path)))
+
+    class FakeAsyncJiraClient(real_async_client):  # type: ignore[misc, valid-type]
+        def __init__(self, *args: Any, **kwargs: Any):
+            kwargs.setdefault("transport", jira.transport())
+            super().__init__(*args, **kwargs)
+
+    def data_path(path: Optional[str]) -> Optional[str]:
+        return os.path.join(data_dir, os.path.basename(path)) if path else None
+
+    with contextlib.ExitStack() as stack:
+        stack.enter_context(mock.patch.dict(os.environ, {
+            "JIRA_URL": JIRA_URL,
+            "JIRA_EMAIL": "bench@example.com",
+            "JIRA_API_TOKEN": "fake",
+            "GROQ_API_KEY": "fake",
+            "COMPONENT_INIT": "lazy"
+        }))
+        stack.enter_context(mock.patch("jira.JIRA", jira))
+        stack.enter_context(mock.patch.object(ticket_store, "TicketStore", IsolatedTicketStore))
+        stack.enter_context(mock.patch.object(async_jira_client, "AsyncJiraClient", FakeAsyncJiraClient))
+        stack.enter_context(mock.patch.object(llm_agent, "ChatGroq", llm))
+        stack.enter_context(mock.patch.object(llm_agent.JiraLLMAgent, "_data_path", staticmethod(data_path)))
+        yield
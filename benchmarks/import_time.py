@@ -0,0 +1,130 @@
+"""
+Cold-start benchmark: module import time and time to first request
+
+Starts fresh interpreters and measures (1) the cumulative import time of
+the backend modules with `python -X importtime`, listing the packages that
+cost the most, and (2) the wall time from interpreter start until the app
+has answered its first /health request. No credentials or network needed.
+With budgets set it exits non-zero when they are exceeded, for CI.
+
+Run with:
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 7 --max-import-ms 400 --max-first-request-ms 1500 --json import-time.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+MODULES = ["backend.api", "mcp_server.jira_mcp_server"]
+
+FIRST_REQUEST = (
+    "from backend.api import app\n"
+    "assert app.test_client().get('/health').status_code == 200\n"
+)
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ, PYTHONPATH=SRC, PYTHONDONTWRITEBYTECODE="1", COMPONENT_INIT="lazy")
+    # Import must not depend on credentials
+    for name in ("JIRA_URL", "JIRA_EMAIL", "JIRA_API_TOKEN", "GROQ_API_KEY"):
+        env.pop(name, None)
+    return env
+
+
+def import_profile(module: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Import ``module`` in a fresh interpreter
+
+    Returns:
+        Cumulative import time of the module (ms) and the import time of each
+        package it pulled in (ms; a package's time includes the packages it
+        imported itself, e.g. flask includes werkzeug)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=_env(), cwd=SRC, capture_output=True, text=True, check=True
+    )
+    # Each line is "self | cumulative | name", indented two spaces per level,
+    # and a module's imports are listed before it: read backwards, parents
+    # come first. A package is charged for its outermost imports only.
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            depth = (len(name) - len(name.lstrip()) - 1) // 2
+            entries.append((depth, name.strip(), int(cumulative) / 1000))
+
+    own = module.split(".")[0]
+    total = 0.0
+    packages: Dict[str, float] = {}
+    stack: List[Tuple[int, str]] = []
+    for depth, name, ms in reversed(entries):
+        root = name.split(".")[0]
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        if depth == 0:
+            if name == module:
+                total = ms
+            in_module = name == module or module.startswith(name + ".")
+        elif in_module and root != own and stack[-1][1] != root:
+            packages[root] = packages.get(root, 0.0) + ms
+        stack.append((depth, root))
+    return total, packages
+
+
+def first_request_ms() -> float:
+    """Wall time (ms) from starting an interpreter until /health has been answered"""
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", FIRST_REQUEST], env=_env(), cwd=SRC, check=True)
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement (median is reported)")
+    parser.add_argument("--top", type=int, default=10, help="Most expensive packages to list")
+    parser.add_argument("--max-import-ms", type=float, help="Fail if backend.api imports slower than this")
+    parser.add_argument("--max-first-request-ms", type=float, help="Fail if the first request takes longer")
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {}
+    for module in MODULES:
+        profiles = [import_profile(module) for _ in range(args.runs)]
+        total = statistics.median(t for t, _ in profiles)
+        packages = profiles[-1][1]
+        results[module] = {"import_ms": total}
+        print(f"{module}: {total:.0f} ms")
+        top: List[Tuple[str, float]] = sorted(packages.items(), key=lambda p: -p[1])[:args.top]
+        for name, ms in top:
+            print(f"    {name:<32}{ms:8.0f} ms")
+
+    first = statistics.median(first_request_ms() for _ in range(args.runs))
+    results["first_request"] = {"wall_ms": first}
+    print(f"\nTime to first request (interpreter start to /health): {first:.0f} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"runs": args.runs, "python": sys.version.split()[0], "results": results}, f, indent=2)
+
+    failures = []
+    if args.max_import_ms is not None and results["backend.api"]["import_ms"] > args.max_import_ms:
+        failures.append(f"backend.api import {results['backend.api']['import_ms']:.0f} ms > {args.max_import_ms:.0f} ms")
+    if args.max_first_request_ms is not None and first > args.max_first_request_ms:
+        failures.append(f"first request {first:.0f} ms > {args.max_first_request_ms:.0f} ms")
+    if failures:
+        sys.exit("Over budget: " + "; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
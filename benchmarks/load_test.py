@@ -0,0 +1,158 @@
+"""
+Load test: concurrent /api/query throughput
+
+Sends queries from many client threads and reports throughput and latency
+percentiles. Either targets a running server (--url) or, with --workers,
+starts `main.py backend` once per worker count to show how throughput
+scales with the number of gunicorn workers.
+
+Run with:
+    python benchmarks/load_test.py --url http://localhost:5000 --concurrency 16 --requests 200
+    python benchmarks/load_test.py --workers 1,2,4 --threads 4 --concurrency 32
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+QUERIES = [
+    "Users cannot login after password reset",
+    "API returns 500 error on authentication",
+    "Export to CSV times out for large reports",
+    "Dashboard loads slowly after the last deploy",
+    "Payment webhook retries are failing",
+    "Mobile app crashes when uploading photos",
+    "Search results are missing recently created tickets",
+    "Database connection pool exhausted under load",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values``"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_load(
+    url: str,
+    total: int,
+    concurrency: int,
+    endpoint: str = "/api/query",
+    offset: int = 0
+) -> Dict[str, float]:
+    """Send ``total`` distinct queries (numbered from ``offset``) with ``concurrency`` client threads"""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def send(i: int) -> Optional[float]:
+        started = time.perf_counter()
+        try:
+            response = session.post(
+                url.rstrip("/") + endpoint,
+                json={"query": f"{QUERIES[i % len(QUERIES)]} (#{i})"},
+                timeout=300
+            )
+            response.raise_for_status()
+        except requests.RequestException:
+            return None
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(send, range(offset, offset + total)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [r for r in results if r is not None]
+    return {
+        "requests": total,
+        "errors": total - len(latencies),
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int, threads: Optional[int]) -> Tuple[subprocess.Popen, str]:
+    """Start the backend with ``workers`` gunicorn workers and wait until it answers"""
+    port = free_port()
+    command = [
+        sys.executable, "main.py", "backend",
+        "--workers", str(workers), "--bind", f"127.0.0.1:{port}"
+    ]
+    if threads:
+        command += ["--threads", str(threads)]
+    server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    url = f"http://127.0.0.1:{port}"
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url + "/health", timeout=1).ok:
+                return server, url
+        except requests.RequestException:
+            time.sleep(0.25)
+    server.terminate()
+    raise RuntimeError(f"Backend with {workers} workers did not start")
+
+
+def report(label: str, stats: Dict[str, float]):
+    print(
+        f"{label:<12} {stats['throughput']:8.1f} req/s   "
+        f"p50 {stats['p50']:7.0f} ms   p95 {stats['p95']:7.0f} ms   p99 {stats['p99']:7.0f} ms   "
+        f"errors {stats['errors']:.0f}/{stats['requests']:.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--url", default="http://localhost:5000", help="Server to test (ignored with --workers)")
+    parser.add_argument("--workers", help="Comma-separated worker counts to start and compare, e.g. 1,2,4")
+    parser.add_argument("--threads", type=int, help="Threads per worker for started servers")
+    parser.add_argument("--concurrency", type=int, default=16, help="Client threads")
+    parser.add_argument("--requests", type=int, default=100, help="Queries per run")
+    parser.add_argument("--endpoint", default="/api/query")
+    args = parser.parse_args()
+
+    if not args.workers:
+        report(args.url, run_load(args.url, args.requests, args.concurrency, args.endpoint))
+        return
+
+    for workers in [int(w) for w in args.workers.split(",")]:
+        server, url = start_server(workers, args.threads)
+        try:
+            # Warm up caches and connection pools before measuring
+            warmup = min(args.concurrency, args.requests)
+            run_load(url, warmup, args.concurrency, args.endpoint)
+            report(
+                f"{workers} worker(s)",
+                run_load(url, args.requests, args.concurrency, args.endpoint, offset=warmup)
+            )
+        finally:
+            server.terminate()
+            server.wait(timeout=60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Memory benchmark: ticket dicts vs compact Ticket records
+
+Builds the same synthetic tickets both ways, decoding them from JSON as the
+mirror and JIRA responses do, and reports the memory held by each.
+
+Run with: python benchmarks/ticket_memory.py [--tickets 1000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from backend.tickets import Ticket, TicketCollection  # noqa: E402
+
+STATUSES = ["Open", "In Progress", "Resolved", "Done", "Closed"]
+PRIORITIES = ["Highest", "High", "Medium", "Low"]
+PEOPLE = [f"Engineer {i}" for i in range(25)]
+LABELS = ["api", "auth", "database", "frontend", "performance", "billing", "mobile"]
+WORDS = (
+    "login timeout error database connection pool exhausted request failed retry "
+    "user session token expired cache invalidation deploy rollback latency spike"
+).split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def synthetic_tickets(count: int, seed: int = 7) -> str:
+    """JSON text for ``count`` tickets in the format_ticket shape"""
+    rng = random.Random(seed)
+    tickets = []
+    for i in range(count):
+        key = f"PROD-{i + 1}"
+        tickets.append({
+            "key": key,
+            "summary": sentence(rng, 8),
+            "description": sentence(rng, 80),
+            "issue_type": rng.choice(["Bug", "Task", "Story"]),
+            "status": rng.choice(STATUSES),
+            "resolution": rng.choice([None, "Fixed", "Won't Fix"]),
+            "created": "2024-05-01T10:00:00.000+0000",
+            "updated": f"2024-06-{rng.randint(1, 28):02d}T10:00:00.000+0000",
+            "priority": rng.choice(PRIORITIES),
+            "assignee": rng.choice(PEOPLE),
+            "reporter": rng.choice(PEOPLE),
+            "labels": rng.sample(LABELS, 2),
+            "url": f"https://example.atlassian.net/browse/{key}",
+            "comments": [
+                {
+                    "author": rng.choice(PEOPLE),
+                    "body": sentence(rng, 40),
+                    "created": "2024-05-02T10:00:00.000+0000"
+                }
+                for _ in range(rng.randint(0, 6))
+            ]
+        })
+    return json.dumps(tickets)
+
+
+def measure(build):
+    """Bytes still allocated by the object ``build`` returns"""
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return current, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tickets", type=int, default=1000, help="number of tickets (default: 1000)")
+    args = parser.parse_args()
+
+    payload = synthetic_tickets(args.tickets)
+
+    dict_bytes, dicts = measure(lambda: json.loads(payload))
+    del dicts
+    record_bytes, records = measure(
+        lambda: TicketCollection(Ticket.from_dict(t) for t in json.loads(payload))
+    )
+    del records
+
+    print(f"Tickets:          {args.tickets}")
+    print(f"dicts:            {dict_bytes / 1024:10.1f} KiB ({dict_bytes / args.tickets:7.0f} B/ticket)")
+    print(f"Ticket records:   {record_bytes / 1024:10.1f} KiB ({record_bytes / args.tickets:7.0f} B/ticket)")
+    print(f"Reduction:        {100 * (1 - record_bytes / dict_bytes):10.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Gunicorn configuration for the backend API
+Started by `python main.py backend`; every setting can be overridden by environment variables
+"""
+
+import os
+
+wsgi_app = "backend.api:app"
+pythonpath = "src"
+
+bind = f"{os.getenv('FLASK_HOST', '0.0.0.0')}:{os.getenv('PORT', os.getenv('FLASK_PORT', '5000'))}"
+
+# Processes x threads: requests mostly wait on JIRA and Groq, so threads
+# give concurrency within a worker. One worker by default: it is then the
+# only process writing the search index files. Several workers open them
+# read-only (see post_worker_init), so run `python main.py sync` to keep
+# the files up to date.
+workers = int(os.getenv("WEB_CONCURRENCY", 1))
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", 8))
+preload_app = os.getenv("GUNICORN_PRELOAD", "true").lower() == "true"
+
+# LLM calls can be slow; a worker silent for longer than this is restarted
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 120))
+# On SIGTERM, workers stop accepting and finish in-flight requests for this long
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+
+# Recycle workers now and then to bound memory growth
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 1000))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", 100))
+
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
+accesslog = "-"
+
+
+def post_worker_init(worker):
+    """
+    Start building the worker's LLM agent and JIRA client in the background
+
+    The app module is light and may be preloaded in the master; the agent
+    and client (and the langchain/jira imports behind them) are created in
+    each worker after the fork, without holding up its first requests.
+    /ready turns 200 when they are done.
+    
+    Index files must have a single writer, so with several workers none of
+    them saves the indexes (INDEX_MODE=read) unless INDEX_MODE says otherwise.
+    """
+    if worker.cfg.workers > 1:
+        os.environ.setdefault("INDEX_MODE", "read")
+    from backend import api
+    if api.COMPONENT_INIT == "background":
+        api.start_component_init()
+    worker.log.info("Worker %s booted", worker.pid)
+
+
+def worker_exit(server, worker):
+    """Release pools and the ticket mirror after the last request finished"""
+    from backend import api
+    api.shutdown_components()
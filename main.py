@@ -6,18 +6,44 @@ Provides CLI interface to start different components
 import sys
 import os
 import subprocess
+import importlib.util
 from argparse import ArgumentParser
 
-def start_backend():
-    """Start Flask Backend API"""
-    print("🚀 Starting Flask Backend API...")
-    subprocess.run([sys.executable, "src/backend/api.py"])
+def start_backend(args):
+    """Start Flask Backend API (gunicorn workers, or the Flask dev server with --dev)"""
+    # gunicorn does not run on Windows; fall back to the dev server there
+    if args.dev or os.name == "nt" or importlib.util.find_spec("gunicorn") is None:
+        print("🚀 Starting Flask Backend API (development server)...")
+        subprocess.run([sys.executable, "src/backend/api.py"])
+        return
+    
+    command = [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py"]
+    if args.workers:
+        command += ["--workers", str(args.workers)]
+    if args.threads:
+        command += ["--threads", str(args.threads)]
+    if args.graceful_timeout:
+        command += ["--graceful-timeout", str(args.graceful_timeout)]
+    if args.bind:
+        command += ["--bind", args.bind]
+    
+    print("🚀 Starting Flask Backend API (gunicorn)...")
+    subprocess.run(command, cwd=os.path.dirname(os.path.abspath(__file__)))
 
 def start_frontend():
     """Start Streamlit Frontend"""
     print("🎨 Starting Streamlit Frontend...")
     subprocess.run(["streamlit", "run", "src/frontend/app.py"])
 
+def start_sync(args):
+    """Start the background sync scheduler (keeps the ticket mirror and indexes warm)"""
+    print("🔄 Starting JIRA sync scheduler...")
+    command = [sys.executable, "-m", "backend.sync_scheduler"]
+    if args.once:
+        command.append("--once")
+    result = subprocess.run(command, cwd=os.path.join(os.path.dirname(os.path.abspath(__file__)), "src"))
+    sys.exit(result.returncode)
+
 def start_mcp():
     """Start MCP Server"""
     print("🔌 Starting JIRA MCP Server...")
@@ -27,23 +53,35 @@ def main():
     parser = ArgumentParser(description="JIRA AI Agent")
     parser.add_argument(
         "component",
-        choices=["backend", "frontend", "mcp", "all"],
+        choices=["backend", "frontend", "mcp", "sync", "all"],
         help="Component to start"
     )
+    parser.add_argument("--dev", action="store_true", help="backend: use the Flask development server")
+    parser.add_argument("--workers", type=int, help="backend: worker processes (default: WEB_CONCURRENCY)")
+    parser.add_argument("--threads", type=int, help="backend: threads per worker (default: GUNICORN_THREADS)")
+    parser.add_argument(
+        "--graceful-timeout", type=int,
+        help="backend: seconds to finish in-flight requests on shutdown (default: GUNICORN_GRACEFUL_TIMEOUT)"
+    )
+    parser.add_argument("--bind", help="backend: address to listen on, e.g. 0.0.0.0:5000")
+    parser.add_argument("--once", action="store_true", help="sync: sync every project once and exit")
     
     args = parser.parse_args()
     
     if args.component == "backend":
-        start_backend()
+        start_backend(args)
     elif args.component == "frontend":
         start_frontend()
     elif args.component == "mcp":
         start_mcp()
+    elif args.component == "sync":
+        start_sync(args)
     elif args.component == "all":
         print("⚠️  To start all components, run them in separate terminals:")
         print("   Terminal 1: python main.py backend")
         print("   Terminal 2: python main.py frontend")
         print("   Terminal 3: python main.py mcp (optional)")
+        print("   Terminal 4: python main.py sync (optional, keeps ticket data warm)")
     else:
         parser.print_help()
 
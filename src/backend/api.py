@@ -3,17 +3,24 @@ Flask Backend API for JIRA AI Agent
 Provides REST endpoints for query processing and ticket matching
 """
 
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional
+from concurrent.futures import Executor, ThreadPoolExecutor, as_completed
 import os
 import sys
+import json
 import logging
+import threading
+import time
 from dotenv import load_dotenv
 
-# Configure logging
+load_dotenv()
+
+# Configure logging (LOG_LEVEL: DEBUG, INFO, WARNING, ...)
 logging.basicConfig(
-    level=logging.DEBUG,
+    level=os.getenv('LOG_LEVEL', 'INFO').upper(),
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
 logger = logging.getLogger(__name__)
@@ -21,23 +28,257 @@ logger = logging.getLogger(__name__)
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.llm_agent import JiraLLMAgent
-from mcp_server.jira_mcp_server import JiraClient
+from backend.config_manager import config as app_config
+from backend.metrics import REGISTRY, REQUEST_SECONDS, WEBHOOK_EVENTS, observe_stage, record_span, trace
+from backend.pipeline import Pipeline
+from backend.tickets import Comment, Ticket, TicketCollection, to_jsonable
+from backend.webhooks import WebhookIngester, verify_signature
+
+if TYPE_CHECKING:
+    # Imported in init_components(): langchain, jira and mcp take most of the startup time
+    from backend.llm_agent import JiraLLMAgent
+    from backend.sync_scheduler import SyncScheduler
+    from mcp_server.jira_mcp_server import JiraClient
+
+
+class TicketJSONProvider(DefaultJSONProvider):
+    """JSON provider that also serialises Ticket and Comment records"""
+    
+    @staticmethod
+    def default(o: Any) -> Any:
+        if isinstance(o, (Ticket, Comment)):
+            return o.to_dict()
+        return DefaultJSONProvider.default(o)
 
-load_dotenv()
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = TicketJSONProvider(app)
 CORS(app)
 
-# Initialize components
-try:
-    llm_agent = JiraLLMAgent()
-    jira_client = JiraClient()
-except Exception as e:
-    print(f"Error initializing components: {e}")
-    llm_agent = None
-    jira_client = None
+# Upper bound on keys accepted by /api/tickets/batch
+MAX_BATCH_KEYS = 500
+
+# Upper bound on queries accepted by /api/query/batch
+MAX_BATCH_QUERIES = 100
+
+# Secret configured on the JIRA webhook; when set, /api/webhooks/jira requires
+# an X-Hub-Signature header signed with it
+JIRA_WEBHOOK_SECRET = os.getenv('JIRA_WEBHOOK_SECRET', '')
+
+# Shared pool for concurrent query pipeline stages
+pipeline_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('PIPELINE_WORKERS', 8)),
+    thread_name_prefix="pipeline"
+)
+
+# Queries of /api/query/batch requests processed at the same time
+BATCH_QUERY_WORKERS = int(os.getenv('BATCH_QUERY_WORKERS', 4))
+batch_executor = ThreadPoolExecutor(max_workers=BATCH_QUERY_WORKERS, thread_name_prefix="batch")
+
+# Stages of batch queries run on their own pool, so a large batch never
+# takes the pipeline workers single queries need (at most two stages of a
+# query run at once: analysis next to fetch or match)
+batch_stage_executor = ThreadPoolExecutor(
+    max_workers=2 * BATCH_QUERY_WORKERS,
+    thread_name_prefix="batch-stage"
+)
+
+llm_agent: Optional["JiraLLMAgent"] = None
+jira_client: Optional["JiraClient"] = None
+
+# "background": servers start building the components as soon as they start;
+# "lazy": the first request that needs them (or /ready) does
+COMPONENT_INIT = os.getenv('COMPONENT_INIT', 'background').lower()
+
+# A failed initialization is retried by requests after this many seconds
+COMPONENT_INIT_RETRY_SECONDS = float(os.getenv('COMPONENT_INIT_RETRY_SECONDS', 30))
+
+_init_lock = threading.Lock()
+_init_error: Optional[str] = None
+_init_failed_at = 0.0
+_warmup_lock = threading.Lock()
+_warmup_thread: Optional[threading.Thread] = None
+
+# SYNC_SCHEDULER=embedded keeps the mirror warm from this process
+# (otherwise run `python main.py sync` next to the server)
+sync_scheduler: Optional["SyncScheduler"] = None
+
+# Applies /api/webhooks/jira events to the mirror (None without a mirror)
+webhook_ingester: Optional[WebhookIngester] = None
+
+
+def components_ready() -> bool:
+    return llm_agent is not None and jira_client is not None
+
+
+def init_components() -> bool:
+    """
+    Create the LLM agent and JIRA client, if not done yet
+    
+    Their modules are imported here rather than with this module, so the
+    server binds its port and answers /health before they are loaded.
+    Called by the first request that needs the components (concurrent
+    callers wait for one initialization) or ahead of time by
+    start_component_init(). Under gunicorn this happens in each worker
+    after the fork, since connections, locks and threads must not cross
+    a fork.
+    
+    Returns:
+        Whether the components are available
+    """
+    global llm_agent, jira_client, sync_scheduler, webhook_ingester, _init_error, _init_failed_at
+    with _init_lock:
+        if components_ready():
+            return True
+        if _init_error is not None and time.monotonic() - _init_failed_at < COMPONENT_INIT_RETRY_SECONDS:
+            return False
+        
+        started = time.perf_counter()
+        try:
+            from backend.llm_agent import JiraLLMAgent
+            from backend.sync_scheduler import SyncScheduler
+            from mcp_server.jira_mcp_server import JiraClient
+            llm_agent = JiraLLMAgent()
+            jira_client = JiraClient()
+            app_config.watch()
+        except Exception as e:
+            logger.error("Error initializing components: %s", e)
+            llm_agent = None
+            jira_client = None
+            _init_error = str(e)
+            _init_failed_at = time.monotonic()
+            return False
+        
+        _init_error = None
+        logger.info("Components initialized in %.0f ms", (time.perf_counter() - started) * 1000)
+        
+        agent = llm_agent
+        if jira_client.store is not None and not len(agent.search_index):
+            # No usable index file (first start, or unreadable): rebuild from the mirror
+            threading.Thread(target=rebuild_indexes, name="index-rebuild", daemon=True).start()
+        if jira_client.store is not None:
+            webhook_ingester = WebhookIngester(
+                jira_client.store, jira_client.jira_url,
+                on_upserted=agent.index_tickets, on_deleted=agent.remove_tickets
+            ).start()
+        if os.getenv('SYNC_SCHEDULER', '').lower() == 'embedded' and jira_client.store is not None:
+            sync_scheduler = SyncScheduler(
+                jira_client, on_synced=lambda project, tickets: agent.index_tickets(tickets)
+            ).start()
+        return True
+
+
+def rebuild_indexes():
+    """Index the retrieval corpus, so the first queries do not pay for it"""
+    try:
+        indexed = llm_agent.index_tickets(fetch_corpus(None))
+        logger.info("Rebuilt the search indexes from %d mirrored tickets", indexed)
+    except Exception as e:
+        logger.error("Rebuilding the search indexes failed: %s", e)
+
+
+def start_component_init():
+    """
+    Initialize the components on a background thread
+    
+    Lets a freshly started server take requests at once; requests that need
+    the components wait for the warm-up.
+    """
+    global _warmup_thread
+    if components_ready():
+        return
+    with _warmup_lock:
+        if _warmup_thread is None or not _warmup_thread.is_alive():
+            _warmup_thread = threading.Thread(target=init_components, name="component-init", daemon=True)
+            _warmup_thread.start()
+
+
+def shutdown_components():
+    """Stop background writers and worker pools and close the JIRA client and ticket mirror (on graceful shutdown)"""
+    if sync_scheduler is not None:
+        sync_scheduler.stop()
+    if webhook_ingester is not None:
+        # Writes the events still waiting in a batch
+        webhook_ingester.stop()
+    batch_executor.shutdown(wait=True, cancel_futures=True)
+    batch_stage_executor.shutdown(wait=True, cancel_futures=True)
+    pipeline_executor.shutdown(wait=True, cancel_futures=True)
+    if jira_client is not None:
+        jira_client.close()
+
+
+def _agent_caches() -> Dict[str, Any]:
+    if llm_agent is None:
+        return {}
+    caches = {"response": llm_agent.cache, "insights": llm_agent.insights_cache}
+    return {name: cache for name, cache in caches.items() if cache is not None}
+
+
+def _cache_lookups():
+    for name, cache in _agent_caches().items():
+        yield (name, "hit"), cache.hits
+        yield (name, "near_hit"), cache.near_hits
+        yield (name, "miss"), cache.misses
+
+
+def _cache_hit_ratio():
+    for name, cache in _agent_caches().items():
+        lookups = cache.hits + cache.near_hits + cache.misses
+        yield (name,), (cache.hits + cache.near_hits) / lookups if lookups else 0.0
+
+
+def _dispatcher_stats():
+    if llm_agent is not None:
+        dispatcher = llm_agent.dispatcher
+        yield ("coalesced",), dispatcher.coalesced
+        yield ("rate_limit_retries",), dispatcher.retries
+        yield ("throttled_seconds",), dispatcher.throttled_seconds
+
+
+REGISTRY.gauge_callback(
+    "jira_agent_cache_lookups", "Response cache lookups by result", ["cache", "result"], _cache_lookups
+)
+REGISTRY.gauge_callback(
+    "jira_agent_cache_hit_ratio", "Share of cache lookups answered (exact or near-duplicate)", ["cache"],
+    _cache_hit_ratio
+)
+REGISTRY.gauge_callback(
+    "jira_agent_llm_dispatch", "LLM dispatcher totals: coalesced calls, 429 retries, time spent throttled",
+    ["stat"], _dispatcher_stats
+)
+
+
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
+
+@app.before_request
+def ensure_components():
+    """Build the components on the first API request (a no-op once they exist)"""
+    if request.path.startswith('/api/') and not components_ready():
+        init_components()
+
+
+@app.after_request
+def record_request(response: Response) -> Response:
+    """Observe request latency (for streamed responses: time until the body starts)"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            endpoint=request.url_rule.rule if request.url_rule else "unmatched",
+            method=request.method,
+            status=response.status_code
+        )
+    return response
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics of this worker process"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4; charset=utf-8')
 
 
 @app.route('/health', methods=['GET'])
@@ -50,6 +291,24 @@ def health_check():
     })
 
 
+@app.route('/ready', methods=['GET'])
+def readiness_check():
+    """
+    Readiness probe: 200 once the LLM agent and JIRA client are built
+    
+    Unlike /health (the process is up), this returns 503 while the
+    components are starting or after they failed to initialize, and starts
+    their initialization if nothing has yet.
+    """
+    if components_ready():
+        return jsonify({"status": "ready"})
+    
+    start_component_init()
+    if _init_error is not None:
+        return jsonify({"status": "failed", "error": _init_error}), 503
+    return jsonify({"status": "starting"}), 503
+
+
 @app.route('/api/query', methods=['POST'])
 def process_query():
     """
@@ -59,78 +318,310 @@ def process_query():
     {
         "query": "user question or problem description",
         "projects": ["PROD", "TECH"],  # optional
-        "max_results": 5  # optional
+        "max_results": 5,  # optional
+        "timings": true  # optional, false leaves out stage and span timings
     }
     """
-    # logger.info("=== /api/query endpoint called ===")
-    
     if llm_agent is None or jira_client is None:
-        #logger.error("Components not initialized - llm_agent: %s, jira_client: %s", 
-        #            llm_agent is not None, jira_client is not None)
+        logger.error("Components not initialized - llm_agent: %s, jira_client: %s",
+                     llm_agent is not None, jira_client is not None)
         return jsonify({"error": "Service unavailable. Components not initialized."}), 503
     
     try:
         data = request.get_json()
-        #logger.debug("Request data: %s", data)
+        logger.debug("Request data: %s", data)
         
         query = data.get('query')
         projects = data.get('projects')
         max_results = data.get('max_results', 5)
         
         if not query:
-            #logger.warning("Query parameter missing")
+            logger.warning("Query parameter missing")
             return jsonify({"error": "Query is required"}), 400
 
-        #logger.info("Processing query: '%s'", query)
-
-        # Step 1: Analyze query
-        #logger.debug("Step 1: Analyzing query...")
-        query_analysis = llm_agent.analyze_query(query)
-        #logger.debug("Query analysis result: %s", query_analysis)
-
-        # Step 2: Fetch historical tickets
-        #logger.debug("Step 2: Fetching historical tickets (projects=%s, max_results=100, days_back=90)...", projects)
-        historical_tickets = jira_client.search_tickets(
-            projects=projects,
-            max_results=100,
-            days_back=90
-        )
-        #logger.info("Found %d historical tickets", len(historical_tickets))
+        logger.info("Processing query: '%s'", query)
         
-        # Step 3: Match tickets with query
-        #logger.debug("Step 3: Matching tickets (top_k=%d)...", max_results)
-        matched_tickets = llm_agent.match_tickets(
-            query=query,
-            historical_tickets=historical_tickets,
-            top_k=max_results
-        )
-        #logger.info("Matched %d tickets", len(matched_tickets))
-        
-        # Step 4: Generate resolution
-        #logger.debug("Step 4: Generating resolution...")
-        resolution = ""
-        if matched_tickets:
-            resolution = llm_agent.generate_resolution(query, matched_tickets)
-            #logger.debug("Resolution generated (length: %d chars)", len(resolution))
-        else:
-            #logger.warning("No matched tickets - skipping resolution generation")
-            resolution = "No relevant tickets found."
-
-        response_data = {
-            "query": query,
-            "analysis": query_analysis,
-            "matched_tickets": matched_tickets,
-            "resolution": resolution,
-            "total_historical_tickets": len(historical_tickets)
-        }
-        #logger.info("Successfully processed query - returning %d matched tickets", len(matched_tickets))
+        with trace() as spans:
+            pipeline = query_pipeline(query, max_results, lambda: fetch_corpus(projects))
+            results = pipeline.run()
+        timings = {**pipeline.timings, **spans}
+        logger.info("Processed query in %.1f ms, timings: %s", timings["total"], timings)
+
+        response_data = query_response(query, results, timings)
+        if data.get('timings', True) is False:
+            del response_data["timings"]
+        logger.info("Returning %d matched tickets", len(response_data["matched_tickets"]))
         return jsonify(response_data)
     
     except Exception as e:
-        #logger.exception("Error processing query: %s", str(e))
+        logger.exception("Error processing query: %s", str(e))
         return jsonify({"error": str(e)}), 500
 
 
+def fetch_corpus(projects: Optional[List[str]]) -> TicketCollection:
+    """Fetch the historical tickets queries are matched against (without comments)"""
+    return jira_client.search_tickets(
+        projects=projects,
+        max_results=app_config.get('llm.retrieval_corpus_size', 100),
+        days_back=app_config.get('llm.retrieval_days_back', 90),
+        profile="match"
+    )
+
+
+def query_pipeline(
+    query: str,
+    max_results: int,
+    fetch: Callable[[], Any],
+    resolve: bool = True,
+    executor: Optional[Executor] = None
+) -> Pipeline:
+    """
+    Stages of a /api/query request
+    
+    Query analysis does not depend on the ticket fetch, so the two overlap;
+    matching waits for the fetch, resolution for the matches. The corpus is
+    fetched without comments; only matches get whole tickets. Without
+    ``resolve`` the resolution stage is left out (streamed responses
+    generate it as they send it). Stages run on ``pipeline_executor``
+    unless another executor is given.
+    """
+    pipeline = Pipeline(executor or pipeline_executor, on_stage=observe_stage)
+    pipeline.add("analysis", lambda: llm_agent.analyze_query(query))
+    pipeline.add("fetch", fetch)
+    pipeline.add("match", lambda tickets: llm_agent.match_tickets(
+        query=query,
+        historical_tickets=tickets,
+        top_k=max_results
+    ), depends_on=["fetch"])
+    pipeline.add("details", with_ticket_details, depends_on=["match"])
+    if resolve:
+        pipeline.add("resolution", lambda matches: (
+            llm_agent.generate_resolution(query, matches) if matches
+            else "No relevant tickets found."
+        ), depends_on=["details"])
+    return pipeline
+
+
+def query_response(query: str, results: Dict[str, Any], timings: Dict[str, float]) -> Dict[str, Any]:
+    """Response body of a processed query"""
+    return {
+        "query": query,
+        "analysis": results["analysis"],
+        "matched_tickets": results["details"],
+        "resolution": results["resolution"],
+        "total_historical_tickets": len(results["fetch"]),
+        "timings": timings
+    }
+
+
+def with_ticket_details(matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Swap the matched tickets (fetched with the "match" field profile) for whole tickets
+    
+    Details come from the ticket mirror, however old, so the common case adds
+    no JIRA round trip to the query. Only keys the mirror lacks are fetched
+    from JIRA, recorded as the ``jira.details`` span.
+    """
+    if not matches or jira_client is None:
+        return matches
+    
+    keys = [m["ticket_key"] for m in matches]
+    details: Dict[str, Any] = {}
+    try:
+        if jira_client.store is not None:
+            details.update(jira_client.store.get_tickets(keys))
+        missing = [key for key in keys if key not in details]
+        if missing:
+            started = time.perf_counter()
+            try:
+                details.update((ticket["key"], ticket) for ticket in jira_client.get_tickets_by_keys(missing))
+            finally:
+                record_span("jira.details", time.perf_counter() - started)
+    except Exception as e:
+        logger.warning("Could not load matched ticket details: %s", e)
+    
+    return [
+        {**match, "ticket_data": details.get(match["ticket_key"], match.get("ticket_data"))}
+        for match in matches
+    ]
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format a Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, default=to_jsonable)}\n\n"
+
+
+@app.route('/api/query/stream', methods=['POST'])
+def process_query_stream():
+    """
+    Process user query, streaming results as Server-Sent Events
+    
+    Takes the same request body as /api/query. Events, in order of availability:
+        analysis    - query analysis
+        candidates  - preliminary keyword/vector matches (before the LLM ranks them)
+        matches     - LLM-ranked matched tickets and corpus size
+        token       - a chunk of resolution text (repeated)
+        done        - stage timings
+        error       - processing failed
+    """
+    if llm_agent is None or jira_client is None:
+        return jsonify({"error": "Service unavailable. Components not initialized."}), 503
+    
+    data = request.get_json() or {}
+    query = data.get('query')
+    projects = data.get('projects')
+    max_results = data.get('max_results', 5)
+    
+    if not query:
+        return jsonify({"error": "Query is required"}), 400
+    
+    pipeline = query_pipeline(query, max_results, lambda: fetch_corpus(projects), resolve=False)
+    pipeline.add("candidates", lambda tickets: llm_agent.retrieve_candidates(
+        query, tickets, limit=max_results, pad=False
+    ), depends_on=["fetch"])
+    with trace() as spans:
+        pipeline.start()
+    
+    def generate():
+        try:
+            for stage in pipeline.as_completed(["analysis", "candidates", "details"]):
+                if stage == "analysis":
+                    yield sse_event("analysis", pipeline.result("analysis"))
+                elif stage == "candidates":
+                    yield sse_event("candidates", {
+                        "tickets": [
+                            {key: t.get(key) for key in ("key", "summary", "status", "priority", "url")}
+                            for t in pipeline.result("candidates")
+                        ]
+                    })
+                else:
+                    yield sse_event("matches", {
+                        "matched_tickets": pipeline.result("details"),
+                        "total_historical_tickets": len(pipeline.result("fetch"))
+                    })
+            
+            matched_tickets = pipeline.result("details")
+            if matched_tickets:
+                with trace(spans):
+                    for text in llm_agent.stream_resolution(query, matched_tickets):
+                        yield sse_event("token", {"text": text})
+            else:
+                yield sse_event("token", {"text": "No relevant tickets found."})
+            
+            pipeline.timings["total"] = pipeline.elapsed()
+            yield sse_event("done", {"timings": {**pipeline.timings, **spans}})
+        except Exception as e:
+            yield sse_event("error", {"error": str(e)})
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.route('/api/query/batch', methods=['POST'])
+def process_query_batch():
+    """
+    Process many queries against one shared ticket corpus
+    
+    The historical tickets are fetched and indexed once; each query is then retrieved,
+    matched and resolved against them, at most BATCH_QUERY_WORKERS at a
+    time. Results are streamed as newline-delimited JSON, one line per
+    query in order of completion, followed by a summary line.
+    
+    Request body:
+    {
+        "queries": ["first question", {"id": "t-42", "query": "second question"}],
+        "projects": ["PROD", "TECH"],  # optional, shared by all queries
+        "max_results": 5  # optional
+    }
+    
+    Lines:
+        {"index": 0, "id": ..., <same fields as /api/query>}
+        {"index": 1, "id": ..., "query": ..., "error": "..."}
+        {"done": true, "count": 2, "failed": 1, "total_historical_tickets": 100, "timings": {...}}
+    """
+    if llm_agent is None or jira_client is None:
+        return jsonify({"error": "Service unavailable. Components not initialized."}), 503
+    
+    data = request.get_json() or {}
+    projects = data.get('projects')
+    max_results = data.get('max_results', 5)
+    
+    items = data.get('queries')
+    if not isinstance(items, list) or not items:
+        return jsonify({"error": "queries must be a non-empty list"}), 400
+    if len(items) > MAX_BATCH_QUERIES:
+        return jsonify({"error": f"At most {MAX_BATCH_QUERIES} queries per request"}), 400
+    
+    queries = []
+    for index, item in enumerate(items):
+        if isinstance(item, str):
+            item = {"query": item}
+        if not isinstance(item, dict) or not item.get('query'):
+            return jsonify({"error": f"Query {index} is missing"}), 400
+        queries.append({
+            "index": index,
+            "id": item.get('id', index),
+            "query": item['query'],
+            "max_results": item.get('max_results', max_results)
+        })
+    
+    started = time.perf_counter()
+    try:
+        tickets = fetch_corpus(projects)
+        # Index once up front so the per-query retrievals only read the indexes
+        llm_agent.index_tickets(tickets)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+    fetch_ms = round((time.perf_counter() - started) * 1000, 1)
+    
+    def run(item: Dict[str, Any]) -> Dict[str, Any]:
+        with trace() as spans:
+            pipeline = query_pipeline(
+                item["query"], item["max_results"], lambda: tickets, executor=batch_stage_executor
+            )
+            results = pipeline.run()
+        return query_response(item["query"], results, {**pipeline.timings, **spans})
+    
+    futures = {batch_executor.submit(run, item): item for item in queries}
+    
+    def generate():
+        failed = 0
+        try:
+            for future in as_completed(futures):
+                item = futures[future]
+                line: Dict[str, Any] = {"index": item["index"], "id": item["id"]}
+                try:
+                    line.update(future.result())
+                except Exception as e:
+                    failed += 1
+                    line.update({"query": item["query"], "error": str(e)})
+                yield json.dumps(line, default=to_jsonable) + "\n"
+            
+            yield json.dumps({
+                "done": True,
+                "count": len(queries),
+                "failed": failed,
+                "total_historical_tickets": len(tickets),
+                "timings": {
+                    "fetch": fetch_ms,
+                    "total": round((time.perf_counter() - started) * 1000, 1)
+                }
+            }) + "\n"
+        finally:
+            # Client went away: drop the queries that have not started
+            for future in futures:
+                future.cancel()
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='application/x-ndjson',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.route('/api/tickets/search', methods=['POST'])
 def search_tickets():
     """
@@ -141,7 +632,8 @@ def search_tickets():
         "projects": ["PROD", "TECH"],  # optional
         "statuses": ["Done", "Resolved"],  # optional
         "days_back": 30,  # optional
-        "max_results": 50  # optional
+        "max_results": 50,  # optional
+        "profile": "list"  # optional: stats, list, match or detail
     }
     """
     if jira_client is None:
@@ -154,11 +646,49 @@ def search_tickets():
             projects=data.get('projects'),
             statuses=data.get('statuses'),
             max_results=data.get('max_results', 50),
-            days_back=data.get('days_back', 30)
+            days_back=data.get('days_back', 30),
+            profile=data.get('profile', 'list')
         )
         
         return jsonify({
-            "tickets": tickets,
+            "tickets": tickets.to_list(),
+            "count": len(tickets)
+        })
+    
+    except ValueError as e:
+        # Unknown field profile
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@app.route('/api/tickets/batch', methods=['POST'])
+def get_tickets_batch():
+    """
+    Get detailed information about several tickets in one call
+    
+    Request body:
+    {
+        "keys": ["PROD-123", "TECH-45"]
+    }
+    """
+    if jira_client is None:
+        return jsonify({"error": "Service unavailable. JIRA client not initialized."}), 503
+    
+    try:
+        data = request.get_json() or {}
+        keys = data.get('keys')
+        
+        if not isinstance(keys, list) or not keys:
+            return jsonify({"error": "keys must be a non-empty list"}), 400
+        if len(keys) > MAX_BATCH_KEYS:
+            return jsonify({"error": f"At most {MAX_BATCH_KEYS} keys per request"}), 400
+        
+        tickets = jira_client.get_tickets_by_keys(keys)
+        
+        return jsonify({
+            "tickets": tickets.to_list(),
+            "missing": [key for key in keys if str(key).strip().upper() not in tickets],
             "count": len(tickets)
         })
     
@@ -201,33 +731,19 @@ def get_statistics():
     try:
         data = request.get_json() or {}
         
-        stats = jira_client.search_tickets(
+        # Summed from precomputed daily rollups kept up to date by sync
+        counts = jira_client.get_statistics(
             projects=data.get('projects'),
-            max_results=1000,
             days_back=data.get('days_back', 30)
         )
         
-        # Calculate statistics
         statistics = {
-            "total_tickets": len(stats),
-            "by_status": {},
-            "by_priority": {},
-            "by_project": {}
+            "total_tickets": counts["total_tickets"],
+            "by_status": counts["by_status"],
+            "by_priority": counts["by_priority"],
+            "by_project": counts["by_project"]
         }
         
-        for ticket in stats:
-            # Count by status
-            status = ticket.get("status", "Unknown")
-            statistics["by_status"][status] = statistics["by_status"].get(status, 0) + 1
-            
-            # Count by priority
-            priority = ticket.get("priority", "Unknown")
-            statistics["by_priority"][priority] = statistics["by_priority"].get(priority, 0) + 1
-            
-            # Count by project
-            project = ticket["key"].split("-")[0]
-            statistics["by_project"][project] = statistics["by_project"].get(project, 0) + 1
-        
         return jsonify(statistics)
     
     except Exception as e:
@@ -251,11 +767,12 @@ def get_insights():
     try:
         data = request.get_json() or {}
         
-        # Fetch tickets
+        # Fetch the whole window; insights are map-reduced over all of it
         tickets = jira_client.search_tickets(
             projects=data.get('projects'),
-            max_results=100,
-            days_back=data.get('days_back', 30)
+            max_results=app_config.get('llm.insights.max_tickets', 2000),
+            days_back=data.get('days_back', 30),
+            profile="list"
         )
         
         # Extract insights using LLM
@@ -270,9 +787,46 @@ def get_insights():
         return jsonify({"error": str(e)}), 500
 
 
+@app.route('/api/webhooks/jira', methods=['POST'])
+def jira_webhook():
+    """
+    Receive JIRA issue webhooks (jira:issue_created, jira:issue_updated, jira:issue_deleted)
+    
+    Events are applied to the ticket mirror and search indexes in batches,
+    a few seconds after a burst of edits settles (jira.mirror.webhooks).
+    Other event types and issues outside jira.projects are acknowledged
+    and ignored.
+    """
+    if not JIRA_WEBHOOK_SECRET:
+        # Unsigned events would reach the mirror, the indexes and LLM prompts
+        WEBHOOK_EVENTS.inc(event="other", result="rejected")
+        return jsonify({"error": "Webhooks are disabled. Set JIRA_WEBHOOK_SECRET to enable them."}), 404
+    # Only the signature: a secret in the URL would end up in proxy and access logs
+    if not verify_signature(request.get_data(), request.headers.get('X-Hub-Signature'), JIRA_WEBHOOK_SECRET):
+        WEBHOOK_EVENTS.inc(event="other", result="rejected")
+        return jsonify({"error": "Invalid webhook signature"}), 401
+    
+    if jira_client is None:
+        return jsonify({"error": "Service unavailable. JIRA client not initialized."}), 503
+    if webhook_ingester is None:
+        return jsonify({"error": "Webhooks require the ticket mirror (jira.mirror.enabled)"}), 404
+    
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, dict):
+        return jsonify({"error": "Expected a JSON webhook payload"}), 400
+    
+    key = webhook_ingester.submit(payload)
+    if key is None:
+        return jsonify({"status": "ignored"})
+    return jsonify({"status": "accepted", "key": key}), 202
+
+
 if __name__ == '__main__':
     host = os.getenv('FLASK_HOST', '0.0.0.0')
     port = int(os.getenv('FLASK_PORT', 5000))
-    debug = os.getenv('FLASK_DEBUG', 'True').lower() == 'true'
+    debug = os.getenv('FLASK_DEBUG', 'False').lower() == 'true'
     
+    # With the reloader, only the child process serves requests
+    if COMPONENT_INIT == 'background' and (not debug or os.getenv('WERKZEUG_RUN_MAIN') == 'true'):
+        start_component_init()
     app.run(host=host, port=port, debug=debug)
@@ -0,0 +1,228 @@
+"""
+Asynchronous JIRA client
+Issues search and issue requests concurrently over a pooled keep-alive connection
+"""
+
+from typing import Any, AsyncIterator, Dict, List, Mapping, Optional
+import asyncio
+import os
+import random
+
+import httpx
+
+from .config_manager import get_config
+from .jira_utils import build_jql, format_ticket, profile_fields
+from .tickets import Ticket, TicketCollection
+
+RETRY_STATUSES = {429, 502, 503, 504}
+
+
+class AsyncJiraClient:
+    """
+    asyncio JIRA client returning the same ticket dicts as JiraClient
+
+    All requests share one ``httpx.AsyncClient`` connection pool (HTTP/1.1
+    keep-alive), so many searches and issue lookups can be awaited together
+    with ``asyncio.gather`` without a thread per call. Responses with status
+    429/502/503/504 are retried with exponential backoff, honouring
+    ``Retry-After`` when the server sends it. At most ``max_connections``
+    requests are in flight; the rest wait their turn instead of timing out
+    while waiting for a pooled connection.
+
+    Example:
+        async with AsyncJiraClient() as client:
+            tickets = await client.get_tickets(["PROD-1", "PROD-2"])
+    """
+
+    def __init__(
+        self,
+        jira_url: Optional[str] = None,
+        email: Optional[str] = None,
+        token: Optional[str] = None,
+        config: Optional[Mapping[str, Any]] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        self.jira_url = (jira_url or os.getenv("JIRA_URL") or "").rstrip("/")
+        email = email or os.getenv("JIRA_EMAIL")
+        token = token or os.getenv("JIRA_API_TOKEN")
+
+        if not all([self.jira_url, email, token]):
+            raise ValueError("JIRA credentials not configured. Check .env file.")
+        assert email is not None and token is not None
+
+        # Settings apply for the client's lifetime (JiraClient keeps one until close())
+        self.config = config if config is not None else get_config()
+        jira_config = self.config.get('jira', {})
+        self.fields: List[str] = list(jira_config.get('fields', []))
+        self.page_size: int = jira_config.get('page_size', 100)
+
+        http_config = jira_config.get('http', {})
+        self.max_retries: int = http_config.get('max_retries', 3)
+        self.backoff_seconds: float = http_config.get('backoff_seconds', 1.0)
+        self.max_backoff_seconds: float = http_config.get('max_backoff_seconds', 30.0)
+
+        self._client = httpx.AsyncClient(
+            base_url=self.jira_url,
+            auth=(email, token),
+            headers={"Accept": "application/json"},
+            limits=httpx.Limits(
+                max_connections=http_config.get('max_connections', 20),
+                max_keepalive_connections=http_config.get('max_keepalive_connections', 10),
+                keepalive_expiry=http_config.get('keepalive_expiry_seconds', 30)
+            ),
+            timeout=httpx.Timeout(
+                http_config.get('timeout_seconds', 30),
+                connect=http_config.get('connect_timeout_seconds', 5)
+            ),
+            transport=transport
+        )
+        self._is_cloud: Optional[bool] = jira_config.get('cloud')
+        self._slots = asyncio.Semaphore(http_config.get('max_connections', 20))
+
+    async def __aenter__(self) -> "AsyncJiraClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        """Close pooled connections"""
+        await self._client.aclose()
+
+    async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        """Send a request, retrying rate-limited and transient failures"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                async with self._slots:
+                    response = await self._client.request(method, path, **kwargs)
+            except httpx.TransportError:
+                if attempt == self.max_retries:
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                await asyncio.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
+                continue
+
+            response.raise_for_status()
+            return response.json()
+
+        raise RuntimeError("unreachable")
+
+    def _backoff(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Delay before the next retry, with jitter"""
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_backoff_seconds)
+            except ValueError:
+                pass
+        delay = self.backoff_seconds * (2 ** attempt)
+        return min(delay, self.max_backoff_seconds) * random.uniform(0.5, 1.0)
+
+    async def is_cloud(self) -> bool:
+        """Whether the server is Jira Cloud (detected once via serverInfo)"""
+        if self._is_cloud is None:
+            info = await self._request("GET", "/rest/api/2/serverInfo")
+            self._is_cloud = info.get("deploymentType") == "Cloud"
+        return self._is_cloud
+
+    async def _search_page(
+        self,
+        jql: str,
+        max_results: int,
+        start_at: int = 0,
+        page_token: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Fetch a single page of raw search results"""
+        params: Dict[str, Any] = {
+            "jql": jql,
+            "maxResults": max_results,
+            "fields": ",".join(fields or self.fields)
+        }
+        if await self.is_cloud():
+            if page_token:
+                params["nextPageToken"] = page_token
+            return await self._request("GET", "/rest/api/2/search/jql", params=params)
+
+        params["startAt"] = start_at
+        return await self._request("GET", "/rest/api/2/search", params=params)
+
+    async def iter_issues(
+        self,
+        jql: str,
+        max_results: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream formatted tickets for a JQL query (``fields`` defaults to all configured fields)
+
+        On JIRA Server/Data Center the pages after the first are requested
+        concurrently (bounded by the connection pool); Jira Cloud only offers
+        cursor pagination, so its pages are fetched one after another.
+        """
+        yielded = 0
+        first_size = min(self.page_size, max_results or self.page_size)
+        page = await self._search_page(jql, first_size, fields=fields)
+
+        for raw in page.get("issues", []):
+            yield format_ticket(raw, self.jira_url, fields)
+        yielded += len(page.get("issues", []))
+
+        if await self.is_cloud():
+            while page.get("nextPageToken") and not page.get("isLast"):
+                if max_results is not None and yielded >= max_results:
+                    return
+                size = self.page_size if max_results is None else min(self.page_size, max_results - yielded)
+                page = await self._search_page(jql, size, page_token=page["nextPageToken"], fields=fields)
+                for raw in page.get("issues", []):
+                    yield format_ticket(raw, self.jira_url, fields)
+                yielded += len(page.get("issues", []))
+            return
+
+        total = page.get("total", 0)
+        if max_results is not None:
+            total = min(total, max_results)
+        stride = yielded
+        if stride == 0 or stride >= total:
+            return
+
+        pages = await asyncio.gather(*[
+            self._search_page(jql, min(stride, total - start), start_at=start, fields=fields)
+            for start in range(stride, total, stride)
+        ])
+        for page in pages:
+            for raw in page.get("issues", []):
+                yield format_ticket(raw, self.jira_url, fields)
+
+    async def search_tickets(
+        self,
+        projects: Optional[List[str]] = None,
+        issue_types: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        max_results: Optional[int] = 100,
+        days_back: Optional[int] = None,
+        profile: Optional[str] = None
+    ) -> TicketCollection:
+        """Search for JIRA tickets based on criteria (same shape as JiraClient.search_tickets)"""
+        jql = build_jql(projects, issue_types, statuses, days_back)
+        fields = None if profile is None else profile_fields(self.config.get('jira', {}), profile)
+        tickets = TicketCollection([
+            Ticket.from_dict(t) async for t in self.iter_issues(jql, max_results, fields)
+        ])
+        return tickets if max_results is None else tickets[:max_results]
+
+    async def get_ticket_by_key(self, key: str) -> Dict[str, Any]:
+        """Get a specific ticket by its key (same shape as JiraClient.get_ticket_by_key)"""
+        try:
+            raw = await self._request(
+                "GET", f"/rest/api/2/issue/{key}", params={"fields": ",".join(self.fields)}
+            )
+            return format_ticket(raw, self.jira_url)
+        except Exception as e:
+            return {"error": f"Failed to fetch ticket {key}: {str(e)}"}
+
+    async def get_tickets(self, keys: List[str]) -> List[Dict[str, Any]]:
+        """Fetch several tickets concurrently, in the order of ``keys``"""
+        return list(await asyncio.gather(*[self.get_ticket_by_key(key) for key in keys]))
@@ -1,38 +1,129 @@
 """
 Configuration loader and manager
+
+config.yaml is parsed once per process into an immutable ConfigSnapshot.
+A watcher thread polls the file and swaps in a new snapshot when it
+changes, so settings that are read per request apply without a restart.
 """
 
 import os
+import logging
+import threading
 import yaml
-from typing import Dict, Any, Optional, Union
+from types import MappingProxyType
+from typing import Dict, Any, Iterator, Mapping, Optional, Tuple, Union
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(__file__), "../../config/config.yaml")
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, Mapping):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+class ConfigSnapshot(Mapping[str, Any]):
+    """
+    Immutable configuration as loaded at one point in time
+    
+    Sections are read-only mappings and lists are tuples. Every dotted key
+    ("llm.top_k_results", "jira.mirror.path", ...) is resolved when the
+    snapshot is built, so get() is a single dict lookup.
+    
+    Example:
+        top_k = snapshot.get('llm.top_k_results', 5)
+        jira_config = snapshot['jira']
+    """
+    
+    def __init__(self, data: Optional[Mapping[str, Any]] = None, version: int = 1):
+        self._data: Mapping[str, Any] = _freeze(data or {})
+        self.version = version
+        self._flat: Dict[str, Any] = {}
+        self._flatten(self._data, "")
+    
+    def _flatten(self, section: Mapping[str, Any], prefix: str):
+        for key, value in section.items():
+            path = f"{prefix}{key}"
+            self._flat[path] = value
+            if isinstance(value, Mapping):
+                self._flatten(value, path + ".")
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Value at a dotted key, or ``default`` if it is not configured"""
+        return self._flat.get(key, default)
+    
+    def __getitem__(self, key: str) -> Any:
+        return self._data[key]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Mutable deep copy (plain dicts and lists)"""
+        return _thaw(self._data)
+
 
 class ConfigManager:
-    """Manages application configuration"""
+    """
+    Manages application configuration
+    
+    ``snapshot`` is the current ConfigSnapshot. Readers take it once per
+    operation and never see a half-applied change: a reload builds a new
+    snapshot and replaces the reference. A file that fails to load leaves
+    the current snapshot in place.
+    """
     
     def __init__(self, config_path: Optional[str] = None):
         if config_path is None:
-            config_path = os.path.join(
-                os.path.dirname(__file__),
-                "../../config/config.yaml"
-            )
+            config_path = DEFAULT_CONFIG_PATH
         
         self.config_path = config_path
-        self.config = self._load_config()
         self.env_vars = self._load_env_vars()
+        self._lock = threading.Lock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._signature = self._file_signature()
+        self.snapshot = ConfigSnapshot(self._load_config())
+    
+    @property
+    def config(self) -> ConfigSnapshot:
+        """Current configuration"""
+        return self.snapshot
     
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from YAML file"""
         try:
             with open(self.config_path, 'r') as f:
-                return yaml.safe_load(f)
+                return yaml.safe_load(f) or {}
         except FileNotFoundError:
             print(f"Warning: Config file not found at {self.config_path}")
             return self._default_config()
     
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
     def _load_env_vars(self) -> Dict[str, Union[str, float, int]]:
         """Load environment variables"""
         return {
@@ -74,18 +165,71 @@ class ConfigManager:
             }
         }
     
-    def get(self, key: str, default: Any = None) -> Any:
-        """Get configuration value by key"""
-        keys = key.split('.')
-        value = self.config
+    def reload(self) -> bool:
+        """
+        Re-read the config file and swap in a new snapshot
         
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k, default)
-            else:
-                return default
+        Returns:
+            Whether the configuration was replaced
+        """
+        with self._lock:
+            self._signature = self._file_signature()
+            if self._signature is None:
+                # Missing, e.g. mid-replace: keep the current configuration
+                return False
+            try:
+                data = self._load_config()
+            except (OSError, yaml.YAMLError) as e:
+                logger.error("Keeping current configuration, %s failed to load: %s", self.config_path, e)
+                return False
+            if not isinstance(data, dict) or not {'jira', 'llm'} <= data.keys():
+                logger.error("Keeping current configuration, %s lacks the jira or llm section", self.config_path)
+                return False
+            self.snapshot = ConfigSnapshot(data, self.snapshot.version + 1)
+        logger.info("Configuration reloaded from %s (version %d)", self.config_path, self.snapshot.version)
+        return True
+    
+    def check_for_changes(self) -> bool:
+        """Reload if the config file changed since it was last read; returns whether it was reloaded"""
+        if self._file_signature() == self._signature:
+            return False
+        return self.reload()
+    
+    def watch(self, interval: Optional[float] = None) -> None:
+        """
+        Poll the config file in the background and reload it on change
         
-        return value
+        Started at most once per process (a thread does not survive a fork,
+        so a forked worker starts its own). CONFIG_RELOAD_SECONDS sets the
+        default interval; 0 disables watching.
+        """
+        if interval is None:
+            interval = float(os.getenv('CONFIG_RELOAD_SECONDS', 2))
+        if interval <= 0:
+            return
+        with self._lock:
+            if self._watcher is not None and self._watcher.is_alive():
+                return
+            self._stop.clear()
+            self._watcher = threading.Thread(
+                target=self._watch, args=(interval,), name="config-watcher", daemon=True
+            )
+            self._watcher.start()
+    
+    def _watch(self, interval: float):
+        while not self._stop.wait(interval):
+            try:
+                self.check_for_changes()
+            except Exception as e:
+                logger.error("Config watcher error: %s", e)
+    
+    def stop_watching(self) -> None:
+        """Stop the watcher thread, if running"""
+        self._stop.set()
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get configuration value by dotted key"""
+        return self.snapshot.get(key, default)
     
     def get_env(self, key: str, default: Union[str, float, int] = '') -> Union[str, float, int]:
         """Get environment variable"""
@@ -96,24 +240,30 @@ class ConfigManager:
         required_sections = ['jira', 'llm', 'analytics', 'agent']
         
         for section in required_sections:
-            if section not in self.config:
+            if section not in self.snapshot:
                 print(f"Warning: Missing config section: {section}")
                 return False
         
         return True
     
     def update(self, updates: Dict[str, Any]) -> None:
-        """Update configuration"""
-        self.config.update(updates)
+        """Update configuration (top-level sections are replaced)"""
+        with self._lock:
+            self.snapshot = ConfigSnapshot({**self.snapshot.to_dict(), **updates}, self.snapshot.version + 1)
     
     def save(self) -> None:
         """Save configuration to file"""
         try:
             with open(self.config_path, 'w') as f:
-                yaml.dump(self.config, f, default_flow_style=False)
+                yaml.dump(self.snapshot.to_dict(), f, default_flow_style=False)
         except Exception as e:
             print(f"Error saving config: {e}")
 
 
 # Global config instance
 config = ConfigManager()
+
+
+def get_config() -> ConfigSnapshot:
+    """The process-wide configuration snapshot in effect now"""
+    return config.snapshot
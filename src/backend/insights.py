@@ -0,0 +1,103 @@
+"""
+Helpers for map-reduce insight extraction
+Splits a ticket window into stable chunks and merges partial insights
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+import hashlib
+import json
+
+INSIGHT_FIELDS = ("common_issues", "common_resolutions", "recommendations")
+
+
+def _key_order(key: str) -> Tuple[str, int]:
+    """Sort key for JIRA keys: project, then issue number"""
+    project, _, number = key.rpartition("-")
+    return (project, int(number)) if number.isdigit() else (key, 0)
+
+
+def chunk_tickets(
+    tickets: Sequence[Dict[str, Any]],
+    chunk_size: int = 40,
+    merge_levels: int = 4
+) -> List[List[Dict[str, Any]]]:
+    """
+    Split tickets into chunks whose boundaries survive window changes
+
+    Tickets are ordered by project and issue number and grouped into fixed,
+    aligned key blocks of ``chunk_size * 2**merge_levels`` issue numbers. A
+    block holding more than ``chunk_size`` tickets is halved, again and
+    again, down to ranges of ``chunk_size`` numbers (e.g. PROD-80..PROD-119
+    for ``chunk_size=40``), so sparse stretches of keys share one chunk and
+    no chunk holds more than ``chunk_size`` tickets. Since every boundary is
+    aligned to a power-of-two range of keys, a new, updated or expired
+    ticket only reshapes the chunk it falls in (splitting it, or merging it
+    with its neighbour), so the other chunks keep their cached summaries.
+
+    Args:
+        tickets: Tickets in any order
+        chunk_size: Maximum tickets per chunk
+        merge_levels: Times the smallest key range may double to merge sparse ranges
+
+    Returns:
+        List of ticket chunks
+    """
+    block_span = chunk_size * 2 ** max(0, merge_levels)
+    blocks: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+    for ticket in sorted(tickets, key=lambda t: _key_order(t["key"])):
+        project, number = _key_order(ticket["key"])
+        blocks.setdefault((project, number // block_span), []).append(ticket)
+
+    chunks: List[List[Dict[str, Any]]] = []
+    for (_, block), group in blocks.items():
+        _split_range(group, block * block_span, block_span, chunk_size, chunks)
+    return chunks
+
+
+def _split_range(
+    tickets: List[Dict[str, Any]],
+    start: int,
+    span: int,
+    chunk_size: int,
+    chunks: List[List[Dict[str, Any]]]
+):
+    """Append tickets of the key range start..start+span as one chunk, or halve the range until they fit"""
+    if len(tickets) <= chunk_size or span <= chunk_size:
+        chunks.append(tickets)
+        return
+    middle = start + span // 2
+    lower = [t for t in tickets if _key_order(t["key"])[1] < middle]
+    upper = tickets[len(lower):]
+    for part, part_start in ((lower, start), (upper, middle)):
+        if part:
+            _split_range(part, part_start, span // 2, chunk_size, chunks)
+
+
+def merge_insights(partials: Sequence[Dict[str, Any]], limit: int = 10) -> Dict[str, List[str]]:
+    """
+    Combine partial insights without the LLM
+
+    Entries are de-duplicated case-insensitively and ranked by how many
+    partials mention them. Used when the reduce step cannot be run.
+    """
+    merged: Dict[str, List[str]] = {}
+    for field in INSIGHT_FIELDS:
+        counts: Dict[str, int] = {}
+        labels: Dict[str, str] = {}
+        for partial in partials:
+            for item in partial.get(field) or []:
+                text = str(item).strip()
+                if not text:
+                    continue
+                normalized = text.lower()
+                counts[normalized] = counts.get(normalized, 0) + 1
+                labels.setdefault(normalized, text)
+        ranked = sorted(counts, key=lambda k: -counts[k])
+        merged[field] = [labels[k] for k in ranked[:limit]]
+    return merged
+
+
+def insights_fingerprint(partials: Sequence[Dict[str, Any]]) -> str:
+    """Fingerprint a group of partial insights, so their merged result can be cached"""
+    text = json.dumps(list(partials), sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
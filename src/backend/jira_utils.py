@@ -0,0 +1,137 @@
+"""
+Helpers shared by the synchronous and asynchronous JIRA clients
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+from datetime import datetime, timedelta
+import re
+
+# An issue key as JIRA writes it (e.g. PROD-123); anything else must never reach JQL
+ISSUE_KEY_PATTERN = re.compile(r'^[A-Z][A-Z0-9_]*-\d+$')
+
+# Ticket dict key filled from each JIRA field ("key" and "url" are always present)
+FIELD_KEYS = {
+    "summary": "summary",
+    "description": "description",
+    "issuetype": "issue_type",
+    "status": "status",
+    "resolution": "resolution",
+    "created": "created",
+    "updated": "updated",
+    "priority": "priority",
+    "assignee": "assignee",
+    "reporter": "reporter",
+    "labels": "labels",
+    "comment": "comments"
+}
+
+
+def profile_fields(jira_config: Mapping[str, Any], profile: Optional[str] = None) -> List[str]:
+    """
+    JIRA fields to request for a field profile
+
+    Args:
+        jira_config: The ``jira`` section of config.yaml
+        profile: Name under ``jira.field_profiles``; None or "detail" means all ``jira.fields``
+
+    Raises:
+        ValueError: If the profile is not configured
+    """
+    if profile is None or profile == "detail":
+        return list(jira_config.get('fields', []))
+
+    profiles = jira_config.get('field_profiles', {})
+    if profile not in profiles:
+        raise ValueError(f"Unknown field profile: {profile}")
+    return list(profiles[profile])
+
+
+def ticket_keys(fields: Sequence[str]) -> List[str]:
+    """Ticket dict keys produced when only ``fields`` are fetched"""
+    return ["key", "url"] + [FIELD_KEYS[field] for field in fields if field in FIELD_KEYS]
+
+
+def build_jql(
+    projects: Optional[List[str]] = None,
+    issue_types: Optional[List[str]] = None,
+    statuses: Optional[List[str]] = None,
+    days_back: Optional[int] = None
+) -> str:
+    """Build a JQL query from search criteria"""
+    jql_parts = []
+
+    if projects:
+        project_filter = " OR ".join([f"project = {p}" for p in projects])
+        jql_parts.append(f"({project_filter})")
+
+    if issue_types:
+        type_filter = " OR ".join([f"issuetype = '{t}'" for t in issue_types])
+        jql_parts.append(f"({type_filter})")
+
+    if statuses:
+        status_filter = " OR ".join([f"status = '{s}'" for s in statuses])
+        jql_parts.append(f"({status_filter})")
+
+    if days_back:
+        date_threshold = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
+        jql_parts.append(f"updated >= '{date_threshold}'")
+
+    jql = " AND ".join(jql_parts) if jql_parts else "project is not EMPTY"
+    return jql + " ORDER BY updated DESC"
+
+
+def format_ticket(
+    raw: Dict[str, Any],
+    jira_url: Optional[str],
+    fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Convert a raw JIRA REST (v2) issue into a ticket dict
+
+    Args:
+        raw: Issue JSON as returned by the search or issue endpoints
+        jira_url: Base URL of the JIRA site, used for browse links
+        fields: JIRA fields that were requested; other keys are left out (None keeps all)
+
+    Returns:
+        Ticket dict in the shape used throughout the application
+    """
+    issue_fields = raw.get("fields") or {}
+
+    def name(field: str) -> Optional[str]:
+        value = issue_fields.get(field)
+        return value.get("name") if value else None
+
+    def display_name(field: str) -> Optional[str]:
+        value = issue_fields.get(field)
+        return value.get("displayName") if value else None
+
+    ticket = {
+        "key": raw["key"],
+        "summary": issue_fields.get("summary"),
+        "description": issue_fields.get("description", ''),
+        "issue_type": name("issuetype"),
+        "status": name("status"),
+        "resolution": name("resolution"),
+        "created": str(issue_fields.get("created")),
+        "updated": str(issue_fields.get("updated")),
+        "priority": name("priority"),
+        "assignee": display_name("assignee"),
+        "reporter": display_name("reporter"),
+        "labels": issue_fields.get("labels") or [],
+        "url": f"{jira_url}/browse/{raw['key']}"
+    }
+
+    # Get comments
+    comments = []
+    for comment in (issue_fields.get("comment") or {}).get("comments") or []:
+        comments.append({
+            "author": (comment.get("author") or {}).get("displayName"),
+            "body": comment.get("body"),
+            "created": str(comment.get("created"))
+        })
+    ticket["comments"] = comments
+
+    if fields is not None:
+        return {key: ticket[key] for key in ticket_keys(fields)}
+    return ticket
@@ -3,7 +3,8 @@ LLM Integration with ChatGroq and Langchain
 Handles query analysis and ticket matching using Llama LLM
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Mapping, Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import os
 from langchain_groq import ChatGroq
 from langchain_core.prompts import PromptTemplate
@@ -11,35 +12,114 @@ from langchain_core.prompts import PromptTemplate
 # from langchain_community.embeddings import HuggingFaceEmbeddings
 from pydantic import SecretStr
 from dotenv import load_dotenv
-import yaml
 import json
+import logging
+import time
+
+from .config_manager import ConfigSnapshot, get_config
+from .insights import chunk_tickets, insights_fingerprint, merge_insights
+from .llm_dispatch import BACKGROUND, INTERACTIVE, LLMDispatcher
+from .metrics import FALLBACKS, LLM_PROMPT_TOKENS, LLM_SECONDS, LLM_TOKENS, record_span, timed
+from .prompt_budget import PromptPacker, TokenCounter
+from .response_cache import ResponseCache, corpus_fingerprint
+from .search_index import BM25Index, reciprocal_rank_fusion
+from .tickets import TicketCollection
+from .vector_index import VectorIndex
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 class JiraLLMAgent:
     """LLM Agent for analyzing queries and matching tickets"""
     def __init__(self):
         # Initialize Groq LLM
         api_key = os.getenv("GROQ_API_KEY")
+        model = os.getenv("LLM_MODEL", "llama-3.1-70b-versatile")
         self.llm = ChatGroq(
             api_key=SecretStr(api_key) if api_key else None,
-            model=os.getenv("LLM_MODEL", "llama-3.1-70b-versatile"),
+            model=model,
             temperature=float(os.getenv("LLM_TEMPERATURE", "0.7")),
             max_tokens=int(os.getenv("LLM_MAX_TOKENS", "2048"))
         )
         
-        # Load configuration
-        config_path = os.path.join(os.path.dirname(__file__), "../../config/config.yaml")
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        # Settings below size components and apply at startup; the rest of
+        # the llm section is read from the current snapshot per call
+        config = self.config
+        
+        # INDEX_MODE=read: another process (e.g. `python main.py sync`) writes
+        # the index files; this one only loads them and keeps its updates in memory
+        read_only = os.getenv('INDEX_MODE', 'write').lower() == 'read'
+        
+        # Lexical index over the ticket corpus for fallback matching and retrieval
+        index_config = config.get('llm.search_index', {})
+        self.search_index = BM25Index(
+            self._data_path(index_config.get('path')),
+            k1=index_config.get('k1', 1.5),
+            b=index_config.get('b', 0.75),
+            read_only=read_only
+        )
+        
+        # Hashed embeddings instead of a transformer model (512MB limit on Render)
+        vector_config = config.get('llm.vector_index', {})
+        self.vector_index: Optional[VectorIndex] = None
+        if vector_config.get('enabled', False):
+            self.vector_index = VectorIndex(
+                self._data_path(vector_config.get('path')),
+                dim=vector_config.get('dim', 1024),
+                dtype=vector_config.get('dtype', 'float16'),
+                read_only=read_only
+            )
         
-        # Skip embeddings initialization to save memory (512MB limit on Render)
-        # Use LLM-based matching instead
-        self.embeddings = None
+        # Cache for repeated and near-duplicate queries
+        cache_config = config.get('llm.cache', {})
+        self.cache: Optional[ResponseCache] = None
+        if cache_config.get('enabled', False):
+            self.cache = ResponseCache(
+                max_entries=cache_config.get('max_entries', 512),
+                ttl_seconds=cache_config.get('ttl_seconds', 3600),
+                similarity_threshold=cache_config.get('similarity_threshold', 0.85)
+            )
+        
+        self.token_counter = TokenCounter(model)
+        
+        # Per-chunk insight summaries, keyed by the chunk's tickets and versions
+        insights_config = config.get('llm.insights', {})
+        self.insights_cache = ResponseCache(
+            max_entries=insights_config.get('cache_max_entries', 1024),
+            ttl_seconds=insights_config.get('cache_ttl_seconds', 86400)
+        )
+        
+        # One queue for every Groq call: coalescing, rate limits and priorities
+        rate_config = config.get('llm.rate_limit', {})
+        self.expected_output_tokens = rate_config.get('expected_output_tokens', 400)
+        self.dispatcher = LLMDispatcher(
+            requests_per_minute=rate_config.get('requests_per_minute'),
+            tokens_per_minute=rate_config.get('tokens_per_minute'),
+            max_retries=rate_config.get('max_retries', 3),
+            backoff_seconds=rate_config.get('backoff_seconds', 2.0)
+        )
         
         self._setup_prompts()
     
+    @property
+    def config(self) -> ConfigSnapshot:
+        """Current configuration (replaced when config.yaml changes)"""
+        return get_config()
+    
+    @property
+    def prompt_budget(self) -> Mapping[str, Any]:
+        """Token budgets for ticket text in the matching and resolution prompts"""
+        return self.config.get('llm.prompt_budget', {})
+    
+    @staticmethod
+    def _data_path(path: Optional[str]) -> Optional[str]:
+        """Resolve a config path relative to the project root"""
+        if not path:
+            return None
+        return os.path.normpath(os.path.join(os.path.dirname(__file__), "../..", path))
+    
     def _setup_prompts(self):
         """Setup prompt templates for different tasks"""
         
@@ -114,9 +194,133 @@ Provide a detailed resolution that includes:
 4. Additional recommendations or best practices
 
 Format your response clearly and professionally.
+"""
+        )
+        
+        # Insight extraction prompts (map over chunks, then reduce)
+        self.insights_prompt = PromptTemplate(
+            input_variables=["tickets_summary"],
+            template="""Analyze these JIRA tickets and identify:
+1. Common issues and patterns
+2. Frequently used resolutions
+3. Recurring technical problems
+4. Recommendations for knowledge base
+
+Tickets Summary:
+{tickets_summary}
+
+Provide insights in JSON format:
+{{
+    "common_issues": ["issue1", "issue2", ...],
+    "common_resolutions": ["resolution1", "resolution2", ...],
+    "recommendations": ["recommendation1", "recommendation2", ...]
+}}
+"""
+        )
+        
+        self.insights_reduce_prompt = PromptTemplate(
+            input_variables=["partial_insights"],
+            template="""The following insights were each extracted from a different group of JIRA tickets.
+Combine them into one set of insights: merge duplicates and near-duplicates, and rank items
+by how often they recur across groups.
+
+Partial Insights:
+{partial_insights}
+
+Provide insights in JSON format:
+{{
+    "common_issues": ["issue1", "issue2", ...],
+    "common_resolutions": ["resolution1", "resolution2", ...],
+    "recommendations": ["recommendation1", "recommendation2", ...]
+}}
 """
         )
     
+    def index_tickets(self, tickets: Sequence[Mapping[str, Any]]) -> int:
+        """
+        Bring the search index up to date with the given tickets
+        
+        Args:
+            tickets: Ticket dicts, e.g. from JiraClient.search_tickets
+            
+        Returns:
+            Number of tickets that were (re)indexed
+        """
+        # Index files saved by another process (e.g. `python main.py sync`) replace this copy
+        self.search_index.reload_if_changed()
+        if self.vector_index is not None:
+            self.vector_index.reload_if_changed()
+        
+        changed = self.search_index.update_tickets(tickets)
+        if changed:
+            self.search_index.save()
+        
+        if self.vector_index is not None and self.vector_index.update_tickets(tickets):
+            self.vector_index.save()
+        
+        return changed
+    
+    def remove_tickets(self, keys: List[str]) -> int:
+        """
+        Drop deleted tickets from the search indexes
+        
+        Args:
+            keys: Ticket keys
+            
+        Returns:
+            Number of tickets that were indexed
+        """
+        removed = sum(self.search_index.remove(key) for key in keys)
+        if removed:
+            self.search_index.save()
+        
+        if self.vector_index is not None and sum(self.vector_index.remove(key) for key in keys):
+            self.vector_index.save()
+        
+        return removed
+    
+    def retrieve_candidates(
+        self,
+        query: str,
+        tickets: Iterable[Mapping[str, Any]],
+        limit: Optional[int] = None,
+        pad: bool = True
+    ) -> TicketCollection:
+        """
+        Pick the tickets most similar to the query before prompting the LLM
+        
+        Args:
+            query: User's question or problem
+            tickets: Full candidate corpus, newest first
+            limit: Number of candidates to keep (defaults to llm.candidate_pool_size)
+            pad: Fill up with the most recently updated tickets when too few match
+            
+        Returns:
+            Up to ``limit`` tickets, best lexical/semantic matches first
+        """
+        if limit is None:
+            limit = self.config.get('llm.candidate_pool_size', 20)
+        limit = int(limit)
+        
+        corpus = TicketCollection.of(tickets)
+        if pad and len(corpus) <= limit:
+            return corpus
+        
+        self.index_tickets(corpus)
+        
+        ranked = [key for key, _ in self.search_index.search(query, limit, keys=corpus.keys())]
+        if self.vector_index is not None:
+            semantic = [key for key, _ in self.vector_index.search(query, limit, keys=corpus.keys())]
+            ranked = reciprocal_rank_fusion(ranked, semantic)
+        
+        candidates = TicketCollection(corpus[key] for key in ranked[:limit])
+        if pad and len(candidates) < limit:
+            candidates.extend(
+                [t for t in corpus if t not in candidates][:limit - len(candidates)]
+            )
+        
+        return candidates
+    
     def analyze_query(self, query: str) -> Dict[str, Any]:
         """
         Analyze user query to extract key information
@@ -127,15 +331,23 @@ Format your response clearly and professionally.
         Returns:
             Analysis results with main problem, key terms, etc.
         """
+        if self.cache is not None:
+            cached = self.cache.get("analysis", query)
+            if cached is not None:
+                return cached
+        
         try:
-            chain = self.query_analysis_prompt | self.llm
-            response = chain.invoke({"query": query}).content
+            response = self._invoke("analysis", self.query_analysis_prompt, {"query": query}).content
             # Parse JSON response
             response_str = response if isinstance(response, str) else str(response)
             analysis = json.loads(response_str)
+            if self.cache is not None:
+                self.cache.set("analysis", query, analysis)
             return analysis
         except Exception as e:
             # Fallback to simple analysis
+            FALLBACKS.inc(path="analysis")
+            logger.warning("Query analysis failed, using the query as is: %s", e)
             return {
                 "main_problem": query,
                 "key_terms": [],
@@ -164,23 +376,32 @@ Format your response clearly and professionally.
         if not historical_tickets:
             return []
         
+        config = self.config
         if top_k is None:
-            top_k = self.config['llm']['top_k_results']
+            top_k = config.get('llm.top_k_results')
         
         # Ensure top_k is an int for type safety
         top_k = int(top_k) if top_k is not None else 5
         
-        # Format tickets for LLM
-        tickets_text = ""
-        for i, ticket in enumerate(historical_tickets[:20], 1):  # Limit to 20 for context
-            tickets_text += f"\n{i}. [{ticket['key']}] {ticket['summary']}\n"
-            description = (ticket.get('description') or 'N/A')[:200]
-            tickets_text += f"   Description: {description}...\n"
-            tickets_text += f"   Status: {ticket['status']} | Resolution: {ticket.get('resolution') or 'N/A'}\n"
+        # Cached matches are only valid for the exact same ticket corpus and settings
+        scope = None
+        if self.cache is not None:
+            scope = (corpus_fingerprint(historical_tickets), top_k, config.version)
+            cached = self.cache.get("matches", query, scope)
+            if cached is not None:
+                return cached
+        
+        # Rank locally so the prompt carries the best candidates, not the newest,
+        # then keep as many of them as fit the token budget
+        candidates = self.retrieve_candidates(
+            query, historical_tickets, limit=self.prompt_budget.get('max_candidates')
+        )
+        tickets_text, included = self._pack_candidates(candidates)
         
         try:
-            chain = self.ticket_matching_prompt | self.llm
-            response = chain.invoke({"query": query, "tickets": tickets_text}).content
+            response = self._invoke(
+                "matching", self.ticket_matching_prompt, {"query": query, "tickets": tickets_text}
+            ).content
             # Parse JSON response
             response_str = response if isinstance(response, str) else str(response)
             result = json.loads(response_str)
@@ -190,7 +411,7 @@ Format your response clearly and professionally.
             enhanced_matches = []
             for match in matches[:top_k]:
                 ticket_key = match["ticket_key"]
-                full_ticket = next((t for t in historical_tickets if t["key"] == ticket_key), None)
+                full_ticket = included.get(ticket_key)
                 if full_ticket:
                     enhanced_match = {
                         **match,
@@ -198,47 +419,38 @@ Format your response clearly and professionally.
                     }
                     enhanced_matches.append(enhanced_match)
             
+            if self.cache is not None:
+                self.cache.set("matches", query, enhanced_matches, scope)
             return enhanced_matches
         except Exception as e:
-            # Fallback to simple keyword matching
-            return self._simple_keyword_match(query, historical_tickets, top_k)
+            # Fallback to keyword matching
+            FALLBACKS.inc(path="keyword_match")
+            logger.warning("LLM matching failed, using keyword matching: %s", e)
+            return self._keyword_match(query, historical_tickets, top_k)
     
-    def _simple_keyword_match(
+    def _keyword_match(
         self,
         query: str,
-        tickets: List[Dict[str, Any]],
+        tickets: Iterable[Mapping[str, Any]],
         top_k: int
     ) -> List[Dict[str, Any]]:
-        """Simple fallback keyword matching"""
-        query_lower = query.lower()
+        """Fallback keyword matching using the BM25 index"""
+        corpus = TicketCollection.of(tickets)
+        self.index_tickets(corpus)
+        
         matches = []
+        for key, score in self.search_index.search(query, top_k, keys=corpus.keys()):
+            ticket = corpus[key]
+            matches.append({
+                "ticket_key": key,
+                "relevance_score": min(round(score, 1), 10),
+                "reasoning": "Keyword match",
+                "has_solution": bool(ticket.get("resolution")),
+                "solution_summary": ticket.get("resolution") or "",
+                "ticket_data": ticket
+            })
         
-        for ticket in tickets:
-            score = 0
-            summary = (ticket.get('summary') or '').lower()
-            description = (ticket.get('description') or '').lower()
-            
-            # Simple keyword scoring
-            for word in query_lower.split():
-                if len(word) > 3:  # Only consider meaningful words
-                    if word in summary:
-                        score += 2
-                    if word in description:
-                        score += 1
-            
-            if score > 0:
-                matches.append({
-                    "ticket_key": ticket["key"],
-                    "relevance_score": min(score, 10),
-                    "reasoning": "Keyword match",
-                    "has_solution": bool(ticket.get("resolution")),
-                    "solution_summary": ticket.get("resolution") or "",
-                    "ticket_data": ticket
-                })
-        
-        # Sort by score and return top_k
-        matches.sort(key=lambda x: x["relevance_score"], reverse=True)
-        return matches[:top_k]
+        return matches
     
     def generate_resolution(
         self,
@@ -258,30 +470,180 @@ Format your response clearly and professionally.
         if not matched_tickets:
             return "No similar historical tickets found. Please provide more details or consult the team."
         
-        # Format matched tickets for prompt
-        tickets_text = ""
-        for i, match in enumerate(matched_tickets, 1):
-            ticket = match.get("ticket_data", {})
-            tickets_text += f"\n{i}. [{ticket.get('key', 'N/A')}] {ticket.get('summary', 'N/A')}\n"
-            tickets_text += f"   Relevance Score: {match.get('relevance_score', 0)}/10\n"
-            tickets_text += f"   Resolution: {ticket.get('resolution', 'N/A')}\n"
-            
-            # Add relevant comments if available
-            comments = ticket.get('comments', [])
-            if comments:
-                tickets_text += f"   Key Comments:\n"
-                for comment in comments[:2]:  # Top 2 comments
-                    tickets_text += f"     - {comment.get('body', '')[:150]}...\n"
+        scope = None
+        if self.cache is not None:
+            scope = (corpus_fingerprint(m.get("ticket_data", {}) for m in matched_tickets), self.config.version)
+            cached = self.cache.get("resolution", query, scope)
+            if cached is not None:
+                return cached
+        
+        tickets_text = self._format_matched_tickets(matched_tickets)
         
         try:
-            chain = self.resolution_prompt | self.llm
-            response = chain.invoke({"query": query, "matched_tickets": tickets_text})
+            response = self._invoke(
+                "resolution", self.resolution_prompt, {"query": query, "matched_tickets": tickets_text}
+            )
             resolution = response.content if hasattr(response, 'content') else str(response)
-            return str(resolution) if not isinstance(resolution, str) else resolution
+            resolution = str(resolution) if not isinstance(resolution, str) else resolution
+            if self.cache is not None:
+                self.cache.set("resolution", query, resolution, scope)
+            return resolution
         except Exception as e:
             # Fallback to basic response
-            top_ticket = matched_tickets[0].get("ticket_data", {})
-            return f"""Based on similar ticket {top_ticket.get('key', 'N/A')}:
+            FALLBACKS.inc(path="resolution")
+            logger.warning("Resolution generation failed, listing matches instead: %s", e)
+            return self._fallback_resolution(matched_tickets)
+    
+    def stream_resolution(
+        self,
+        query: str,
+        matched_tickets: List[Dict[str, Any]]
+    ) -> Iterator[str]:
+        """
+        Stream a resolution as the LLM produces it
+        
+        Args:
+            query: User's question or problem
+            matched_tickets: List of matched tickets with relevance scores
+            
+        Yields:
+            Chunks of resolution text
+        """
+        if not matched_tickets:
+            yield "No similar historical tickets found. Please provide more details or consult the team."
+            return
+        
+        scope = None
+        if self.cache is not None:
+            scope = (corpus_fingerprint(m.get("ticket_data", {}) for m in matched_tickets), self.config.version)
+            cached = self.cache.get("resolution", query, scope)
+            if cached is not None:
+                yield cached
+                return
+        
+        tickets_text = self._format_matched_tickets(matched_tickets)
+        chunks: List[str] = []
+        started = time.perf_counter()
+        try:
+            inputs = {"query": query, "matched_tickets": tickets_text}
+            tokens = self._estimate_tokens(self.resolution_prompt, inputs)
+            LLM_PROMPT_TOKENS.observe(tokens - self.expected_output_tokens, prompt="resolution_stream")
+            self.dispatcher.acquire(tokens, INTERACTIVE)
+            chain = self.resolution_prompt | self.llm
+            for chunk in chain.stream(inputs):
+                content = chunk.content if hasattr(chunk, 'content') else chunk
+                if content:
+                    text = content if isinstance(content, str) else str(content)
+                    chunks.append(text)
+                    yield text
+            if self.cache is not None and chunks:
+                self.cache.set("resolution", query, "".join(chunks), scope)
+        except Exception as e:
+            # Fall back only if nothing was sent yet; a partial answer stays as is
+            FALLBACKS.inc(path="resolution_stream")
+            logger.warning("Resolution stream failed after %d chunks: %s", len(chunks), e)
+            if not chunks:
+                yield self._fallback_resolution(matched_tickets)
+        finally:
+            elapsed = time.perf_counter() - started
+            LLM_SECONDS.observe(elapsed, prompt="resolution_stream")
+            record_span("llm.resolution_stream", elapsed)
+    
+    def _estimate_tokens(self, prompt: PromptTemplate, inputs: Dict[str, Any]) -> int:
+        """Prompt tokens plus the completion tokens reserved for a call"""
+        return self.token_counter.count(prompt.format(**inputs)) + self.expected_output_tokens
+    
+    def _invoke(
+        self,
+        name: str,
+        prompt: PromptTemplate,
+        inputs: Dict[str, Any],
+        priority: int = INTERACTIVE
+    ) -> Any:
+        """
+        Run a prompt through the shared dispatcher
+        
+        Identical prompts already in flight share one request, calls wait
+        for the configured requests/tokens-per-minute budget (interactive
+        calls first), and 429 responses are retried instead of surfacing
+        as fallbacks. Latency and token usage are recorded under ``name``.
+        """
+        text = prompt.format(**inputs)
+        chain = prompt | self.llm
+        prompt_tokens = self.token_counter.count(text)
+        LLM_PROMPT_TOKENS.observe(prompt_tokens, prompt=name)
+        
+        def send() -> Any:
+            response = chain.invoke(inputs)
+            # Only the request actually sent counts; coalesced callers share it
+            usage = getattr(response, "usage_metadata", None) or {}
+            LLM_TOKENS.inc(usage.get("input_tokens", prompt_tokens), prompt=name, direction="input")
+            LLM_TOKENS.inc(usage.get("output_tokens", 0), prompt=name, direction="output")
+            return response
+        
+        with timed(LLM_SECONDS, span=f"llm.{name}", prompt=name):
+            return self.dispatcher.call(
+                send,
+                key=text,
+                tokens=prompt_tokens + self.expected_output_tokens,
+                priority=priority
+            )
+    
+    def _pack_candidates(
+        self,
+        candidates: Iterable[Mapping[str, Any]]
+    ) -> Tuple[str, TicketCollection]:
+        """
+        Format candidates for the matching prompt within the token budget
+        
+        Returns:
+            Prompt text and the included tickets by key
+        """
+        packer = PromptPacker(self.token_counter, self.prompt_budget.get('match_tokens', 3000))
+        description_tokens = self.prompt_budget.get('description_tokens', 120)
+        included = TicketCollection()
+        
+        for ticket in candidates:
+            header = (
+                f"\n{len(packer) + 1}. [{ticket['key']}] {ticket.get('summary')}\n"
+                f"   Status: {ticket.get('status')} | Resolution: {ticket.get('resolution') or 'N/A'}\n"
+            )
+            description = self.token_counter.truncate(ticket.get('description') or 'N/A', description_tokens)
+            if packer.add(header, [f"   Description: {description}\n"]):
+                included.append(ticket)
+        
+        return packer.text(), included
+    
+    def _format_matched_tickets(self, matched_tickets: List[Dict[str, Any]]) -> str:
+        """Format matched tickets for the resolution prompt within the token budget"""
+        packer = PromptPacker(self.token_counter, self.prompt_budget.get('resolution_tokens', 2500))
+        comment_tokens = self.prompt_budget.get('comment_tokens', 60)
+        max_comments = self.prompt_budget.get('max_comments', 3)
+        
+        for match in matched_tickets:
+            ticket = match.get("ticket_data", {})
+            header = (
+                f"\n{len(packer) + 1}. [{ticket.get('key', 'N/A')}] {ticket.get('summary', 'N/A')}\n"
+                f"   Relevance Score: {match.get('relevance_score', 0)}/10\n"
+                f"   Resolution: {ticket.get('resolution', 'N/A')}\n"
+            )
+            
+            # Add relevant comments if available
+            comments = [
+                f"     - {self.token_counter.truncate(comment.get('body') or '', comment_tokens)}\n"
+                for comment in (ticket.get('comments') or [])[:max_comments]
+            ]
+            if comments:
+                comments[0] = "   Key Comments:\n" + comments[0]
+            
+            packer.add(header, comments)
+        
+        return packer.text()
+    
+    def _fallback_resolution(self, matched_tickets: List[Dict[str, Any]]) -> str:
+        """Basic resolution from the top match when the LLM is unavailable"""
+        top_ticket = matched_tickets[0].get("ticket_data", {})
+        return f"""Based on similar ticket {top_ticket.get('key', 'N/A')}:
 
 Summary: {top_ticket.get('summary', 'N/A')}
 Resolution: {top_ticket.get('resolution', 'No resolution documented')}
@@ -291,13 +653,28 @@ Please refer to the ticket for more details: {top_ticket.get('url', 'N/A')}
     
     def extract_key_insights(
         self,
-        tickets: List[Dict[str, Any]]
+        tickets: List[Dict[str, Any]],
+        priority: int = BACKGROUND
     ) -> Dict[str, Any]:
         """
         Extract key insights and patterns from tickets
         
+        Tickets are split into stable chunks that are summarised concurrently
+        (map), then the partial insights are merged by the LLM in groups
+        (reduce), one level at a time. Chunk and group results are cached by
+        content, so re-running a window only summarises chunks whose tickets
+        changed and only re-merges the groups above them. At most
+        ``llm.insights.max_map_calls`` uncached chunks, newest first, are
+        summarised per call so that a large window stays within the request
+        timeout; the others are left for later calls, and ``coverage``
+        reports how many chunks the insights cover. Likewise at most
+        ``llm.insights.max_reduce_calls`` uncached groups are merged by the
+        LLM; the others are merged locally by frequency until a later call.
+        
         Args:
             tickets: List of JIRA tickets
+            priority: Dispatcher priority of the LLM calls (queued behind
+                interactive queries by default)
             
         Returns:
             Insights about common issues, resolutions, etc.
@@ -305,40 +682,118 @@ Please refer to the ticket for more details: {top_ticket.get('url', 'N/A')}
         if not tickets:
             return {"insights": []}
         
-        insights_prompt = PromptTemplate(
-            input_variables=["tickets_summary"],
-            template="""Analyze these JIRA tickets and identify:
-1. Common issues and patterns
-2. Frequently used resolutions
-3. Recurring technical problems
-4. Recommendations for knowledge base
-
-Tickets Summary:
-{tickets_summary}
-
-Provide insights in JSON format:
-{{
-    "common_issues": ["issue1", "issue2", ...],
-    "common_resolutions": ["resolution1", "resolution2", ...],
-    "recommendations": ["recommendation1", "recommendation2", ...]
-}}
-"""
+        insights_config = self.config.get('llm.insights', {})
+        chunks = chunk_tickets(tickets, chunk_size=insights_config.get('chunk_size', 40))
+        
+        # Partials stay in chunk order, so reduce groups are the same on every call
+        results: List[Optional[Dict[str, Any]]] = [
+            self.insights_cache.get("chunk", "", scope=corpus_fingerprint(chunk)) for chunk in chunks
+        ]
+        # Chunks are in key order, so the newest tickets are summarised first
+        uncached = [i for i, result in enumerate(results) if result is None][::-1]
+        uncached = uncached[:max(0, insights_config.get('max_map_calls', 12))]
+        
+        # Map: summarise chunks with bounded parallelism
+        summaries = self._run_concurrently(lambda i: self._chunk_insights(chunks[i], priority), uncached)
+        for i, summary in zip(uncached, summaries):
+            results[i] = summary
+        partials = [result for result in results if result is not None]
+        coverage = {"chunks": len(chunks), "analyzed": len(partials)}
+        
+        if not partials:
+            return {
+                "common_issues": [],
+                "common_resolutions": [],
+                "recommendations": ["Unable to generate insights at this time"],
+                "coverage": coverage
+            }
+        
+        # Reduce: merge partial insights in groups until one is left
+        fan_in = max(2, insights_config.get('reduce_fan_in', 8))
+        reduce_calls = max(0, insights_config.get('max_reduce_calls', 4))
+        while len(partials) > 1:
+            groups = [partials[i:i + fan_in] for i in range(0, len(partials), fan_in)]
+            merged: List[Optional[Dict[str, Any]]] = [
+                group[0] if len(group) == 1 else self.insights_cache.get("reduce", "", scope=insights_fingerprint(group))
+                for group in groups
+            ]
+            uncached = [i for i, result in enumerate(merged) if result is None]
+            calls = uncached[:reduce_calls]
+            reduce_calls -= len(calls)
+            reduced = self._run_concurrently(lambda i: self._reduce_insights(groups[i], priority), calls)
+            for i, result in zip(calls, reduced):
+                merged[i] = result
+            # Over the cap: merge locally now, with the LLM on a later call
+            for i in uncached[len(calls):]:
+                merged[i] = merge_insights(groups[i])
+            partials = [result for result in merged if result is not None]
+        
+        return {**partials[0], "coverage": coverage}
+    
+    def _run_concurrently(self, call: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """Results of ``call`` for each item, at most ``llm.insights.max_concurrency`` at a time"""
+        if len(items) <= 1:
+            return [call(item) for item in items]
+        max_workers = max(1, min(self.config.get('llm.insights.max_concurrency', 4), len(items)))
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="insights") as pool:
+            return list(pool.map(call, items))
+    
+    def _chunk_insights(
+        self,
+        chunk: List[Dict[str, Any]],
+        priority: int = BACKGROUND
+    ) -> Optional[Dict[str, Any]]:
+        """Summarise one chunk of tickets, reusing the cached result if unchanged"""
+        fingerprint = corpus_fingerprint(chunk)
+        cached = self.insights_cache.get("chunk", "", scope=fingerprint)
+        if cached is not None:
+            return cached
+        
+        summary = "\n".join(
+            f"- {ticket.get('summary', 'N/A')} ({ticket.get('status', 'N/A')}"
+            f"{', resolution: ' + ticket['resolution'] if ticket.get('resolution') else ''})"
+            for ticket in chunk
         )
         
-        # Summarize tickets
-        summary = ""
-        for ticket in tickets[:30]:  # Analyze top 30
-            summary += f"- {ticket.get('summary', 'N/A')} ({ticket.get('status', 'N/A')})\n"
+        try:
+            response = self._invoke(
+                "insights_map", self.insights_prompt, {"tickets_summary": summary}, priority
+            ).content
+            response_str = response if isinstance(response, str) else str(response)
+            insights = json.loads(response_str)
+            self.insights_cache.set("chunk", "", insights, scope=fingerprint)
+            return insights
+        except Exception as e:
+            FALLBACKS.inc(path="insights_chunk")
+            logger.warning("Skipping insights for a chunk of %d tickets: %s", len(chunk), e)
+            return None
+    
+    def _reduce_insights(
+        self,
+        partials: List[Dict[str, Any]],
+        priority: int = BACKGROUND
+    ) -> Dict[str, Any]:
+        """Merge partial insights with the LLM, falling back to frequency ranking"""
+        if len(partials) == 1:
+            return partials[0]
+        
+        fingerprint = insights_fingerprint(partials)
+        cached = self.insights_cache.get("reduce", "", scope=fingerprint)
+        if cached is not None:
+            return cached
         
         try:
-            chain = insights_prompt | self.llm
-            response = chain.invoke({"tickets_summary": summary}).content
+            response = self._invoke(
+                "insights_reduce",
+                self.insights_reduce_prompt,
+                {"partial_insights": json.dumps(partials, indent=1)},
+                priority
+            ).content
             response_str = response if isinstance(response, str) else str(response)
             insights = json.loads(response_str)
+            self.insights_cache.set("reduce", "", insights, scope=fingerprint)
             return insights
         except Exception as e:
-            return {
-                "common_issues": [],
-                "common_resolutions": [],
-                "recommendations": ["Unable to generate insights at this time"]
-            }
+            FALLBACKS.inc(path="insights_reduce")
+            logger.warning("LLM reduce failed, merging insights by frequency: %s", e)
+            return merge_insights(partials)
@@ -0,0 +1,221 @@
+"""
+Shared dispatch layer for LLM calls
+Coalesces identical in-flight requests and enforces client-side rate limits
+"""
+
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+from concurrent.futures import Future
+import heapq
+import itertools
+import threading
+import time
+
+T = TypeVar("T")
+
+# Request priorities; lower values are sent first
+INTERACTIVE = 0
+BACKGROUND = 10
+
+
+class TokenBucket:
+    """
+    Continuously refilling budget of ``per_minute`` units
+
+    Not thread-safe on its own; LLMDispatcher serialises access. The level
+    may go negative when actual usage turns out higher than estimated, which
+    delays later requests accordingly.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float, now: Optional[float] = None) -> float:
+        """Seconds until ``amount`` can be taken (requests larger than the bucket wait for a full one)"""
+        self._refill(time.monotonic() if now is None else now)
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def consume(self, amount: float):
+        """Take ``amount`` from the bucket"""
+        self.level -= amount
+
+
+def is_rate_limit_error(error: BaseException) -> bool:
+    """Whether an LLM client error is an HTTP 429"""
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """The Retry-After header of a rate-limit error, if the server sent one"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMDispatcher:
+    """
+    Send LLM requests through one queue shared by all callers
+
+    - Single-flight: concurrent calls with the same key share one request.
+    - Rate limits: token buckets for requests and tokens per minute; each
+      call reserves its estimated tokens and is corrected by the actual
+      usage reported in the response.
+    - Priorities: waiting requests are admitted lowest priority value first
+      (FIFO within a priority), so interactive calls overtake queued
+      background work.
+    - 429 responses pause the whole queue (honouring Retry-After) and the
+      request is retried.
+
+    Example:
+        dispatcher = LLMDispatcher(requests_per_minute=30, tokens_per_minute=6000)
+        response = dispatcher.call(lambda: chain.invoke(inputs), key=prompt_text, tokens=800)
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        max_retries: int = 3,
+        backoff_seconds: float = 2.0
+    ):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+
+        self.coalesced = 0
+        self.retries = 0
+        self.throttled_seconds = 0.0
+
+        self._cond = threading.Condition()
+        self._queue: List[Tuple[int, int]] = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._inflight: Dict[Hashable, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0, priority: int = INTERACTIVE):
+        """Block until a request may be sent, then reserve its budget"""
+        started = time.monotonic()
+        with self._cond:
+            entry = (priority, next(self._seq))
+            heapq.heappush(self._queue, entry)
+            try:
+                while True:
+                    delay: Optional[float] = None
+                    if self._queue[0] == entry:
+                        now = time.monotonic()
+                        delay = max(
+                            self._paused_until - now,
+                            self.requests.wait_time(1, now) if self.requests else 0.0,
+                            self.tokens.wait_time(tokens, now) if self.tokens else 0.0
+                        )
+                        if delay <= 0:
+                            heapq.heappop(self._queue)
+                            if self.requests:
+                                self.requests.consume(1)
+                            if self.tokens:
+                                self.tokens.consume(tokens)
+                            self._cond.notify_all()
+                            break
+                    self._cond.wait(delay)
+            except BaseException:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+            self.throttled_seconds += time.monotonic() - started
+
+    def release_unused(self, reserved: int, used: int):
+        """Correct a token reservation once actual usage is known"""
+        if self.tokens is None:
+            return
+        with self._cond:
+            self.tokens.consume(used - reserved)
+            self._cond.notify_all()
+
+    def pause(self, seconds: float):
+        """Hold every queued request for ``seconds`` (after a 429)"""
+        with self._cond:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def call(
+        self,
+        func: Callable[[], T],
+        key: Optional[Hashable] = None,
+        tokens: int = 0,
+        priority: int = INTERACTIVE
+    ) -> T:
+        """
+        Run ``func`` (one LLM request) under the shared limits
+
+        Args:
+            func: Sends the request and returns the response
+            key: Identifies the request for coalescing (None to never coalesce)
+            tokens: Estimated prompt plus completion tokens
+            priority: INTERACTIVE, BACKGROUND or another ordering value
+
+        Returns:
+            The response, possibly shared with concurrent identical calls
+        """
+        if key is None:
+            return self._send(func, tokens, priority)
+
+        with self._inflight_lock:
+            shared = self._inflight.get(key)
+            if shared is None:
+                future: Future = Future()
+                self._inflight[key] = future
+            else:
+                self.coalesced += 1
+
+        if shared is not None:
+            return shared.result()
+
+        try:
+            result = self._send(func, tokens, priority)
+        except BaseException as e:
+            with self._inflight_lock:
+                del self._inflight[key]
+            future.set_exception(e)
+            raise
+        with self._inflight_lock:
+            del self._inflight[key]
+        future.set_result(result)
+        return result
+
+    def _send(self, func: Callable[[], T], tokens: int, priority: int) -> T:
+        """Acquire budget and send, retrying rate-limited attempts"""
+        for attempt in range(self.max_retries + 1):
+            self.acquire(tokens, priority)
+            try:
+                result = func()
+            except Exception as e:
+                if not is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                # The rejected attempt used no tokens; give its reservation back
+                self.release_unused(tokens, 0)
+                self.pause(retry_after_seconds(e) or self.backoff_seconds * (2 ** attempt))
+                continue
+
+            usage: Any = getattr(result, "usage_metadata", None)
+            if usage and usage.get("total_tokens"):
+                self.release_unused(tokens, usage["total_tokens"])
+            return result
+
+        raise RuntimeError("unreachable")
@@ -0,0 +1,286 @@
+"""
+Metrics registry and request tracing
+Records latency histograms and counters and renders them in the Prometheus text format
+"""
+
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from contextlib import contextmanager
+import bisect
+import contextvars
+import threading
+import time
+
+# Latency buckets in seconds (LLM calls take seconds, mirror reads milliseconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000, 5_000_000)
+TOKEN_BUCKETS = (100, 250, 500, 1_000, 2_000, 4_000, 8_000, 16_000)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [
+        '{}="{}"'.format(n, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for n, v in zip(names, values)
+    ]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            values = list(self._values.items())
+        for key, value in values:
+            yield self.name + "_total", _format_labels(self.labelnames, key), value
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: bucket counts (last one is +Inf), sum, count
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: Any):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, totals = self._values.setdefault(key, ([0] * (len(self.buckets) + 1), [0.0, 0]))
+            counts[index] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    def count(self, **labels: Any) -> int:
+        entry = self._values.get(self._key(labels))
+        return int(entry[1][1]) if entry else 0
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        with self._lock:
+            values = [(key, list(counts), list(totals)) for key, (counts, totals) in self._values.items()]
+        for key, counts, (total, count) in values:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                le = 'le="{}"'.format(_format_value(bound))
+                yield self.name + "_bucket", _format_labels(self.labelnames, key, le), cumulative
+            yield self.name + "_sum", _format_labels(self.labelnames, key), total
+            yield self.name + "_count", _format_labels(self.labelnames, key), count
+
+
+class CallbackGauge(_Metric):
+    """Gauge whose values are read from a callback at collection time"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str],
+        callback: Callable[[], Iterable[Tuple[Sequence[Any], float]]]
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.callback = callback
+
+    def samples(self) -> Iterator[Tuple[str, str, float]]:
+        for values, value in self.callback():
+            yield self.name, _format_labels(self.labelnames, [str(v) for v in values]), value
+
+
+class MetricsRegistry:
+    """
+    Named metrics of one process, rendered for Prometheus
+
+    Example:
+        requests = registry.counter("app_requests", "Requests served", ["endpoint"])
+        requests.inc(endpoint="/api/query")
+        text = registry.render()
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> Any:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None and not isinstance(metric, CallbackGauge):
+                return existing
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def gauge_callback(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Sequence[str],
+        callback: Callable[[], Iterable[Tuple[Sequence[Any], float]]]
+    ) -> CallbackGauge:
+        """Register (or replace) a gauge computed by ``callback`` on every render"""
+        return self._register(CallbackGauge(name, help_text, labelnames, callback))
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format (0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "jira_agent_stage_seconds", "Latency of query pipeline stages", ["stage"]
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    "jira_agent_http_request_seconds", "Latency of API requests", ["endpoint", "method", "status"]
+)
+LLM_SECONDS = REGISTRY.histogram(
+    "jira_agent_llm_seconds", "Latency of LLM calls, including rate-limit waits", ["prompt"]
+)
+LLM_TOKENS = REGISTRY.counter(
+    "jira_agent_llm_tokens", "Tokens used by LLM calls", ["prompt", "direction"]
+)
+LLM_PROMPT_TOKENS = REGISTRY.histogram(
+    "jira_agent_llm_prompt_tokens", "Prompt size of LLM calls", ["prompt"], buckets=TOKEN_BUCKETS
+)
+FALLBACKS = REGISTRY.counter(
+    "jira_agent_fallbacks", "Times a degraded fallback path was used", ["path"]
+)
+JIRA_SECONDS = REGISTRY.histogram(
+    "jira_agent_jira_request_seconds", "Latency of JIRA REST calls", ["operation"]
+)
+JIRA_PAYLOAD_BYTES = REGISTRY.histogram(
+    "jira_agent_jira_payload_bytes", "Size of JIRA response bodies (Content-Length when sent)", ["operation"],
+    buckets=SIZE_BUCKETS
+)
+TICKET_LOOKUPS = REGISTRY.counter(
+    "jira_agent_ticket_lookups", "Tickets looked up by key, by where they were served from", ["source"]
+)
+SYNC_RUNS = REGISTRY.counter(
+    "jira_agent_sync_runs", "Background mirror syncs by outcome (ok, skipped, error)", ["project", "result"]
+)
+SYNC_TICKETS = REGISTRY.counter(
+    "jira_agent_sync_tickets", "New or changed tickets written by background syncs", ["project"]
+)
+WEBHOOK_EVENTS = REGISTRY.counter(
+    "jira_agent_webhook_events", "JIRA webhook events received by outcome (accepted, ignored, rejected)",
+    ["event", "result"]
+)
+WEBHOOK_BATCH_SIZE = REGISTRY.histogram(
+    "jira_agent_webhook_batch_size", "Tickets written per webhook batch", ["action"],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1_000)
+)
+
+_trace: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar("trace", default=None)
+
+
+@contextmanager
+def trace(spans: Optional[Dict[str, float]] = None) -> Iterator[Dict[str, float]]:
+    """
+    Collect span durations (ms) of the current request
+
+    Spans recorded in this context, and in pipeline stages started from it,
+    are summed by name into the yielded dict (``spans`` to continue a trace,
+    e.g. inside a streaming response generator).
+    """
+    spans = {} if spans is None else spans
+    token = _trace.set(spans)
+    try:
+        yield spans
+    finally:
+        _trace.reset(token)
+
+
+def record_span(name: str, seconds: float):
+    """Add a duration to the active trace, if any"""
+    spans = _trace.get()
+    if spans is not None:
+        spans[name] = round(spans.get(name, 0.0) + seconds * 1000, 1)
+
+
+@contextmanager
+def timed(histogram: Histogram, span: Optional[str] = None, **labels: Any) -> Iterator[None]:
+    """Observe the duration of the block in ``histogram`` (and the active trace as ``span``)"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        histogram.observe(elapsed, **labels)
+        if span:
+            record_span(span, elapsed)
+
+
+def observe_stage(name: str, seconds: float):
+    """``Pipeline`` stage callback recording into STAGE_SECONDS"""
+    STAGE_SECONDS.observe(seconds, stage=name)
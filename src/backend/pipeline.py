@@ -0,0 +1,134 @@
+"""
+Concurrent request pipeline
+Runs named stages as soon as the stages they depend on have finished
+"""
+
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence
+from concurrent.futures import Executor, Future, as_completed
+import contextvars
+import threading
+import time
+
+
+class Pipeline:
+    """
+    Small dependency graph of stages executed on a shared thread pool
+
+    Each stage function is called with the results of its dependencies as
+    positional arguments, in the order they were declared. Stages without
+    dependencies start immediately, so independent I/O overlaps. Wall-clock
+    time per stage is recorded in ``timings`` (milliseconds) and reported to
+    ``on_stage`` (seconds). Stages run in a copy of the caller's context, so
+    context variables (e.g. the request trace) are visible to them.
+
+    Example:
+        pipeline = Pipeline(executor)
+        pipeline.add("fetch", fetch_tickets)
+        pipeline.add("match", match_tickets, depends_on=["fetch"])
+        results = pipeline.run()
+    """
+
+    def __init__(self, executor: Executor, on_stage: Optional[Callable[[str, float], None]] = None):
+        self.executor = executor
+        self.on_stage = on_stage
+        self.timings: Dict[str, float] = {}
+        self._context = contextvars.copy_context()
+        self._stages: Dict[str, Future] = {}
+        self._pending: Dict[str, Any] = {}
+        self._started_at: Optional[float] = None
+
+    def add(self, name: str, func: Callable[..., Any], depends_on: Sequence[str] = ()) -> "Pipeline":
+        """Register a stage; dependencies must already be registered"""
+        if name in self._stages:
+            raise ValueError(f"Stage already registered: {name}")
+        for dependency in depends_on:
+            if dependency not in self._stages:
+                raise ValueError(f"Unknown dependency for stage {name}: {dependency}")
+
+        self._stages[name] = Future()
+        self._pending[name] = (func, list(depends_on))
+        return self
+
+    def start(self) -> "Pipeline":
+        """Schedule every registered stage without waiting for results"""
+        self._started_at = time.perf_counter()
+        self._context = contextvars.copy_context()
+        pending, self._pending = self._pending, {}
+
+        for name, (func, depends_on) in pending.items():
+            if not depends_on:
+                self._submit(name, func, [])
+                continue
+
+            remaining = [len(depends_on)]
+            lock = threading.Lock()
+
+            def on_dependency_done(_, name=name, func=func, depends_on=depends_on,
+                                   remaining=remaining, lock=lock):
+                with lock:
+                    remaining[0] -= 1
+                    if remaining[0]:
+                        return
+                for dependency in depends_on:
+                    error = self._stages[dependency].exception()
+                    if error is not None:
+                        self._stages[name].set_exception(error)
+                        return
+                self._submit(name, func, [self._stages[d].result() for d in depends_on])
+
+            for dependency in depends_on:
+                self._stages[dependency].add_done_callback(on_dependency_done)
+
+        return self
+
+    def _submit(self, name: str, func: Callable[..., Any], args: list):
+        """Run a stage on the executor and resolve its future"""
+        stage = self._stages[name]
+
+        def run():
+            started = time.perf_counter()
+            try:
+                result = func(*args)
+            except BaseException as e:
+                self._record(name, time.perf_counter() - started)
+                stage.set_exception(e)
+            else:
+                self._record(name, time.perf_counter() - started)
+                stage.set_result(result)
+
+        # One copy per stage: a context cannot be entered by two threads at once
+        try:
+            self.executor.submit(self._context.copy().run, run)
+        except BaseException as e:
+            # e.g. the executor is shutting down: fail the stage (and its
+            # dependents) rather than leave run() waiting for it forever
+            stage.set_exception(e)
+
+    def _record(self, name: str, seconds: float):
+        self.timings[name] = round(seconds * 1000, 1)
+        if self.on_stage is not None:
+            self.on_stage(name, seconds)
+
+    def result(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Wait for a stage and return its result, re-raising its error"""
+        return self._stages[name].result(timeout)
+
+    def as_completed(self, names: Sequence[str], timeout: Optional[float] = None) -> Iterator[str]:
+        """Yield stage names in the order the stages finish"""
+        futures = {self._stages[name]: name for name in names}
+        for future in as_completed(futures, timeout):
+            yield futures[future]
+
+    def run(self, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Start the pipeline and wait for every stage"""
+        if self._pending:
+            self.start()
+        results = {name: self.result(name, timeout) for name in self._stages}
+        self.timings["total"] = self.elapsed()
+        return results
+
+    def elapsed(self) -> float:
+        """Milliseconds since the pipeline started"""
+        if self._started_at is None:
+            return 0.0
+        return round((time.perf_counter() - self._started_at) * 1000, 1)
@@ -0,0 +1,124 @@
+"""
+Token-budgeted prompt packing
+Counts tokens for the configured model and fills prompts up to a budget
+"""
+
+from typing import Any, List, Optional, Sequence
+
+try:
+    import tiktoken
+except ImportError:  # optional: pip install "jira-ai-agent[tokens]"
+    tiktoken = None
+
+
+class TokenCounter:
+    """
+    Count and truncate text in model tokens
+
+    Uses tiktoken when it is installed. Models tiktoken does not know (such
+    as the Llama models served by Groq) use the cl100k_base encoding, which
+    is close to Llama 3's tokenizer for English text. Without tiktoken, a
+    four-characters-per-token estimate is used.
+    """
+
+    CHARS_PER_TOKEN = 4
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model
+        self._encoding: Optional[Any] = None
+
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.encoding_for_model(model or "")
+            except KeyError:
+                try:
+                    self._encoding = tiktoken.get_encoding("cl100k_base")
+                except Exception:
+                    # Encoding files could not be loaded (e.g. offline)
+                    self._encoding = None
+
+    def count(self, text: Optional[str]) -> int:
+        """Number of tokens in the text"""
+        if not text:
+            return 0
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        return -(-len(text) // self.CHARS_PER_TOKEN)
+
+    def truncate(self, text: Optional[str], max_tokens: int, suffix: str = "...") -> str:
+        """Cut text to at most ``max_tokens`` tokens, marking cuts with ``suffix``"""
+        if not text:
+            return ""
+        if max_tokens <= 0:
+            return ""
+
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            if len(tokens) <= max_tokens:
+                return text
+            return self._encoding.decode(tokens[:max_tokens]).rstrip() + suffix
+
+        max_chars = max_tokens * self.CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        cut = text[:max_chars]
+        # Prefer ending on a word boundary
+        space = cut.rfind(" ")
+        if space > max_chars // 2:
+            cut = cut[:space]
+        return cut.rstrip() + suffix
+
+
+class PromptPacker:
+    """
+    Greedily fill a token budget with text blocks
+
+    Blocks should be added most relevant first. A block's required part is
+    added only if it fits; its optional parts (e.g. description, comments)
+    are then added in order, skipping any that do not fit. Blocks whose
+    required part does not fit are skipped, so smaller, less relevant blocks
+    can still use the remaining budget. The text is joined once at the end.
+
+    Example:
+        packer = PromptPacker(counter, budget=3000)
+        for ticket in candidates:
+            packer.add(f"[{ticket['key']}] {ticket['summary']}\\n", [description])
+        prompt_text = packer.text()
+    """
+
+    def __init__(self, counter: TokenCounter, budget: int):
+        self.counter = counter
+        self.budget = budget
+        self.used = 0
+        self._parts: List[str] = []
+        self._blocks = 0
+
+    @property
+    def remaining(self) -> int:
+        """Tokens left in the budget"""
+        return self.budget - self.used
+
+    def add(self, required: str, optional: Sequence[str] = ()) -> bool:
+        """Add a block, returning whether it fit"""
+        cost = self.counter.count(required)
+        if cost > self.remaining:
+            return False
+
+        self._parts.append(required)
+        self.used += cost
+        self._blocks += 1
+
+        for part in optional:
+            cost = self.counter.count(part)
+            if cost <= self.remaining:
+                self._parts.append(part)
+                self.used += cost
+
+        return True
+
+    def text(self) -> str:
+        """The packed prompt text"""
+        return "".join(self._parts)
+
+    def __len__(self) -> int:
+        return self._blocks
@@ -0,0 +1,131 @@
+"""
+Response cache for LLM calls
+TTL/LRU cache keyed by normalised query text, with near-duplicate lookup
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional, Tuple
+from collections import OrderedDict
+import hashlib
+import threading
+import time
+
+from .utils import clean_text, extract_keywords, jaccard_similarity
+
+
+def normalize_query(query: Optional[str]) -> str:
+    """Normalise query text for cache keys"""
+    return clean_text(query).lower()
+
+
+def corpus_fingerprint(tickets: Iterable[Mapping[str, Any]]) -> str:
+    """
+    Fingerprint a ticket set by key and update time
+
+    Any ticket being added, removed or updated changes the fingerprint,
+    which invalidates cached answers that were computed from the old set.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for ticket in tickets:
+        digest.update(f"{ticket.get('key')}@{ticket.get('updated')}\n".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with per-entry TTL
+
+    Entries are grouped by ``(namespace, scope)``: the namespace names the
+    cached call (e.g. "analysis") and the scope captures everything besides
+    the query that the answer depends on (e.g. a corpus fingerprint). A lookup
+    that misses exactly falls back to the most similar cached query in the
+    same group if its keyword overlap reaches ``similarity_threshold``.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600,
+        similarity_threshold: float = 0.85
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+
+        self._lock = threading.Lock()
+        # (namespace, scope, query) -> (expires_at, keywords, value)
+        self._entries: "OrderedDict[Tuple[str, Any, str], Tuple[float, FrozenSet[str], Any]]" = OrderedDict()
+        # (namespace, scope) -> normalised queries cached in that group
+        self._groups: Dict[Tuple[str, Any], Dict[str, None]] = {}
+
+    def get(self, namespace: str, query: str, scope: Any = None) -> Optional[Any]:
+        """Return a cached value for the query or a near-duplicate of it"""
+        normalized = normalize_query(query)
+        now = time.monotonic()
+
+        with self._lock:
+            entry_key = (namespace, scope, normalized)
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(entry_key)
+                self.hits += 1
+                return entry[2]
+
+            keywords = frozenset(extract_keywords(normalized))
+            best_key, best_score = None, 0.0
+            for other in list(self._groups.get((namespace, scope), ())):
+                other_key = (namespace, scope, other)
+                expires_at, other_keywords, _ = self._entries[other_key]
+                if expires_at <= now:
+                    self._discard(other_key)
+                    continue
+                score = jaccard_similarity(keywords, other_keywords)
+                if score > best_score:
+                    best_key, best_score = other_key, score
+
+            if best_key is not None and best_score >= self.similarity_threshold:
+                self._entries.move_to_end(best_key)
+                self.near_hits += 1
+                return self._entries[best_key][2]
+
+            self.misses += 1
+            return None
+
+    def set(self, namespace: str, query: str, value: Any, scope: Any = None):
+        """Cache a value for the query"""
+        normalized = normalize_query(query)
+        entry_key = (namespace, scope, normalized)
+
+        with self._lock:
+            self._entries[entry_key] = (
+                time.monotonic() + self.ttl_seconds,
+                frozenset(extract_keywords(normalized)),
+                value
+            )
+            self._entries.move_to_end(entry_key)
+            self._groups.setdefault((namespace, scope), {})[normalized] = None
+
+            while len(self._entries) > self.max_entries:
+                self._discard(next(iter(self._entries)))
+
+    def invalidate(self, namespace: Optional[str] = None):
+        """Drop all entries, or only those of one namespace"""
+        with self._lock:
+            for entry_key in list(self._entries):
+                if namespace is None or entry_key[0] == namespace:
+                    self._discard(entry_key)
+
+    def _discard(self, entry_key: Tuple[str, Any, str]):
+        namespace, scope, normalized = entry_key
+        self._entries.pop(entry_key, None)
+        group = self._groups.get((namespace, scope))
+        if group is not None:
+            group.pop(normalized, None)
+            if not group:
+                del self._groups[(namespace, scope)]
+
+    def __len__(self) -> int:
+        return len(self._entries)
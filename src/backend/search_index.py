@@ -0,0 +1,219 @@
+"""
+Lexical search index for JIRA tickets
+Incremental BM25 inverted index used for fallback matching and candidate retrieval
+"""
+
+from typing import Any, Collection, Dict, Iterable, List, Mapping, Optional, Tuple
+from collections import Counter
+import json
+import logging
+import math
+import os
+import threading
+
+from .utils import atomic_write, file_signature, tokenize
+
+logger = logging.getLogger(__name__)
+
+
+def ticket_tokens(ticket: Mapping[str, Any]) -> List[str]:
+    """Tokens indexed for a ticket; the summary counts twice, as it is the strongest signal"""
+    summary = tokenize(ticket.get('summary'))
+    tokens = summary + summary + tokenize(ticket.get('description'))
+    for label in ticket.get('labels') or []:
+        tokens.extend(tokenize(label))
+    return tokens
+
+
+def reciprocal_rank_fusion(*rankings: List[str], k: int = 60) -> List[str]:
+    """Merge several best-first key rankings into one (RRF), without comparing raw scores"""
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking):
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores, key=lambda key: scores[key], reverse=True)
+
+
+class BM25Index:
+    """
+    Incremental BM25 inverted index keyed by ticket key
+
+    With ``read_only``, the file at ``path`` is written by another process:
+    it is loaded but never saved, and updates stay in this process's memory.
+    """
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75, read_only: bool = False):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.read_only = read_only
+
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._doc_terms: Dict[str, Dict[str, int]] = {}
+        self._doc_versions: Dict[str, Optional[str]] = {}
+        self._doc_lengths: Dict[str, int] = {}
+        self._total_length = 0
+        self._signature: Optional[Tuple[int, int, int]] = None
+
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._doc_terms
+
+    def add(self, key: str, tokens: Iterable[str], version: Optional[str] = None):
+        """Index a document, replacing any previous version of it"""
+        term_freqs = dict(Counter(tokens))
+
+        with self._lock:
+            self._remove(key)
+            self._index(key, term_freqs, version)
+
+    def _index(self, key: str, term_freqs: Dict[str, int], version: Optional[str]):
+        for term, freq in term_freqs.items():
+            self._postings.setdefault(term, {})[key] = freq
+        self._doc_terms[key] = term_freqs
+        self._doc_versions[key] = version
+        self._doc_lengths[key] = sum(term_freqs.values())
+        self._total_length += self._doc_lengths[key]
+
+    def remove(self, key: str) -> bool:
+        """Remove a document from the index, returning whether it was present"""
+        with self._lock:
+            return self._remove(key)
+
+    def _remove(self, key: str) -> bool:
+        term_freqs = self._doc_terms.pop(key, None)
+        if term_freqs is None:
+            return False
+
+        for term in term_freqs:
+            postings = self._postings[term]
+            del postings[key]
+            if not postings:
+                del self._postings[term]
+        self._doc_versions.pop(key, None)
+        self._total_length -= self._doc_lengths.pop(key)
+        return True
+
+    def update_tickets(self, tickets: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Index tickets that are new or whose ``updated`` timestamp changed
+
+        Args:
+            tickets: Ticket dicts in the shape returned by JiraClient
+
+        Returns:
+            Number of tickets (re)indexed
+        """
+        changed = 0
+        for ticket in tickets:
+            key = ticket['key']
+            version = ticket.get('updated')
+            if key in self._doc_terms and self._doc_versions.get(key) == version:
+                continue
+            self.add(key, ticket_tokens(ticket), version)
+            changed += 1
+        return changed
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        keys: Optional[Collection[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank indexed documents against a query
+
+        Args:
+            query: Free-text query
+            top_k: Maximum number of results
+            keys: Restrict results to these document keys
+
+        Returns:
+            List of (key, score) pairs, best first
+        """
+        terms = set(tokenize(query))
+        scores: Dict[str, float] = {}
+
+        with self._lock:
+            doc_count = len(self._doc_terms)
+            if not terms or doc_count == 0:
+                return []
+            avg_length = self._total_length / doc_count
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for key, freq in postings.items():
+                    if keys is not None and key not in keys:
+                        continue
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_lengths[key] / avg_length)
+                    scores[key] = scores.get(key, 0.0) + idf * freq * (self.k1 + 1) / (freq + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+        return ranked[:top_k]
+
+    def save(self):
+        """Persist the index to disk atomically"""
+        if not self.path or self.read_only:
+            return
+
+        with self._lock:
+            data = {
+                "docs": {
+                    key: [self._doc_versions.get(key), terms]
+                    for key, terms in self._doc_terms.items()
+                }
+            }
+
+        with self._save_lock:
+            with atomic_write(self.path) as f:
+                json.dump(data, f)
+            self._signature = file_signature(self.path)
+
+    def reload_if_changed(self) -> bool:
+        """Reload the file if another process saved it since this one last loaded or saved it"""
+        if not self.path:
+            return False
+        signature = file_signature(self.path)
+        if signature is None or signature == self._signature:
+            return False
+        return self.load()
+
+    def load(self) -> bool:
+        """
+        Load a previously saved index, rebuilding postings in memory
+
+        Returns:
+            Whether the index was loaded; a truncated or malformed file is
+            logged and left out, and the index is rebuilt by later updates
+        """
+        self._signature = file_signature(self.path)
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            docs = {
+                key: (version, {term: int(freq) for term, freq in terms.items()})
+                for key, (version, terms) in data["docs"].items()
+            }
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            logger.warning("Search index %s could not be loaded (%s); rebuilding it", self.path, e)
+            return False
+
+        with self._lock:
+            self._postings = {}
+            self._doc_terms = {}
+            self._doc_versions = {}
+            self._doc_lengths = {}
+            self._total_length = 0
+            for key, (version, terms) in docs.items():
+                self._index(key, terms, version)
+        return True
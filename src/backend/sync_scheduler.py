@@ -0,0 +1,215 @@
+"""
+Background sync scheduler
+Keeps the local ticket mirror and search indexes warm by syncing each
+project from JIRA on its own schedule, off the request path
+
+Run standalone with: python main.py sync
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+import logging
+import os
+import random
+import threading
+import time
+
+from .config_manager import config, get_config
+from .metrics import SYNC_RUNS, SYNC_TICKETS
+
+logger = logging.getLogger(__name__)
+
+# Called with a project key and the tickets its sync fetched
+SyncCallback = Callable[[str, List[Dict[str, Any]]], None]
+
+
+class SyncScheduler:
+    """
+    Periodically syncs every project in ``jira.projects``
+
+    Each project runs on its own interval (``jira.mirror.scheduler``), with
+    jitter so that projects, and processes running their own scheduler, do
+    not hit JIRA at the same moment. A failed sync is retried with
+    exponential backoff. Settings and the project list are re-read from the
+    current config before every run.
+
+    Example:
+        scheduler = SyncScheduler(jira_client, on_synced=lambda project, tickets: agent.index_tickets(tickets))
+        scheduler.start()
+    """
+
+    def __init__(self, client: Any, on_synced: Optional[SyncCallback] = None):
+        """
+        Args:
+            client: JiraClient (anything with ``sync_project``)
+            on_synced: Refreshes derived data (e.g. search indexes) with the
+                tickets a sync fetched
+        """
+        self.client = client
+        self.on_synced = on_synced
+        self._next_run: Dict[str, float] = {}
+        self._failures: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _settings() -> Dict[str, Any]:
+        snapshot = get_config()
+        settings = snapshot.get('jira.mirror.scheduler', {})
+        return {
+            "projects": list(snapshot.get('jira.projects', ())),
+            "interval": float(settings.get('interval_seconds', 60)),
+            "project_intervals": settings.get('project_intervals') or {},
+            "jitter": float(settings.get('jitter', 0.1)),
+            "backoff": float(settings.get('backoff_seconds', 30)),
+            "max_backoff": float(settings.get('max_backoff_seconds', 900)),
+            "days_back": snapshot.get('jira.mirror.backfill_days', 90)
+        }
+
+    @staticmethod
+    def _interval(project: str, settings: Dict[str, Any]) -> float:
+        return float(settings["project_intervals"].get(project, settings["interval"]))
+
+    @staticmethod
+    def _jittered(delay: float, jitter: float) -> float:
+        return max(0.0, delay * (1 + random.uniform(-jitter, jitter)))
+
+    def run_pending(self) -> int:
+        """
+        Sync every project that is due
+
+        Returns:
+            Number of projects synced (successfully or not)
+        """
+        settings = self._settings()
+        projects = settings["projects"]
+
+        # Projects removed from the config are no longer scheduled
+        for project in set(self._next_run) - set(projects):
+            self._next_run.pop(project, None)
+            self._failures.pop(project, None)
+
+        ran = 0
+        for project in projects:
+            interval = self._interval(project, settings)
+            if project not in self._next_run:
+                # First run soon, spread over a fraction of the interval
+                self._next_run[project] = time.monotonic() + random.uniform(0, interval * settings["jitter"])
+            if self._stop.is_set() or self._next_run[project] > time.monotonic():
+                continue
+            self.sync(project, interval, settings)
+            ran += 1
+        return ran
+
+    def sync(self, project: str, interval: float, settings: Dict[str, Any]) -> bool:
+        """Sync one project now and schedule its next run; returns whether it succeeded"""
+        try:
+            # Another process syncing this project recently counts as a run
+            result = self.client.sync_project(project, settings["days_back"], min_interval=interval / 2)
+        except Exception as e:
+            failures = self._failures[project] = self._failures.get(project, 0) + 1
+            delay = min(settings["backoff"] * 2 ** (failures - 1), settings["max_backoff"])
+            logger.warning("Sync of %s failed (%d in a row), retrying in %.0fs: %s", project, failures, delay, e)
+            SYNC_RUNS.inc(project=project, result="error")
+            self._next_run[project] = time.monotonic() + self._jittered(delay, settings["jitter"])
+            return False
+
+        self._failures.pop(project, None)
+        self._next_run[project] = time.monotonic() + self._jittered(interval, settings["jitter"])
+        if result is None:
+            SYNC_RUNS.inc(project=project, result="skipped")
+            return True
+
+        changed, tickets = result
+        SYNC_RUNS.inc(project=project, result="ok")
+        SYNC_TICKETS.inc(changed, project=project)
+        logger.info("Synced %s: %d fetched, %d new or changed", project, len(tickets), changed)
+        if changed and self.on_synced is not None:
+            try:
+                self.on_synced(project, tickets)
+            except Exception as e:
+                logger.error("Refreshing derived data after syncing %s failed: %s", project, e)
+        return True
+
+    def sync_all(self) -> List[str]:
+        """Sync every project now, whether due or not; returns the projects that failed"""
+        settings = self._settings()
+        return [
+            project for project in settings["projects"]
+            if not self.sync(project, self._interval(project, settings), settings)
+        ]
+
+    def run(self):
+        """Run due syncs until stop() is called"""
+        while not self._stop.is_set():
+            self.run_pending()
+            now = time.monotonic()
+            next_run = min(self._next_run.values(), default=now + 1)
+            # Wake up at least every few seconds to pick up config changes
+            self._stop.wait(min(max(next_run - now, 0.1), 5.0))
+
+    def start(self) -> "SyncScheduler":
+        """Run the scheduler on a background thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, name="sync-scheduler", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop after the sync in progress, if any"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+def main():
+    """Run the scheduler in the foreground (python -m backend.sync_scheduler)"""
+    import argparse
+    import signal
+
+    from mcp_server.jira_mcp_server import JiraClient
+
+    parser = argparse.ArgumentParser(description="Keep the JIRA ticket mirror and search indexes warm")
+    parser.add_argument("--once", action="store_true", help="Sync every project once and exit")
+    parser.add_argument("--no-index", action="store_true", help="Only sync the mirror, not the search indexes")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    try:
+        client = JiraClient()
+    except ValueError as e:
+        raise SystemExit(str(e))
+    if client.store is None:
+        raise SystemExit("The ticket mirror is disabled (jira.mirror.enabled); nothing to sync")
+
+    scheduler = SyncScheduler(client)
+    if not args.no_index:
+        # The sync process is the one writer of the index files
+        os.environ['INDEX_MODE'] = 'write'
+        from .llm_agent import JiraLLMAgent
+        agent = JiraLLMAgent()
+        scheduler.on_synced = lambda project, tickets: agent.index_tickets(tickets)
+    try:
+        if args.once:
+            failed = scheduler.sync_all()
+            if failed:
+                raise SystemExit(f"Sync failed for: {', '.join(failed)}")
+            return
+
+        config.watch()
+        signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.stop())
+        logger.info("Sync scheduler started for %s", ", ".join(SyncScheduler._settings()["projects"]))
+        try:
+            scheduler.run()
+        except KeyboardInterrupt:
+            pass
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
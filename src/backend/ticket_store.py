@@ -0,0 +1,365 @@
+"""
+Local ticket mirror backed by SQLite
+Keeps a copy of JIRA tickets on disk so searches can be answered locally
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+from datetime import datetime
+import json
+import os
+import sqlite3
+import threading
+
+from .tickets import to_jsonable
+
+# Upserts without a conflict target (rollup triggers) need SQLite 3.35
+MIN_SQLITE_VERSION = (3, 35, 0)
+
+
+def to_timestamp(value: Optional[str]) -> float:
+    """Convert a JIRA date string (e.g. 2024-05-01T10:20:30.000+0000) to epoch seconds"""
+    if not value:
+        return 0.0
+
+    for fmt in ("%Y-%m-%dT%H:%M:%S.%f%z", "%Y-%m-%dT%H:%M:%S%z"):
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            continue
+
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _bucket_columns(row: str) -> str:
+    """SQL expressions for the rollup bucket of a tickets row (NEW, OLD or the table)"""
+    return (
+        f"date({row}.updated_ts, 'unixepoch', 'localtime'), "
+        f"{row}.project, "
+        f"COALESCE({row}.status, 'Unknown'), "
+        f"COALESCE(json_extract({row}.data, '$.priority'), 'Unknown'), "
+        f"COALESCE({row}.issue_type, 'Unknown'), "
+        f"COALESCE(json_extract({row}.data, '$.resolution'), '') != ''"
+    )
+
+
+class TicketStore:
+    """SQLite mirror of JIRA tickets with per-project sync state"""
+
+    def __init__(self, path: str):
+        if sqlite3.sqlite_version_info < MIN_SQLITE_VERSION:
+            raise RuntimeError(
+                f"The ticket mirror needs SQLite {'.'.join(map(str, MIN_SQLITE_VERSION))} or newer, "
+                f"but Python is linked against SQLite {sqlite3.sqlite_version}. Upgrade SQLite "
+                f"(or Python) or set jira.mirror.enabled to false."
+            )
+
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+
+    def _create_schema(self):
+        """Create tables and indexes if they do not exist"""
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS tickets (
+                    key TEXT PRIMARY KEY,
+                    project TEXT NOT NULL,
+                    issue_type TEXT COLLATE NOCASE,
+                    status TEXT COLLATE NOCASE,
+                    updated TEXT,
+                    updated_ts REAL NOT NULL,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_tickets_project_updated
+                    ON tickets (project, updated_ts DESC);
+                CREATE INDEX IF NOT EXISTS idx_tickets_updated
+                    ON tickets (updated_ts DESC);
+
+                CREATE TABLE IF NOT EXISTS sync_state (
+                    project TEXT PRIMARY KEY,
+                    last_sync REAL NOT NULL,
+                    covered_since REAL NOT NULL
+                );
+
+                -- Ticket counts per local update day, maintained by the
+                -- triggers below as tickets are inserted, updated or deleted
+                CREATE TABLE IF NOT EXISTS rollups (
+                    day TEXT NOT NULL,
+                    project TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    issue_type TEXT NOT NULL,
+                    resolved INTEGER NOT NULL,
+                    count INTEGER NOT NULL,
+                    PRIMARY KEY (day, project, status, priority, issue_type, resolved)
+                ) WITHOUT ROWID;
+
+                CREATE TRIGGER IF NOT EXISTS tickets_rollup_insert AFTER INSERT ON tickets
+                BEGIN
+                    INSERT INTO rollups VALUES (
+                        {new_bucket}, 1
+                    ) ON CONFLICT DO UPDATE SET count = count + 1;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS tickets_rollup_update AFTER UPDATE ON tickets
+                BEGIN
+                    UPDATE rollups SET count = count - 1
+                        WHERE (day, project, status, priority, issue_type, resolved) = ({old_bucket});
+                    DELETE FROM rollups WHERE count <= 0;
+                    INSERT INTO rollups VALUES (
+                        {new_bucket}, 1
+                    ) ON CONFLICT DO UPDATE SET count = count + 1;
+                END;
+
+                CREATE TRIGGER IF NOT EXISTS tickets_rollup_delete AFTER DELETE ON tickets
+                BEGIN
+                    UPDATE rollups SET count = count - 1
+                        WHERE (day, project, status, priority, issue_type, resolved) = ({old_bucket});
+                    DELETE FROM rollups WHERE count <= 0;
+                END;
+            """.format(new_bucket=_bucket_columns("NEW"), old_bucket=_bucket_columns("OLD")))
+
+            # Mirrors created before rollups existed start with an empty table
+            has_tickets = self._conn.execute("SELECT EXISTS (SELECT 1 FROM tickets)").fetchone()[0]
+            has_rollups = self._conn.execute("SELECT EXISTS (SELECT 1 FROM rollups)").fetchone()[0]
+        if has_tickets and not has_rollups:
+            self.rebuild_rollups()
+
+    def rebuild_rollups(self):
+        """Recompute all rollup buckets from the mirrored tickets"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM rollups")
+            self._conn.execute(f"""
+                INSERT INTO rollups
+                SELECT {_bucket_columns("tickets")}, COUNT(*) FROM tickets
+                GROUP BY 1, 2, 3, 4, 5, 6
+            """)
+
+    def close(self):
+        """Close the underlying connection"""
+        with self._lock:
+            self._conn.close()
+
+    def upsert_tickets(self, tickets: Iterable[Dict[str, Any]]) -> int:
+        """
+        Insert or update tickets in the mirror
+
+        Args:
+            tickets: Ticket dicts in the shape returned by JiraClient
+
+        Returns:
+            Number of tickets that were new or changed
+        """
+        rows = []
+        for ticket in tickets:
+            key = ticket["key"]
+            rows.append((
+                key,
+                key.split("-")[0],
+                ticket.get("issue_type"),
+                ticket.get("status"),
+                ticket.get("updated"),
+                to_timestamp(ticket.get("updated")),
+                json.dumps(ticket, default=to_jsonable)
+            ))
+
+        if not rows:
+            return 0
+
+        with self._lock, self._conn:
+            # rowcount leaves out the rollup rows written by triggers
+            cursor = self._conn.executemany(
+                """
+                INSERT INTO tickets (key, project, issue_type, status, updated, updated_ts, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(key) DO UPDATE SET
+                    project = excluded.project,
+                    issue_type = excluded.issue_type,
+                    status = excluded.status,
+                    updated = excluded.updated,
+                    updated_ts = excluded.updated_ts,
+                    data = excluded.data
+                WHERE tickets.data != excluded.data
+                """,
+                rows
+            )
+            return cursor.rowcount
+
+    def delete_tickets(self, keys: Iterable[str]) -> int:
+        """Remove tickets from the mirror, returning how many were deleted"""
+        keys = list(keys)
+        if not keys:
+            return 0
+
+        with self._lock, self._conn:
+            cursor = self._conn.executemany("DELETE FROM tickets WHERE key = ?", [(k,) for k in keys])
+            return cursor.rowcount
+
+    def search(
+        self,
+        projects: Optional[List[str]] = None,
+        issue_types: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        max_results: Optional[int] = 100,
+        since: Optional[float] = None,
+        keys: Optional[Sequence[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search mirrored tickets, newest update first
+
+        Args:
+            projects: Project keys to include
+            issue_types: Issue type names to include
+            statuses: Status names to include (case-insensitive, like JQL)
+            max_results: Maximum number of tickets to return (None for all)
+            since: Only include tickets updated at or after this epoch timestamp
+            keys: Ticket dict keys to return (None for the whole ticket)
+
+        Returns:
+            List of ticket dicts
+        """
+        where = []
+        params: List[Any] = []
+
+        if keys is None:
+            sql = "SELECT data FROM tickets"
+        else:
+            # Project inside SQLite so unused fields (comments...) are never decoded
+            sql = "SELECT json_object({}) FROM tickets".format(
+                ", ".join("?, json_extract(data, ?)" for _ in keys)
+            )
+            for key in keys:
+                params.extend((key, f"$.{key}"))
+
+        for column, values in (
+            ("project", projects),
+            ("issue_type", issue_types),
+            ("status", statuses)
+        ):
+            if values:
+                where.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+
+        if since is not None:
+            where.append("updated_ts >= ?")
+            params.append(since)
+
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY updated_ts DESC LIMIT ?"
+        params.append(-1 if max_results is None else max_results)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        return [json.loads(row[0]) for row in rows]
+
+    def get_statistics(
+        self,
+        projects: Optional[List[str]] = None,
+        since_day: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Sum rollup buckets into ticket counts
+
+        Args:
+            projects: Project keys to include
+            since_day: Only count tickets updated on or after this local date (YYYY-MM-DD)
+
+        Returns:
+            Total, resolved and per status/priority/project/type counts
+        """
+        where = []
+        params: List[Any] = []
+        if projects:
+            where.append(f"project IN ({', '.join('?' * len(projects))})")
+            params.extend(projects)
+        if since_day:
+            where.append("day >= ?")
+            params.append(since_day)
+        sql = """
+            SELECT project, status, priority, issue_type, resolved, SUM(count)
+            FROM rollups
+        """
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " GROUP BY 1, 2, 3, 4, 5"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        stats: Dict[str, Any] = {
+            "total_tickets": 0,
+            "resolved_tickets": 0,
+            "by_status": {},
+            "by_priority": {},
+            "by_project": {},
+            "by_type": {}
+        }
+        for project, status, priority, issue_type, resolved, count in rows:
+            stats["total_tickets"] += count
+            if resolved:
+                stats["resolved_tickets"] += count
+            for group, value in (
+                ("by_status", status),
+                ("by_priority", priority),
+                ("by_project", project),
+                ("by_type", issue_type)
+            ):
+                stats[group][value] = stats[group].get(value, 0) + count
+
+        return stats
+
+    def get_tickets(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Look up mirrored tickets by key; missing keys are left out"""
+        keys = list(keys)
+        found: Dict[str, Dict[str, Any]] = {}
+
+        # Stay well below SQLite's bound parameter limit
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT key, data FROM tickets WHERE key IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+            for key, data in rows:
+                found[key] = json.loads(data)
+
+        return found
+
+    def get_sync_state(self, project: str) -> Optional[Dict[str, float]]:
+        """Get the last sync time and covered window start for a project"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_sync, covered_since FROM sync_state WHERE project = ?",
+                (project,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return {"last_sync": row[0], "covered_since": row[1]}
+
+    def set_sync_state(self, project: str, last_sync: float, covered_since: float):
+        """Record a completed sync for a project"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO sync_state (project, last_sync, covered_since)
+                VALUES (?, ?, ?)
+                ON CONFLICT(project) DO UPDATE SET
+                    last_sync = excluded.last_sync,
+                    covered_since = excluded.covered_since
+                """,
+                (project, last_sync, covered_since)
+            )
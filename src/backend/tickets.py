@@ -0,0 +1,281 @@
+"""
+Ticket record and collection types
+Compact ticket records and ordered ticket lists with constant-time lookup by key
+"""
+
+from typing import (
+    Any, Dict, Iterable, Iterator, KeysView, List, Mapping, Optional, Sequence, Tuple, Union, overload
+)
+import json
+import sys
+import zlib
+
+# Comment lists larger than this (in bytes of JSON) are kept compressed
+COMMENT_COMPRESS_THRESHOLD = 256
+
+TICKET_FIELDS = (
+    "key", "summary", "description", "issue_type", "status", "resolution", "created",
+    "updated", "priority", "assignee", "reporter", "labels", "url", "comments"
+)
+
+# Field name tuples shared by tickets fetched with the same fields
+_FIELD_SETS: Dict[Tuple[str, ...], Tuple[str, ...]] = {TICKET_FIELDS: TICKET_FIELDS}
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    """Intern a repetitive string (status, priority, names...) so tickets share one copy"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _field_set(names: Iterable[str]) -> Tuple[str, ...]:
+    """The ticket fields among ``names``, in TICKET_FIELDS order, as a shared tuple"""
+    present = set(names) | {"key"}
+    fields = tuple(name for name in TICKET_FIELDS if name in present)
+    return _FIELD_SETS.setdefault(fields, fields)
+
+
+class Comment(Mapping[str, Any]):
+    """Read-only ticket comment in the ``{"author", "body", "created"}`` shape"""
+
+    __slots__ = ("author", "body", "created")
+
+    def __init__(self, author: Optional[str], body: Optional[str], created: Optional[str]):
+        self.author = _intern(author)
+        self.body = body
+        self.created = created
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Comment as a plain dict"""
+        return {"author": self.author, "body": self.body, "created": self.created}
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self.__slots__:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__slots__)
+
+    def __len__(self) -> int:
+        return len(self.__slots__)
+
+    def __repr__(self) -> str:
+        return f"Comment({self.author!r}, {self.created!r})"
+
+
+class Ticket(Mapping[str, Any]):
+    """
+    Compact, read-only JIRA ticket
+
+    Reads like the ticket dicts produced by ``format_ticket`` (``ticket["key"]``,
+    ``ticket.get("status")``, ``{**ticket}``) but stores fields in slots
+    instead of a per-ticket dict. Repetitive strings (status, priority, issue
+    type, people and labels) are interned. Comments are kept as one encoded
+    JSON blob, compressed when large, and only turned into ``Comment``
+    records when ``comments`` is read.
+
+    A ticket built from a partial dict (a field profile) only has the fields
+    that were fetched: the others are missing, as in the dict, rather than None.
+    """
+
+    __slots__ = (
+        "key", "summary", "description", "issue_type", "status", "resolution", "created",
+        "updated", "priority", "assignee", "reporter", "labels", "url", "_comments", "_fields"
+    )
+
+    def __init__(
+        self,
+        key: str,
+        summary: Optional[str] = None,
+        description: Optional[str] = None,
+        issue_type: Optional[str] = None,
+        status: Optional[str] = None,
+        resolution: Optional[str] = None,
+        created: Optional[str] = None,
+        updated: Optional[str] = None,
+        priority: Optional[str] = None,
+        assignee: Optional[str] = None,
+        reporter: Optional[str] = None,
+        labels: Iterable[str] = (),
+        url: Optional[str] = None,
+        comments: Iterable[Mapping[str, Any]] = (),
+        fields: Optional[Iterable[str]] = None
+    ):
+        self.key = key
+        self.summary = summary
+        self.description = description
+        self.issue_type = _intern(issue_type)
+        self.status = _intern(status)
+        self.resolution = _intern(resolution)
+        self.created = created
+        self.updated = updated
+        self.priority = _intern(priority)
+        self.assignee = _intern(assignee)
+        self.reporter = _intern(reporter)
+        self.labels: Tuple[str, ...] = tuple(sys.intern(label) for label in labels)
+        self.url = url
+        self._comments = self._encode_comments(comments)
+        self._fields = TICKET_FIELDS if fields is None else _field_set(fields)
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "Ticket":
+        """Build a ticket from the dict shape returned by ``format_ticket``"""
+        if isinstance(data, cls):
+            return data
+        values: Dict[str, Any] = {name: data[name] for name in TICKET_FIELDS if data.get(name) is not None}
+        return cls(**values, fields=data.keys())
+
+    @staticmethod
+    def _encode_comments(comments: Iterable[Mapping[str, Any]]) -> Union[bytes, str, None]:
+        comments = [
+            {"author": c.get("author"), "body": c.get("body"), "created": c.get("created")}
+            for c in comments
+        ]
+        if not comments:
+            return None
+        encoded = json.dumps(comments, separators=(",", ":"))
+        if len(encoded) > COMMENT_COMPRESS_THRESHOLD:
+            return zlib.compress(encoded.encode("utf-8"))
+        return encoded
+
+    def _comment_dicts(self) -> List[Dict[str, Any]]:
+        if self._comments is None:
+            return []
+        if isinstance(self._comments, bytes):
+            return json.loads(zlib.decompress(self._comments))
+        return json.loads(self._comments)
+
+    @property
+    def comments(self) -> List[Comment]:
+        """Comments, decoded on access"""
+        return [Comment(c["author"], c["body"], c["created"]) for c in self._comment_dicts()]
+
+    @property
+    def project(self) -> str:
+        """Project key, e.g. PROD for PROD-123"""
+        return sys.intern(self.key.split("-")[0])
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Ticket in the ``format_ticket`` JSON shape, with the fields it has"""
+        data: Dict[str, Any] = {}
+        for name in self._fields:
+            if name == "labels":
+                data[name] = list(self.labels)
+            elif name == "comments":
+                data[name] = self._comment_dicts()
+            else:
+                data[name] = getattr(self, name)
+        return data
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._fields:
+            raise KeyError(name)
+        if name == "comments":
+            return self.comments
+        return getattr(self, name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __repr__(self) -> str:
+        return f"Ticket({self.key!r}, status={self.status!r})"
+
+
+def to_jsonable(obj: Any) -> Any:
+    """``default`` hook for json.dumps that serialises ticket records"""
+    if isinstance(obj, (Ticket, Comment)):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class TicketCollection(Sequence[Mapping[str, Any]]):
+    """
+    Tickets in order, indexed by key
+
+    Behaves like a read-only list of tickets (iteration, ``len``,
+    integer indexing and slicing) and adds dict-style lookup by key:
+    ``tickets["PROD-1"]``, ``tickets.get("PROD-1")`` and ``"PROD-1" in
+    tickets`` are O(1). Adding a ticket whose key is already present
+    replaces it in place. Use ``to_list()`` where plain dicts are needed,
+    e.g. for JSON responses.
+    """
+
+    __slots__ = ("_tickets", "_index")
+
+    def __init__(self, tickets: Iterable[Mapping[str, Any]] = ()):
+        self._tickets: List[Mapping[str, Any]] = []
+        self._index: Dict[str, int] = {}
+        self.extend(tickets)
+
+    @classmethod
+    def of(cls, tickets: Iterable[Mapping[str, Any]]) -> "TicketCollection":
+        """Return ``tickets`` if it already is a collection, otherwise index it"""
+        return tickets if isinstance(tickets, cls) else cls(tickets)
+
+    def append(self, ticket: Mapping[str, Any]):
+        """Add a ticket at the end, or replace the ticket with the same key"""
+        key = ticket["key"]
+        position = self._index.get(key)
+        if position is None:
+            self._index[key] = len(self._tickets)
+            self._tickets.append(ticket)
+        else:
+            self._tickets[position] = ticket
+
+    def extend(self, tickets: Iterable[Mapping[str, Any]]):
+        """Add several tickets in order"""
+        for ticket in tickets:
+            self.append(ticket)
+
+    def get(self, key: str, default: Optional[Mapping[str, Any]] = None) -> Optional[Mapping[str, Any]]:
+        """Look up a ticket by key"""
+        position = self._index.get(key)
+        return default if position is None else self._tickets[position]
+
+    def keys(self) -> KeysView[str]:
+        """Ticket keys, in order"""
+        return self._index.keys()
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Plain list of ticket dicts (``Ticket`` records are converted)"""
+        return [t.to_dict() if isinstance(t, Ticket) else dict(t) for t in self._tickets]
+
+    @overload
+    def __getitem__(self, item: int) -> Mapping[str, Any]: ...
+
+    @overload
+    def __getitem__(self, item: str) -> Mapping[str, Any]: ...
+
+    @overload
+    def __getitem__(self, item: slice) -> "TicketCollection": ...
+
+    def __getitem__(self, item: Union[int, str, slice]) -> Any:
+        if isinstance(item, str):
+            return self._tickets[self._index[item]]
+        if isinstance(item, slice):
+            return TicketCollection(self._tickets[item])
+        return self._tickets[item]
+
+    def __contains__(self, item: object) -> bool:
+        if isinstance(item, Mapping):
+            item = item.get("key")
+        return item in self._index
+
+    def __iter__(self) -> Iterator[Mapping[str, Any]]:
+        return iter(self._tickets)
+
+    def __len__(self) -> int:
+        return len(self._tickets)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, TicketCollection):
+            return self._tickets == other._tickets
+        if isinstance(other, list):
+            return self._tickets == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TicketCollection({list(self._index)})"
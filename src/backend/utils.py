@@ -2,8 +2,11 @@
 Utility functions for JIRA AI Agent
 """
 
-from typing import List, Dict, Any, Optional
+from typing import IO, AbstractSet, Iterator, List, Dict, Any, Optional, Tuple
+from contextlib import contextmanager
+import os
 import re
+import tempfile
 from datetime import datetime
 
 
@@ -20,16 +23,20 @@ def clean_text(text: Optional[str]) -> str:
     return text.strip()
 
 
-def extract_keywords(text: Optional[str], min_length: int = 3) -> List[str]:
-    """Extract keywords from text"""
+_TOKEN_PATTERN = re.compile(r'[^\W_]+')
+
+
+def tokenize(text: Optional[str], min_length: int = 3) -> List[str]:
+    """Split text into lowercase alphanumeric tokens, keeping repeats and order"""
     if not text:
         return []
     
-    # Simple keyword extraction
-    words = text.lower().split()
-    keywords = [w for w in words if len(w) >= min_length and w.isalnum()]
-    
-    return list(set(keywords))
+    return [w for w in _TOKEN_PATTERN.findall(text.lower()) if len(w) >= min_length]
+
+
+def extract_keywords(text: Optional[str], min_length: int = 3) -> List[str]:
+    """Extract keywords from text"""
+    return list(set(tokenize(text, min_length)))
 
 
 def calculate_similarity(text1: Optional[str], text2: Optional[str]) -> float:
@@ -37,15 +44,16 @@ def calculate_similarity(text1: Optional[str], text2: Optional[str]) -> float:
     if not text1 or not text2:
         return 0.0
     
-    words1 = set(extract_keywords(text1))
-    words2 = set(extract_keywords(text2))
-    
+    return jaccard_similarity(set(extract_keywords(text1)), set(extract_keywords(text2)))
+
+
+def jaccard_similarity(words1: AbstractSet[str], words2: AbstractSet[str]) -> float:
+    """Jaccard similarity between two keyword sets"""
     if not words1 or not words2:
         return 0.0
     
-    # Jaccard similarity
-    intersection = len(words1.intersection(words2))
-    union = len(words1.union(words2))
+    intersection = len(words1 & words2)
+    union = len(words1 | words2)
     
     return intersection / union if union > 0 else 0.0
 
@@ -99,3 +107,40 @@ def calculate_resolution_time(created: str, updated: str) -> float:
         return round(delta.total_seconds() / 86400, 2)  # Convert to days
     except:
         return 0.0
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int, int]]:
+    """Inode, mtime and size of a file (None if missing); changes whenever atomic_write replaces it"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w') -> Iterator[IO[Any]]:
+    """
+    Write a file under a temporary name and move it into place when done
+    
+    The temporary file is unique to this call, so processes saving the same
+    path at once never write into each other's output, and readers see the
+    old or the new file but never a partial one.
+    
+    Example:
+        with atomic_write(path) as f:
+            json.dump(data, f)
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
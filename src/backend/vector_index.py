@@ -0,0 +1,313 @@
+"""
+Hashed-embedding vector index for JIRA tickets
+CPU-only semantic-ish similarity without loading an embedding model
+"""
+
+from typing import Any, Collection, Dict, Iterable, List, Mapping, Optional, Tuple
+import json
+import logging
+import os
+import threading
+import uuid
+import zlib
+
+import numpy as np
+
+from .search_index import ticket_tokens
+from .utils import atomic_write, file_signature, tokenize
+
+logger = logging.getLogger(__name__)
+
+
+class HashingVectorizer:
+    """
+    Map tokens to a fixed-size vector with the hashing trick
+
+    Features are word unigrams, word bigrams and character trigrams (at half
+    weight, so "authenticate" and "authentication" land close together).
+    A stable CRC32 hash is used so vectors are identical across processes.
+    """
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+
+    def _add(self, vector: np.ndarray, feature: str, weight: float):
+        h = zlib.crc32(feature.encode('utf-8'))
+        sign = 1.0 if (h >> 31) & 1 else -1.0
+        vector[h % self.dim] += sign * weight
+
+    def transform(self, tokens: List[str]) -> np.ndarray:
+        """Vectorise a token list into an L2-normalised float32 vector"""
+        vector = np.zeros(self.dim, dtype=np.float32)
+
+        for i, token in enumerate(tokens):
+            self._add(vector, token, 1.0)
+            if i:
+                self._add(vector, f"{tokens[i - 1]} {token}", 1.0)
+            padded = f"<{token}>"
+            for j in range(len(padded) - 2):
+                self._add(vector, padded[j:j + 3], 0.5)
+
+        # Sublinear term frequency keeps long descriptions from dominating
+        np.copyto(vector, np.sign(vector) * np.log1p(np.abs(vector)))
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector
+
+    def transform_text(self, text: Optional[str]) -> np.ndarray:
+        """Vectorise free text"""
+        return self.transform(tokenize(text))
+
+
+class VectorIndex:
+    """
+    Brute-force cosine index over hashed ticket embeddings
+
+    Vectors live in a float16 matrix. When a path is given, keys, versions
+    and the current generation are kept in ``<path>.json`` and the matrix in
+    ``<path>.<generation>.npy``, which is memory-mapped copy-on-write on
+    load. Removed rows are zeroed and reused. With ``read_only``, the files
+    are written by another process and never saved from this one.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        dim: int = 1024,
+        dtype: str = "float16",
+        block_rows: int = 4096,
+        read_only: bool = False
+    ):
+        self.path = path
+        self.read_only = read_only
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self.block_rows = block_rows
+        self.vectorizer = HashingVectorizer(dim)
+
+        self._lock = threading.RLock()
+        self._save_lock = threading.Lock()
+        self._keys: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        self._versions: Dict[str, Optional[str]] = {}
+        self._free: List[int] = []
+        self._matrix = np.zeros((0, dim), dtype=self.dtype)
+        self._generation: Optional[str] = None
+        self._signature: Optional[Tuple[int, int, int]] = None
+
+        if path and os.path.exists(f"{path}.json"):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._rows
+
+    def _matrix_path(self, generation: str) -> str:
+        return f"{self.path}.{generation}.npy"
+
+    def _grow(self, capacity: int):
+        """Resize the matrix to hold ``capacity`` rows (in memory until save())"""
+        used = len(self._keys)
+        matrix = np.zeros((capacity, self.dim), dtype=self.dtype)
+        matrix[:used] = self._matrix[:used]
+        self._matrix = matrix
+
+    def add(self, key: str, tokens: List[str], version: Optional[str] = None):
+        """Embed and store a document, replacing any previous version of it"""
+        vector = self.vectorizer.transform(tokens)
+
+        with self._lock:
+            row = self._rows.get(key)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                else:
+                    row = len(self._keys)
+                    if row >= self._matrix.shape[0]:
+                        self._grow(max(64, self._matrix.shape[0] * 2))
+                    self._keys.append(None)
+                self._keys[row] = key
+                self._rows[key] = row
+            self._matrix[row] = vector
+            self._versions[key] = version
+
+    def remove(self, key: str) -> bool:
+        """Remove a document, returning whether it was present"""
+        with self._lock:
+            row = self._rows.pop(key, None)
+            if row is None:
+                return False
+            self._matrix[row] = 0
+            self._keys[row] = None
+            self._versions.pop(key, None)
+            self._free.append(row)
+            return True
+
+    def update_tickets(self, tickets: Iterable[Mapping[str, Any]]) -> int:
+        """
+        Embed tickets that are new or whose ``updated`` timestamp changed
+
+        Returns:
+            Number of tickets (re)embedded
+        """
+        changed = 0
+        for ticket in tickets:
+            key = ticket['key']
+            version = ticket.get('updated')
+            if key in self._rows and self._versions.get(key) == version:
+                continue
+            self.add(key, ticket_tokens(ticket), version)
+            changed += 1
+        return changed
+
+    def search(
+        self,
+        query: str,
+        top_k: int = 10,
+        keys: Optional[Collection[str]] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank stored documents by cosine similarity to the query
+
+        Args:
+            query: Free-text query
+            top_k: Maximum number of results
+            keys: Restrict results to these document keys
+
+        Returns:
+            List of (key, score) pairs with positive similarity, best first
+        """
+        q = self.vectorizer.transform_text(query)
+        if not q.any():
+            return []
+
+        with self._lock:
+            if keys is not None:
+                rows = np.fromiter(
+                    (self._rows[k] for k in keys if k in self._rows), dtype=np.int64
+                )
+                scores = self._matrix[rows].astype(np.float32) @ q
+            else:
+                used = len(self._keys)
+                rows = np.arange(used)
+                # Convert in blocks so float32 scratch memory stays bounded
+                scores = np.empty(used, dtype=np.float32)
+                for start in range(0, used, self.block_rows):
+                    end = min(start + self.block_rows, used)
+                    scores[start:end] = self._matrix[start:end].astype(np.float32) @ q
+            row_keys = self._keys
+
+            if len(scores) > top_k:
+                best = np.argpartition(-scores, top_k)[:top_k]
+            else:
+                best = np.arange(len(scores))
+            best = best[np.argsort(-scores[best])]
+
+            return [
+                (row_keys[rows[i]], float(scores[i]))
+                for i in best
+                if scores[i] > 0 and row_keys[rows[i]] is not None
+            ]
+
+    def save(self):
+        """
+        Write the vectors and key map as a new generation
+
+        The matrix is written to a new file first and ``<path>.json`` is
+        then replaced to point at it, so a reader always finds a matrix and
+        key map written together, even while another process saves.
+        """
+        if not self.path or self.read_only:
+            return
+
+        with self._save_lock:
+            with self._lock:
+                rows = len(self._keys)
+                matrix = np.array(self._matrix[:rows])
+                generation = uuid.uuid4().hex
+                meta = {
+                    "dim": self.dim,
+                    "dtype": self.dtype.name,
+                    "generation": generation,
+                    "rows": rows,
+                    "keys": list(self._keys),
+                    "versions": dict(self._versions)
+                }
+
+            with atomic_write(self._matrix_path(generation), 'wb') as f:
+                np.save(f, matrix)
+            with atomic_write(f"{self.path}.json") as f:
+                json.dump(meta, f)
+            self._signature = file_signature(f"{self.path}.json")
+
+            previous, self._generation = self._generation, generation
+            if previous is not None:
+                try:
+                    # Processes that still map it keep their copy until they reload
+                    os.remove(self._matrix_path(previous))
+                except OSError:
+                    pass
+
+    def reload_if_changed(self) -> bool:
+        """Reload the files if another process saved them since this one last loaded or saved them"""
+        if not self.path:
+            return False
+        signature = file_signature(f"{self.path}.json")
+        if signature is None or signature == self._signature:
+            return False
+        return self.load()
+
+    def _read(self) -> Optional[Tuple[Dict[str, Any], np.ndarray]]:
+        """Key map and matrix of the saved generation, or None if saved with other settings"""
+        with open(f"{self.path}.json", 'r') as f:
+            meta = json.load(f)
+        if meta.get("dim") != self.dim or meta.get("dtype") != self.dtype.name:
+            return None
+
+        if meta["rows"]:
+            matrix = np.load(self._matrix_path(meta["generation"]), mmap_mode='c')
+        else:
+            matrix = np.zeros((0, self.dim), dtype=self.dtype)
+        if matrix.shape != (meta["rows"], self.dim) or matrix.dtype != self.dtype or len(meta["keys"]) != meta["rows"]:
+            raise ValueError(f"matrix of shape {matrix.shape} does not match {len(meta['keys'])} keys")
+        return meta, matrix
+
+    def load(self) -> bool:
+        """
+        Memory-map a previously saved index
+
+        The matrix is mapped copy-on-write: rows this process changes stay
+        private to it until save() writes a new generation, so processes
+        sharing the files never overwrite each other's vectors.
+
+        Returns:
+            Whether the index was loaded; an index saved with other settings,
+            or whose matrix does not match its key map, is left out and
+            rebuilt by later updates
+        """
+        self._signature = file_signature(f"{self.path}.json")
+        try:
+            try:
+                loaded = self._read()
+            except FileNotFoundError:
+                # Replaced by a concurrent save between reading the key map and the matrix
+                loaded = self._read()
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Vector index %s could not be loaded (%s); rebuilding it", self.path, e)
+            return False
+        if loaded is None:
+            # Settings changed; start over and re-embed on the next update
+            return False
+
+        meta, matrix = loaded
+        with self._lock:
+            self._matrix = matrix
+            self._generation = meta["generation"]
+            self._keys = meta["keys"]
+            self._versions = meta["versions"]
+            self._rows = {key: row for row, key in enumerate(self._keys) if key is not None}
+            self._free = [row for row, key in enumerate(self._keys) if key is None]
+        return True
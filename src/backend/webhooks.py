@@ -0,0 +1,316 @@
+"""
+JIRA webhook ingestion
+Applies issue created/updated/deleted events to the local ticket mirror and
+search indexes as they happen, instead of waiting for the next sync
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import hashlib
+import hmac
+import logging
+import threading
+import time
+
+from .config_manager import get_config
+from .jira_utils import FIELD_KEYS, format_ticket
+from .metrics import WEBHOOK_BATCH_SIZE, WEBHOOK_EVENTS
+from .ticket_store import to_timestamp
+
+logger = logging.getLogger(__name__)
+
+UPSERT_EVENTS = {"jira:issue_created", "jira:issue_updated"}
+DELETE_EVENTS = {"jira:issue_deleted"}
+
+# issue_event_type_name of jira:issue_updated events that carry a "comment"
+COMMENT_ADDED = {"issue_commented", "issue_comment_edited"}
+COMMENT_DELETED = {"issue_comment_deleted"}
+
+# One queued change: ("upsert", ticket fields sent, comment change) or ("delete", {}, None)
+Change = Tuple[str, Dict[str, Any], Optional[Tuple[str, Dict[str, Any]]]]
+
+
+def verify_signature(body: bytes, signature: Optional[str], secret: str) -> bool:
+    """
+    Check an ``X-Hub-Signature`` header ("sha256=<hex HMAC of the body>")
+
+    Args:
+        body: Raw request body
+        signature: Header value, if any
+        secret: Secret configured on the JIRA webhook
+    """
+    if not signature or "=" not in signature:
+        return False
+    method, _, digest = signature.partition("=")
+    if method not in ("sha256", "sha1"):
+        return False
+    expected = hmac.new(secret.encode(), body, getattr(hashlib, method)).hexdigest()
+    return hmac.compare_digest(expected, digest.strip().lower())
+
+
+def _comment_id(comment: Dict[str, Any]) -> Tuple[Any, Any]:
+    # Mirrored comments carry no JIRA id; author and creation time identify them
+    return comment.get("author"), comment.get("created")
+
+
+class WebhookIngester:
+    """
+    Queues webhook events and writes them to the mirror in batches
+
+    Events are keyed by issue, so repeated edits of one issue during a burst
+    collapse into a single write. A batch is written once no event has
+    arrived for ``debounce_seconds``, once its oldest event has waited
+    ``max_delay_seconds``, or as soon as ``max_batch`` issues are pending
+    (``jira.mirror.webhooks``). Each batch is one mirror transaction and one
+    search index refresh, however many events it holds.
+
+    Example:
+        ingester = WebhookIngester(
+            jira_client.store, jira_client.jira_url,
+            on_upserted=agent.index_tickets, on_deleted=agent.remove_tickets
+        ).start()
+        ingester.submit(payload)
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        jira_url: Optional[str],
+        on_upserted: Optional[Callable[[List[Dict[str, Any]]], Any]] = None,
+        on_deleted: Optional[Callable[[List[str]], Any]] = None
+    ):
+        """
+        Args:
+            store: TicketStore the events are written to
+            jira_url: Base URL of the JIRA site, used for browse links
+            on_upserted: Refreshes derived data (e.g. search indexes) with written tickets
+            on_deleted: Removes deleted ticket keys from derived data
+        """
+        self.store = store
+        self.jira_url = jira_url
+        self.on_upserted = on_upserted
+        self.on_deleted = on_deleted
+        self._pending: Dict[str, List[Change]] = {}
+        self._first_event = 0.0
+        self._last_event = 0.0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _settings() -> Dict[str, float]:
+        settings = get_config().get('jira.mirror.webhooks', {})
+        return {
+            "debounce": float(settings.get('debounce_seconds', 2)),
+            "max_delay": float(settings.get('max_delay_seconds', 10)),
+            "max_batch": int(settings.get('max_batch', 500))
+        }
+
+    @property
+    def pending(self) -> int:
+        """Number of issues waiting to be written"""
+        with self._cond:
+            return len(self._pending)
+
+    def _parse(self, payload: Dict[str, Any]) -> Optional[Tuple[str, Change]]:
+        """Issue key and queued change for a webhook payload, or None if it is not applied"""
+        event = payload.get("webhookEvent")
+        issue = payload.get("issue")
+        if event not in UPSERT_EVENTS | DELETE_EVENTS or not isinstance(issue, dict) or not issue.get("key"):
+            return None
+
+        config = get_config()
+        key = str(issue["key"]).upper()
+        if key.split("-")[0] not in config.get('jira.projects', ()):
+            return None
+        if event in DELETE_EVENTS:
+            return key, ("delete", {}, None)
+
+        # Only the fields the payload carries; the rest are kept from the mirror
+        issue_fields = issue.get("fields") or {}
+        sent = [field for field in config.get('jira.fields', ()) if field in issue_fields]
+        fields = format_ticket({**issue, "key": key}, self.jira_url, sent)
+
+        comment_change = None
+        comment = payload.get("comment")
+        event_type = payload.get("issue_event_type_name")
+        if isinstance(comment, dict) and "comment" not in issue_fields:
+            formatted = {
+                "author": (comment.get("author") or {}).get("displayName"),
+                "body": comment.get("body"),
+                "created": str(comment.get("created"))
+            }
+            if event_type in COMMENT_ADDED:
+                comment_change = ("set", formatted)
+            elif event_type in COMMENT_DELETED:
+                comment_change = ("remove", formatted)
+
+        return key, ("upsert", fields, comment_change)
+
+    def submit(self, payload: Dict[str, Any]) -> Optional[str]:
+        """
+        Queue a webhook event
+
+        Args:
+            payload: JSON body of a JIRA webhook request
+
+        Returns:
+            Key of the affected issue, or None if the event was ignored
+            (another event type, or an issue outside ``jira.projects``)
+        """
+        event = payload.get("webhookEvent")
+        if event not in UPSERT_EVENTS | DELETE_EVENTS:
+            event = "other"
+        parsed = self._parse(payload)
+        if parsed is None:
+            WEBHOOK_EVENTS.inc(event=event, result="ignored")
+            return None
+
+        key, change = parsed
+        with self._cond:
+            now = time.monotonic()
+            if not self._pending:
+                self._first_event = now
+            self._last_event = now
+            self._pending.setdefault(key, []).append(change)
+            self._cond.notify()
+        WEBHOOK_EVENTS.inc(event=event, result="accepted")
+        return key
+
+    def _due(self, settings: Dict[str, float]) -> float:
+        """Monotonic time at which the pending batch should be written"""
+        if len(self._pending) >= settings["max_batch"]:
+            return 0.0
+        return min(self._last_event + settings["debounce"], self._first_event + settings["max_delay"])
+
+    def _take(self) -> Dict[str, List[Change]]:
+        with self._cond:
+            batch, self._pending = self._pending, {}
+            return batch
+
+    def _requeue(self, batch: Dict[str, List[Change]]):
+        """Put a batch that could not be written back in front of newer events"""
+        with self._cond:
+            for key, changes in self._pending.items():
+                batch.setdefault(key, []).extend(changes)
+            self._pending = batch
+            self._first_event = self._last_event = time.monotonic()
+
+    @staticmethod
+    def _apply(ticket: Optional[Dict[str, Any]], changes: List[Change]) -> Optional[Dict[str, Any]]:
+        """Apply one issue's queued changes in order; returns the ticket (None if deleted)"""
+        for action, fields, comment_change in changes:
+            if action == "delete":
+                ticket = None
+                continue
+
+            if ticket is not None and fields.get("updated") and ticket.get("updated"):
+                # Webhooks can arrive out of order; never go back to an older version
+                if to_timestamp(fields["updated"]) < to_timestamp(ticket["updated"]):
+                    continue
+            if ticket is None:
+                # New to the mirror: fields the payload left out are empty
+                ticket = {ticket_key: None for ticket_key in FIELD_KEYS.values()}
+                ticket.update(labels=[], comments=[])
+            ticket = {**ticket, **fields}
+
+            if comment_change is not None:
+                operation, comment = comment_change
+                comments = [c for c in ticket.get("comments") or [] if _comment_id(c) != _comment_id(comment)]
+                if operation == "set":
+                    comments.append(comment)
+                ticket["comments"] = comments
+        return ticket
+
+    def flush(self) -> Tuple[int, int]:
+        """
+        Write all pending events now
+
+        If the mirror cannot be written, the events are queued again (ahead
+        of events that arrived meanwhile) for the next batch.
+
+        Returns:
+            Number of tickets that were new or changed, and number deleted
+
+        Raises:
+            The mirror's error, after requeueing the events
+        """
+        with self._flush_lock:
+            batch = self._take()
+            if not batch:
+                return 0, 0
+
+            try:
+                stored = self.store.get_tickets(batch.keys())
+
+                upserts: List[Dict[str, Any]] = []
+                deletes: List[str] = []
+                for key, changes in batch.items():
+                    ticket = self._apply(stored.get(key), changes)
+                    if ticket is not None:
+                        upserts.append(ticket)
+                    else:
+                        deletes.append(key)
+
+                # Both are safe to repeat, so a failed batch is simply applied again
+                deleted = self.store.delete_tickets(deletes)
+                changed = self.store.upsert_tickets(upserts)
+            except BaseException:
+                self._requeue(batch)
+                raise
+
+            if upserts:
+                WEBHOOK_BATCH_SIZE.observe(len(upserts), action="upsert")
+            if deletes:
+                WEBHOOK_BATCH_SIZE.observe(len(deletes), action="delete")
+            logger.info(
+                "Applied webhook batch: %d issues, %d new or changed, %d deleted", len(batch), changed, deleted
+            )
+
+            try:
+                if deletes and self.on_deleted is not None:
+                    self.on_deleted(deletes)
+                if changed and self.on_upserted is not None:
+                    self.on_upserted(upserts)
+            except Exception as e:
+                logger.error("Refreshing derived data after a webhook batch failed: %s", e)
+
+            return changed, deleted
+
+    def run(self):
+        """Write batches as they fall due until stop() is called"""
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                delay = self._due(self._settings()) - time.monotonic()
+                if delay > 0 and not self._closed:
+                    # Woken early by new events, which may postpone the batch
+                    self._cond.wait(delay)
+                    continue
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error("Writing webhook batch failed, retrying with the next batch: %s", e)
+                if self._closed:
+                    # Shutting down: do not spin on a mirror that cannot be written
+                    logger.error("Dropping %d unwritten webhook issues at shutdown", self.pending)
+                    return
+
+    def start(self) -> "WebhookIngester":
+        """Write batches from a background thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._closed = False
+            self._thread = threading.Thread(target=self.run, name="webhook-ingester", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """Write whatever is pending and stop the background thread"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
@@ -9,6 +9,7 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
+import json
 import os
 from dotenv import load_dotenv
 
@@ -139,81 +140,60 @@ def query_assistant_page(projects):
         search_button = st.button("🔍 Search & Analyze", type="primary", use_container_width=True)
     
     if search_button and query:
+        # Placeholders are filled in as streamed events arrive
+        analysis_area = st.empty()
+        matches_area = st.empty()
+        resolution_header = st.empty()
+        resolution_area = st.empty()
+        
         with st.spinner("🤖 Analyzing your query and searching historical tickets..."):
             try:
-                # Call API
+                # Call streaming API
                 response = requests.post(
-                    f"{API_URL}/api/query",
+                    f"{API_URL}/api/query/stream",
                     json={
                         "query": query,
                         "projects": projects,
                         "max_results": max_results
                     },
+                    stream=True,
                     timeout=60
                 )
                 
                 if response.status_code == 200:
-                    data = response.json()
-                    
-                    # Display query analysis
-                    st.subheader("📋 Query Analysis")
-                    analysis = data.get("analysis", {})
+                    analysis = None
+                    total_tickets = None
+                    resolution = ""
                     
-                    col1, col2, col3 = st.columns(3)
-                    with col1:
-                        st.metric("Issue Type", analysis.get("issue_type", "Unknown"))
-                    with col2:
-                        st.metric("Priority", analysis.get("priority", "Medium"))
-                    with col3:
-                        st.metric("Historical Tickets", data.get("total_historical_tickets", 0))
-                    
-                    # Display matched tickets
-                    st.subheader("🎯 Matched Tickets")
-                    matched_tickets = data.get("matched_tickets", [])
-                    
-                    if matched_tickets:
-                        for i, match in enumerate(matched_tickets, 1):
-                            ticket_data = match.get("ticket_data", {})
-                            
-                            with st.expander(
-                                f"#{i} [{ticket_data.get('key', 'N/A')}] {ticket_data.get('summary', 'N/A')} "
-                                f"(Relevance: {match.get('relevance_score', 0)}/10)",
-                                expanded=(i == 1)
-                            ):
-                                col1, col2 = st.columns([3, 1])
-                                
-                                with col1:
-                                    st.write("**Description:**")
-                                    st.write(ticket_data.get('description', 'No description')[:500] + "...")
-                                    
-                                    st.write("**Why it's relevant:**")
-                                    st.info(match.get('reasoning', 'Similar content'))
-                                    
-                                    if match.get('has_solution'):
-                                        st.write("**Solution:**")
-                                        st.success(match.get('solution_summary', ticket_data.get('resolution', 'N/A')))
-                                
-                                with col2:
-                                    st.metric("Status", ticket_data.get('status', 'N/A'))
-                                    st.metric("Priority", ticket_data.get('priority', 'N/A'))
-                                    if ticket_data.get('url'):
-                                        st.link_button("View in JIRA", ticket_data['url'])
-                    else:
-                        st.warning("No matching tickets found.")
-                    
-                    # Display AI-generated resolution
-                    st.subheader("💡 AI-Generated Resolution")
-                    resolution = data.get("resolution", "")
+                    for event, data in iter_sse_events(response):
+                        if event == "analysis":
+                            analysis = data
+                            with analysis_area.container():
+                                display_query_analysis(analysis, total_tickets)
+                        
+                        elif event == "candidates":
+                            with matches_area.container():
+                                display_candidate_tickets(data.get("tickets", []))
+                        
+                        elif event == "matches":
+                            total_tickets = data.get("total_historical_tickets", 0)
+                            if analysis is not None:
+                                with analysis_area.container():
+                                    display_query_analysis(analysis, total_tickets)
+                            with matches_area.container():
+                                display_matched_tickets(data.get("matched_tickets", []))
+                        
+                        elif event == "token":
+                            if not resolution:
+                                resolution_header.subheader("💡 AI-Generated Resolution")
+                            resolution += data.get("text", "")
+                            display_resolution(resolution_area, resolution)
+                        
+                        elif event == "error":
+                            st.error(f"Error: {data.get('error', 'Unknown error')}")
                     
-                    if resolution:
-                        # Format resolution text for better readability
-                        formatted_resolution = resolution.replace('\n', '<br>')
-                        st.markdown(
-                            f'<div class="resolution-box">{formatted_resolution}</div>', 
-                            unsafe_allow_html=True
-                        )
-                    else:
-                        st.info("No resolution could be generated. Try refining your query.")
+                    if not resolution:
+                        resolution_area.info("No resolution could be generated. Try refining your query.")
                 
                 else:
                     st.error(f"Error: {response.json().get('error', 'Unknown error')}")
@@ -224,6 +204,98 @@ def query_assistant_page(projects):
                 st.error(f"An error occurred: {str(e)}")
 
 
+def iter_sse_events(response):
+    """Parse a Server-Sent Events response into (event, data) pairs"""
+    event, data_lines = "message", []
+    
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if line == "":
+            if data_lines:
+                yield event, json.loads("\n".join(data_lines))
+            event, data_lines = "message", []
+        elif line.startswith("event:"):
+            event = line[len("event:"):].strip()
+        elif line.startswith("data:"):
+            data_lines.append(line[len("data:"):].strip())
+
+
+def display_query_analysis(analysis, total_tickets=None):
+    """Display query analysis metrics"""
+    st.subheader("📋 Query Analysis")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Issue Type", analysis.get("issue_type", "Unknown"))
+    with col2:
+        st.metric("Priority", analysis.get("priority", "Medium"))
+    with col3:
+        st.metric("Historical Tickets", total_tickets if total_tickets is not None else "…")
+
+
+def display_candidate_tickets(tickets):
+    """Display preliminary matches while the LLM ranks them"""
+    st.subheader("🎯 Matched Tickets")
+    
+    if not tickets:
+        st.caption("Ranking historical tickets...")
+        return
+    
+    st.caption("Preliminary keyword matches, ranking with AI...")
+    for ticket in tickets:
+        st.markdown(
+            f"- **[{ticket.get('key', 'N/A')}]** {ticket.get('summary', 'N/A')} "
+            f"({ticket.get('status', 'N/A')})"
+        )
+
+
+def display_matched_tickets(matched_tickets):
+    """Display LLM-ranked matched tickets"""
+    st.subheader("🎯 Matched Tickets")
+    
+    if not matched_tickets:
+        st.warning("No matching tickets found.")
+        return
+    
+    for i, match in enumerate(matched_tickets, 1):
+        ticket_data = match.get("ticket_data", {})
+        
+        with st.expander(
+            f"#{i} [{ticket_data.get('key', 'N/A')}] {ticket_data.get('summary', 'N/A')} "
+            f"(Relevance: {match.get('relevance_score', 0)}/10)",
+            expanded=(i == 1)
+        ):
+            col1, col2 = st.columns([3, 1])
+            
+            with col1:
+                st.write("**Description:**")
+                st.write((ticket_data.get('description') or 'No description')[:500] + "...")
+                
+                st.write("**Why it's relevant:**")
+                st.info(match.get('reasoning', 'Similar content'))
+                
+                if match.get('has_solution'):
+                    st.write("**Solution:**")
+                    st.success(match.get('solution_summary', ticket_data.get('resolution', 'N/A')))
+            
+            with col2:
+                st.metric("Status", ticket_data.get('status', 'N/A'))
+                st.metric("Priority", ticket_data.get('priority', 'N/A'))
+                if ticket_data.get('url'):
+                    st.link_button("View in JIRA", ticket_data['url'])
+
+
+def display_resolution(placeholder, resolution):
+    """Render (partial) resolution text into a placeholder"""
+    # Format resolution text for better readability
+    formatted_resolution = resolution.replace('\n', '<br>')
+    placeholder.markdown(
+        f'<div class="resolution-box">{formatted_resolution}</div>', 
+        unsafe_allow_html=True
+    )
+
+
 def ticket_search_page(projects):
     """Ticket search and browsing page"""
     
@@ -254,13 +326,15 @@ def ticket_search_page(projects):
                         "projects": projects,
                         "statuses": statuses,
                         "days_back": days_back,
-                        "max_results": max_results
+                        "max_results": max_results,
+                        "profile": "list"
                     }
                 )
                 
                 if response.status_code == 200:
                     data = response.json()
                     tickets = data.get("tickets", [])
+                    tickets_by_key = {t["key"]: t for t in tickets}
                     
                     st.success(f"Found {len(tickets)} tickets")
                     
@@ -277,10 +351,15 @@ def ticket_search_page(projects):
                         st.dataframe(df, use_container_width=True)
                         
                         # Ticket details
-                        selected_key = st.selectbox("Select a ticket to view details:", [t["key"] for t in tickets])
+                        selected_key = st.selectbox("Select a ticket to view details:", list(tickets_by_key))
                         
                         if selected_key:
-                            ticket = next((t for t in tickets if t["key"] == selected_key), None)
+                            # The list has no descriptions or comments; load the whole ticket
+                            detail_response = requests.get(f"{API_URL}/api/tickets/{selected_key}")
+                            if detail_response.status_code == 200:
+                                ticket = detail_response.json()
+                            else:
+                                ticket = tickets_by_key.get(selected_key)
                             if ticket:
                                 display_ticket_details(ticket)
                 
@@ -3,13 +3,31 @@ JIRA MCP Server - FastMCP server for JIRA integration
 Provides tools to fetch and analyze historical JIRA tickets
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Coroutine, Dict, Iterator, List, Mapping, Optional, Tuple, TypeVar
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from urllib.parse import urlparse
+import asyncio
+import itertools
+import math
 import os
+import sys
+import threading
+import time
 from jira import JIRA
 from dotenv import load_dotenv
 from mcp.server.fastmcp import FastMCP
-import yaml
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.async_jira_client import AsyncJiraClient
+from backend.config_manager import ConfigSnapshot, config as app_config, get_config
+from backend.jira_utils import ISSUE_KEY_PATTERN, build_jql, format_ticket, profile_fields, ticket_keys
+from backend.metrics import FALLBACKS, JIRA_PAYLOAD_BYTES, JIRA_SECONDS, TICKET_LOOKUPS, timed
+from backend.ticket_store import TicketStore
+from backend.tickets import Ticket, TicketCollection
 
 # Load environment variables
 load_dotenv()
@@ -17,6 +35,19 @@ load_dotenv()
 # Initialize FastMCP server
 mcp = FastMCP("JIRA AI Agent MCP Server")
 
+T = TypeVar("T")
+
+
+def observe_payload(response: Any, *args: Any, **kwargs: Any) -> Any:
+    """requests response hook recording the body size of JIRA search and issue responses"""
+    path = urlparse(response.url).path
+    operation = "search" if "/search" in path else "issue" if "/issue/" in path else None
+    if operation is not None:
+        # Content-Length when sent (compressed size); otherwise the body, which is read anyway
+        length = response.headers.get('Content-Length')
+        JIRA_PAYLOAD_BYTES.observe(int(length) if length else len(response.content), operation=operation)
+    return response
+
 
 class JiraClient:
     """JIRA client wrapper for ticket operations"""
@@ -37,122 +68,526 @@ class JiraClient:
             server=self.jira_url,
             basic_auth=(self.jira_email, self.jira_token)
         )
+        # Response sizes are taken from the HTTP layer; serialising every
+        # parsed page again just to measure it cost as much as parsing it
+        session = getattr(self.client, '_session', None)
+        if session is not None:
+            session.hooks['response'].append(observe_payload)
+        
+        # Local ticket mirror, kept fresh with incremental JQL deltas
+        # (enabled and path apply at startup, the timings on every sync)
+        self.store: Optional[TicketStore] = None
+        if self.mirror_config.get('enabled', False):
+            store_path = os.path.join(
+                os.path.dirname(__file__), "../..",
+                self.mirror_config.get('path', 'data/tickets.db')
+            )
+            self.store = TicketStore(os.path.normpath(store_path))
+        # One lock per project: a long backfill of one project never holds up another
+        self._sync_locks: Dict[str, threading.Lock] = {}
+        self._sync_locks_guard = threading.Lock()
         
-        # Load configuration
-        config_path = os.path.join(os.path.dirname(__file__), "../../config/config.yaml")
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        # One AsyncJiraClient (and connection pool) for the process, on its own
+        # event loop thread; batch key lookups fan out over it concurrently
+        self._async_client: Optional[AsyncJiraClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_lock = threading.Lock()
+    
+    @property
+    def config(self) -> ConfigSnapshot:
+        """Current configuration (replaced when config.yaml changes)"""
+        return get_config()
+    
+    @property
+    def mirror_config(self) -> Mapping[str, Any]:
+        """The ``jira.mirror`` section of the current configuration"""
+        return self.config.get('jira.mirror', {})
+    
+    @property
+    def is_cloud(self) -> bool:
+        """Whether the server is Jira Cloud (cursor-paginated search API)"""
+        return bool(getattr(self.client, '_is_cloud', False))
+    
+    def _fetch_page(
+        self,
+        jql: str,
+        max_results: int,
+        start_at: int = 0,
+        page_token: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Fetch a single page of raw search results"""
+        fields = list(fields or self.config.get('jira.fields', ()))
+        with timed(JIRA_SECONDS, span="jira.search", operation="search"):
+            if self.is_cloud:
+                # Jira Cloud only supports cursor pagination on /search/jql
+                page = self.client.enhanced_search_issues(
+                    jql,
+                    nextPageToken=page_token,
+                    maxResults=max_results,
+                    fields=fields,
+                    json_result=True
+                )
+            else:
+                page = self.client.search_issues(
+                    jql,
+                    startAt=start_at,
+                    maxResults=max_results,
+                    fields=fields,
+                    json_result=True
+                )
+        return page
+    
+    def _iter_issues(
+        self,
+        jql: str,
+        max_results: Optional[int] = None,
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream formatted tickets for a JQL query
+        
+        Results are requested as raw JSON so no Issue resources are built.
+        
+        Args:
+            jql: JQL query string
+            max_results: Maximum number of tickets to yield (None for all)
+            fields: JIRA fields to fetch (None for all configured fields)
+        """
+        if self.is_cloud:
+            pages = self._iter_cursor_pages(jql, max_results, fields)
+        else:
+            pages = self._iter_offset_pages(jql, max_results, fields)
+        
+        remaining = max_results
+        for page in pages:
+            for raw in page.get("issues", []):
+                if remaining is not None:
+                    if remaining <= 0:
+                        return
+                    remaining -= 1
+                yield format_ticket(raw, self.jira_url, fields)
+    
+    def _iter_offset_pages(
+        self,
+        jql: str,
+        max_results: Optional[int],
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch startAt-paginated pages in parallel (JIRA Server / Data Center)
+        
+        The first page is fetched on its own to learn the total and the page
+        size the server actually honours. The remaining pages are fetched by a
+        bounded worker pool and yielded in order, with at most ``max_workers``
+        pages in flight at a time.
+        """
+        page_size = self.config.get('jira.page_size', 100)
+        max_workers = self.config.get('jira.max_workers', 4)
+        
+        first_page = self._fetch_page(jql, min(page_size, max_results or page_size), fields=fields)
+        yield first_page
+        
+        total = first_page.get("total", 0)
+        if max_results is not None:
+            total = min(total, max_results)
+        stride = len(first_page.get("issues", []))
+        if stride == 0 or stride >= total:
+            return
+        
+        starts = iter(range(stride, total, stride))
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pending = deque(
+                pool.submit(self._fetch_page, jql, min(stride, total - start), start, None, fields)
+                for start in itertools.islice(starts, max_workers)
+            )
+            try:
+                while pending:
+                    page = pending.popleft().result()
+                    start = next(starts, None)
+                    if start is not None:
+                        pending.append(
+                            pool.submit(self._fetch_page, jql, min(stride, total - start), start, None, fields)
+                        )
+                    yield page
+            finally:
+                # Consumer stopped early or a page failed: drop queued pages
+                for future in pending:
+                    future.cancel()
+    
+    def _iter_cursor_pages(
+        self,
+        jql: str,
+        max_results: Optional[int],
+        fields: Optional[List[str]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Fetch token-paginated pages (Jira Cloud)
+        
+        Each page carries the token for the next one, so pages cannot be
+        requested in parallel; instead the next page is prefetched while the
+        current one is being consumed.
+        """
+        page_size = self.config.get('jira.page_size', 100)
+        fetched = 0
+        
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            future = pool.submit(self._fetch_page, jql, min(page_size, max_results or page_size), 0, None, fields)
+            while future is not None:
+                page = future.result()
+                fetched += len(page.get("issues", []))
+                
+                token = page.get("nextPageToken")
+                future = None
+                if token and not page.get("isLast") and (max_results is None or fetched < max_results):
+                    size = page_size if max_results is None else min(page_size, max_results - fetched)
+                    future = pool.submit(self._fetch_page, jql, size, 0, token, fields)
+                
+                try:
+                    yield page
+                except GeneratorExit:
+                    if future is not None:
+                        future.cancel()
+                    raise
+    
+    def sync(self, projects: List[str], days_back: Optional[int] = None) -> int:
+        """
+        Bring the local mirror up to date for the given projects
+        
+        Projects whose mirror does not cover the requested window are
+        backfilled; the rest only fetch tickets updated since their last
+        sync, once the configured sync interval has elapsed.
+        
+        Args:
+            projects: JIRA project keys to sync
+            days_back: Window the caller is about to query (None for all history)
+            
+        Returns:
+            Number of tickets that were new or changed
+        """
+        if self.store is None:
+            return 0
+        
+        changed = 0
+        for project in projects:
+            try:
+                # While another thread syncs the project, serve the mirror as it
+                # is, unless it holds nothing for the project yet
+                waits = self.store.get_sync_state(project) is None
+                result = self.sync_project(project, days_back, blocking=waits)
+            except Exception:
+                # Serve possibly stale data rather than failing the request
+                if self.store.get_sync_state(project) is None:
+                    raise
+                continue
+            if result is not None:
+                changed += result[0]
+        
+        return changed
+    
+    def sync_project(
+        self,
+        project: str,
+        days_back: Optional[int] = None,
+        min_interval: Optional[float] = None,
+        blocking: bool = True
+    ) -> Optional[Tuple[int, List[Dict[str, Any]]]]:
+        """
+        Sync one project's mirror (backfill or delta, as in sync())
+        
+        Args:
+            project: JIRA project key
+            days_back: Window the mirror must cover (None for all history)
+            min_interval: Skip the delta if the last sync is more recent than
+                this (defaults to jira.mirror.sync_interval_seconds)
+            blocking: Wait for a sync of the project already in progress
+                (otherwise skip it)
+            
+        Returns:
+            Number of new or changed tickets and the tickets fetched, or None
+            if the project was synced recently enough or is being synced
+            
+        Raises:
+            Exception: If JIRA could not be read
+        """
+        if self.store is None:
+            return None
+        
+        config = self.config
+        if min_interval is None:
+            min_interval = config.get('jira.mirror.sync_interval_seconds', 120)
+        overlap = config.get('jira.mirror.overlap_minutes', 2)
+        backfill_days = config.get('jira.mirror.backfill_days', 90)
+        
+        with self._sync_locks_guard:
+            lock = self._sync_locks.setdefault(project, threading.Lock())
+        if not lock.acquire(blocking=blocking):
+            return None
+        try:
+            started = time.time()
+            state = self.store.get_sync_state(project)
+            
+            if days_back is None:
+                window_start = 0.0
+            else:
+                window_start = started - max(days_back, backfill_days) * 86400
+            
+            if state is None or state["covered_since"] > window_start:
+                # Backfill the whole window the caller needs
+                jql = f"project = {project}"
+                if window_start:
+                    jql += f" AND updated >= -{max(days_back or 0, backfill_days)}d"
+                covered_since = window_start
+            elif started - state["last_sync"] >= min_interval:
+                # Relative JQL dates avoid clock and timezone mismatches with JIRA
+                minutes = math.ceil((started - state["last_sync"]) / 60) + overlap
+                jql = f"project = {project} AND updated >= -{minutes}m"
+                covered_since = state["covered_since"]
+            else:
+                return None
+            
+            tickets = list(self._iter_issues(jql + " ORDER BY updated DESC"))
+            changed = self.store.upsert_tickets(tickets)
+            self.store.set_sync_state(project, started, covered_since)
+        finally:
+            lock.release()
+        
+        return changed, tickets
+    
+    def iter_tickets(
+        self,
+        projects: Optional[List[str]] = None,
+        issue_types: Optional[List[str]] = None,
+        statuses: Optional[List[str]] = None,
+        max_results: Optional[int] = 100,
+        days_back: Optional[int] = None,
+        profile: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream JIRA tickets matching the criteria, newest update first
+        
+        ``profile`` names a set of fields under ``jira.field_profiles``
+        (e.g. "list" leaves out descriptions and comments); None or "detail"
+        returns whole tickets.
+        """
+        fields = profile_fields(self.config['jira'], profile)
+        
+        if self.store is None:
+            jql = build_jql(projects, issue_types, statuses, days_back)
+            yield from self._iter_issues(jql, max_results, fields)
+            return
+        
+        # Answer from the local mirror after pulling the delta since last sync;
+        # the mirror always holds whole tickets and is projected on read
+        self.sync(projects or list(self.config.get('jira.projects', ())), days_back)
+        
+        since = None
+        if days_back:
+            since = datetime.combine(
+                (datetime.now() - timedelta(days=days_back)).date(),
+                datetime.min.time()
+            ).timestamp()
+        
+        yield from self.store.search(
+            projects=projects,
+            issue_types=issue_types,
+            statuses=statuses,
+            max_results=max_results,
+            since=since,
+            keys=None if profile in (None, "detail") else ticket_keys(fields)
+        )
     
     def search_tickets(
         self, 
         projects: Optional[List[str]] = None,
         issue_types: Optional[List[str]] = None,
         statuses: Optional[List[str]] = None,
-        max_results: int = 100,
-        days_back: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
-        """Search for JIRA tickets based on criteria"""
-        
-        # Build JQL query
-        jql_parts = []
+        max_results: Optional[int] = 100,
+        days_back: Optional[int] = None,
+        profile: Optional[str] = None
+    ) -> TicketCollection:
+        """Search for JIRA tickets based on criteria, fetching the fields of ``profile``"""
+        return TicketCollection(
+            Ticket.from_dict(ticket)
+            for ticket in self.iter_tickets(projects, issue_types, statuses, max_results, days_back, profile)
+        )
+    
+    def get_statistics(
+        self,
+        projects: Optional[List[str]] = None,
+        days_back: Optional[int] = 30
+    ) -> Dict[str, Any]:
+        """
+        Count tickets updated within the window
         
-        if projects:
-            project_filter = " OR ".join([f"project = {p}" for p in projects])
-            jql_parts.append(f"({project_filter})")
+        With the mirror enabled this sums its daily rollup buckets after
+        pulling the delta, so the cost grows with the number of days rather
+        than the number of tickets. Without it, up to 1000 tickets are
+        fetched from JIRA and counted.
         
-        if issue_types:
-            type_filter = " OR ".join([f"issuetype = '{t}'" for t in issue_types])
-            jql_parts.append(f"({type_filter})")
+        Returns:
+            Total, resolved and per status/priority/project/type counts
+        """
+        if self.store is not None:
+            self.sync(projects or list(self.config.get('jira.projects', ())), days_back)
+            since_day = None
+            if days_back:
+                since_day = (datetime.now() - timedelta(days=days_back)).date().isoformat()
+            return self.store.get_statistics(projects, since_day)
         
-        if statuses:
-            status_filter = " OR ".join([f"status = '{s}'" for s in statuses])
-            jql_parts.append(f"({status_filter})")
+        stats: Dict[str, Any] = {
+            "total_tickets": 0,
+            "resolved_tickets": 0,
+            "by_status": {},
+            "by_priority": {},
+            "by_project": {},
+            "by_type": {}
+        }
         
-        if days_back:
-            date_threshold = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
-            jql_parts.append(f"updated >= '{date_threshold}'")
+        jql = build_jql(projects, None, None, days_back)
+        for ticket in self._iter_issues(jql, 1000, profile_fields(self.config['jira'], "stats")):
+            stats["total_tickets"] += 1
+            if ticket.get("resolution"):
+                stats["resolved_tickets"] += 1
+            for group, value in (
+                ("by_status", ticket.get("status")),
+                ("by_priority", ticket.get("priority")),
+                ("by_project", ticket["key"].split("-")[0]),
+                ("by_type", ticket.get("issue_type"))
+            ):
+                value = value or "Unknown"
+                stats[group][value] = stats[group].get(value, 0) + 1
         
-        jql = " AND ".join(jql_parts) if jql_parts else "project is not EMPTY"
-        jql += " ORDER BY updated DESC"
+        return stats
+    
+    def get_tickets_by_keys(self, keys: List[str]) -> TicketCollection:
+        """
+        Get many tickets in as few JIRA round trips as possible
         
-        # Execute search
-        issues = self.client.search_issues(
-            jql,
-            maxResults=max_results,
-            fields=self.config['jira']['fields']
-        )
+        Keys found in the mirror for a project synced within the sync
+        interval are answered locally. The rest are fetched with
+        ``key in (...)`` JQL in page-sized batches, all batches at once over
+        the shared async client, and written to the mirror.
         
-        # Format results
-        tickets = []
-        for issue in issues:
-            ticket = {
-                "key": issue.key,
-                "summary": issue.fields.summary,
-                "description": getattr(issue.fields, 'description', ''),
-                "status": issue.fields.status.name,
-                "resolution": issue.fields.resolution.name if issue.fields.resolution else None,
-                "created": str(issue.fields.created),
-                "updated": str(issue.fields.updated),
-                "priority": issue.fields.priority.name if issue.fields.priority else None,
-                "assignee": issue.fields.assignee.displayName if issue.fields.assignee else None,
-                "reporter": issue.fields.reporter.displayName if issue.fields.reporter else None,
-                "labels": issue.fields.labels,
-                "url": f"{self.jira_url}/browse/{issue.key}"
-            }
+        Args:
+            keys: JIRA ticket keys (e.g. ['PROD-1', 'TECH-7'])
             
-            # Get comments
-            comments = []
-            if hasattr(issue.fields, 'comment') and issue.fields.comment.comments:
-                for comment in issue.fields.comment.comments:
-                    comments.append({
-                        "author": comment.author.displayName,
-                        "body": comment.body,
-                        "created": str(comment.created)
-                    })
-            ticket["comments"] = comments
+        Returns:
+            Tickets by key, in the order requested; keys that are not valid
+            issue keys, do not exist or are not visible are left out
+        """
+        keys = list(dict.fromkeys(str(key).strip().upper() for key in keys if key))
+        # Keys are written into the JQL as is, so anything else is never looked up
+        keys = [key for key in keys if ISSUE_KEY_PATTERN.match(key)]
+        found: Dict[str, Dict[str, Any]] = {}
+        
+        if self.store is not None:
+            interval = self.config.get('jira.mirror.sync_interval_seconds', 120)
+            now = time.time()
+            fresh_projects = set()
+            for project in {key.split("-")[0] for key in keys}:
+                state = self.store.get_sync_state(project)
+                if state is not None and now - state["last_sync"] < interval:
+                    fresh_projects.add(project)
             
-            tickets.append(ticket)
+            found.update(self.store.get_tickets(
+                [key for key in keys if key.split("-")[0] in fresh_projects]
+            ))
+            TICKET_LOOKUPS.inc(len(found), source="mirror")
+        
+        misses = [key for key in keys if key not in found]
+        batch_size = self.config.get('jira.page_size', 100)
+        batches = [misses[i:i + batch_size] for i in range(0, len(misses), batch_size)]
+        fetched = self._run_async(lambda client: self._lookup_batches(client, batches)) if batches else []
+        
+        TICKET_LOOKUPS.inc(len(fetched), source="jira")
+        TICKET_LOOKUPS.inc(len(misses) - len(fetched), source="missing")
+        if fetched and self.store is not None:
+            self.store.upsert_tickets(fetched)
+        for ticket in fetched:
+            found[ticket["key"]] = ticket
+        
+        return TicketCollection(Ticket.from_dict(found[key]) for key in keys if key in found)
+    
+    @staticmethod
+    async def _lookup_batches(client: AsyncJiraClient, batches: List[List[str]]) -> List[Dict[str, Any]]:
+        """Fetch batches of keys with ``key in (...)`` JQL, all batches at once"""
+        async def lookup(batch: List[str]) -> List[Dict[str, Any]]:
+            try:
+                return [ticket async for ticket in client.iter_issues(f"key in ({', '.join(batch)})")]
+            except Exception:
+                # JQL rejects the whole batch if any key does not exist or is
+                # not visible, so fall back to individual lookups
+                FALLBACKS.inc(path="jira_key_lookup")
+                return [ticket for ticket in await client.get_tickets(batch) if "error" not in ticket]
         
-        return tickets
+        results = await asyncio.gather(*(lookup(batch) for batch in batches))
+        return [ticket for tickets in results for ticket in tickets]
+    
+    def _run_async(self, call: Callable[[AsyncJiraClient], Coroutine[Any, Any, T]]) -> T:
+        """
+        Run a coroutine of the shared AsyncJiraClient and wait for its result
+        
+        The client and its event loop thread are started on first use and
+        live until close(), so requests reuse the pooled keep-alive
+        connections. Safe to call from any thread, including one running
+        its own event loop (e.g. an MCP tool call).
+        """
+        with self._async_lock:
+            if self._async_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name="jira-async", daemon=True).start()
+                
+                async def create() -> AsyncJiraClient:
+                    return AsyncJiraClient(self.jira_url, self.jira_email, self.jira_token)
+                try:
+                    self._async_client = asyncio.run_coroutine_threadsafe(create(), loop).result()
+                except BaseException:
+                    loop.call_soon_threadsafe(loop.stop)
+                    raise
+                self._async_loop = loop
+            loop, client = self._async_loop, self._async_client
+        assert client is not None
+        return asyncio.run_coroutine_threadsafe(call(client), loop).result()
+    
+    def close(self):
+        """Close the async client's connections and the ticket mirror"""
+        with self._async_lock:
+            loop, client = self._async_loop, self._async_client
+            self._async_loop = self._async_client = None
+        if loop is not None and client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5)
+            finally:
+                loop.call_soon_threadsafe(loop.stop)
+        if self.store is not None:
+            self.store.close()
     
     def get_ticket_by_key(self, key: str) -> Dict[str, Any]:
         """Get a specific ticket by its key"""
         try:
-            issue = self.client.issue(key, fields=self.config['jira']['fields'])
-            
-            ticket = {
-                "key": issue.key,
-                "summary": issue.fields.summary,
-                "description": getattr(issue.fields, 'description', ''),
-                "status": issue.fields.status.name,
-                "resolution": issue.fields.resolution.name if issue.fields.resolution else None,
-                "created": str(issue.fields.created),
-                "updated": str(issue.fields.updated),
-                "priority": issue.fields.priority.name if issue.fields.priority else None,
-                "assignee": issue.fields.assignee.displayName if issue.fields.assignee else None,
-                "reporter": issue.fields.reporter.displayName if issue.fields.reporter else None,
-                "labels": issue.fields.labels,
-                "url": f"{self.jira_url}/browse/{issue.key}"
-            }
-            
-            # Get comments
-            comments = []
-            if hasattr(issue.fields, 'comment') and issue.fields.comment.comments:
-                for comment in issue.fields.comment.comments:
-                    comments.append({
-                        "author": comment.author.displayName,
-                        "body": comment.body,
-                        "created": str(comment.created)
-                    })
-            ticket["comments"] = comments
-            
-            return ticket
+            with timed(JIRA_SECONDS, span="jira.issue", operation="issue"):
+                issue = self.client.issue(key, fields=",".join(self.config.get('jira.fields', ())))
+            return format_ticket(issue.raw, self.jira_url)
         except Exception as e:
             return {"error": f"Failed to fetch ticket {key}: {str(e)}"}
 
 
-# Initialize JIRA client
-jira_client = JiraClient()
+# JIRA client, created on the first tool call so that importing this module
+# (or starting the server) neither needs credentials nor connects to JIRA
+_jira_client: Optional[JiraClient] = None
+_jira_client_lock = threading.Lock()
+
+
+def get_jira_client() -> JiraClient:
+    """The shared JIRA client, created on first use"""
+    global _jira_client
+    if _jira_client is None:
+        with _jira_client_lock:
+            if _jira_client is None:
+                _jira_client = JiraClient()
+                app_config.watch()
+    return _jira_client
 
 
 @mcp.tool()
@@ -160,7 +595,8 @@ def search_historical_tickets(
     query: str,
     projects: Optional[List[str]] = None,
     max_results: int = 50,
-    days_back: int = 90
+    days_back: int = 90,
+    field_profile: str = "match"
 ) -> List[Dict[str, Any]]:
     """
     Search for historical JIRA tickets based on query text.
@@ -170,23 +606,27 @@ def search_historical_tickets(
         projects: List of JIRA project keys (e.g., ['PROD', 'TECH'])
         max_results: Maximum number of results to return
         days_back: Number of days to look back
+        field_profile: Fields to return: "list", "match" (adds description) or
+            "detail" (adds comments and people)
     
     Returns:
         List of matching JIRA tickets with details
     """
+    client = get_jira_client()
     if not projects:
-        projects = jira_client.config['jira']['projects']
+        projects = list(client.config.get('jira.projects', ()))
     
-    statuses = jira_client.config['jira']['resolved_statuses']
+    statuses = list(client.config.get('jira.resolved_statuses', ()))
     
-    tickets = jira_client.search_tickets(
+    tickets = client.search_tickets(
         projects=projects,
         statuses=statuses,
         max_results=max_results,
-        days_back=days_back
+        days_back=days_back,
+        profile=field_profile
     )
     
-    return tickets
+    return tickets.to_list()
 
 
 @mcp.tool()
@@ -200,14 +640,35 @@ def get_ticket_details(ticket_key: str) -> Dict[str, Any]:
     Returns:
         Detailed ticket information including comments
     """
-    return jira_client.get_ticket_by_key(ticket_key)
+    return get_jira_client().get_ticket_by_key(ticket_key)
+
+
+@mcp.tool()
+def get_multiple_ticket_details(ticket_keys: List[str]) -> Dict[str, Any]:
+    """
+    Get detailed information about several JIRA tickets in one call.
+    
+    Args:
+        ticket_keys: JIRA ticket keys (e.g., ['PROD-123', 'TECH-45'])
+    
+    Returns:
+        Tickets found (in request order) and the keys that could not be found
+    """
+    client = get_jira_client()
+    tickets = client.get_tickets_by_keys(ticket_keys)
+    
+    return {
+        "tickets": tickets.to_list(),
+        "missing": [key for key in ticket_keys if key.strip().upper() not in tickets]
+    }
 
 
 @mcp.tool()
 def get_recent_resolved_tickets(
     projects: Optional[List[str]] = None,
     max_results: int = 30,
-    days_back: int = 30
+    days_back: int = 30,
+    field_profile: str = "match"
 ) -> List[Dict[str, Any]]:
     """
     Get recently resolved tickets for analysis.
@@ -216,23 +677,27 @@ def get_recent_resolved_tickets(
         projects: List of JIRA project keys
         max_results: Maximum number of results
         days_back: Number of days to look back
+        field_profile: Fields to return: "list", "match" (adds description) or
+            "detail" (adds comments and people)
     
     Returns:
         List of recently resolved tickets
     """
+    client = get_jira_client()
     if not projects:
-        projects = jira_client.config['jira']['projects']
+        projects = list(client.config.get('jira.projects', ()))
     
-    statuses = jira_client.config['jira']['resolved_statuses']
+    statuses = list(client.config.get('jira.resolved_statuses', ()))
     
-    tickets = jira_client.search_tickets(
+    tickets = client.search_tickets(
         projects=projects,
         statuses=statuses,
         max_results=max_results,
-        days_back=days_back
+        days_back=days_back,
+        profile=field_profile
     )
     
-    return tickets
+    return tickets.to_list()
 
 
 @mcp.tool()
@@ -250,45 +715,23 @@ def get_ticket_statistics(
     Returns:
         Statistics about tickets (counts, trends, etc.)
     """
+    client = get_jira_client()
     if not projects:
-        projects = jira_client.config['jira']['projects']
+        projects = list(client.config.get('jira.projects', ()))
     
-    tickets = jira_client.search_tickets(
-        projects=projects,
-        max_results=1000,
-        days_back=days_back
-    )
+    counts = client.get_statistics(projects=projects, days_back=days_back)
     
     stats = {
-        "total_tickets": len(tickets),
-        "by_status": {},
-        "by_priority": {},
-        "by_project": {},
-        "by_type": {},
+        "total_tickets": counts["total_tickets"],
+        "by_status": counts["by_status"],
+        "by_priority": counts["by_priority"],
+        "by_project": counts["by_project"],
+        "by_type": counts["by_type"],
         "resolution_rate": 0
     }
     
-    resolved_count = 0
-    
-    for ticket in tickets:
-        # Count by status
-        status = ticket.get("status", "Unknown")
-        stats["by_status"][status] = stats["by_status"].get(status, 0) + 1
-        
-        # Count by priority
-        priority = ticket.get("priority", "Unknown")
-        stats["by_priority"][priority] = stats["by_priority"].get(priority, 0) + 1
-        
-        # Count by project
-        project = ticket["key"].split("-")[0]
-        stats["by_project"][project] = stats["by_project"].get(project, 0) + 1
-        
-        # Count resolved
-        if ticket.get("resolution"):
-            resolved_count += 1
-    
     if stats["total_tickets"] > 0:
-        stats["resolution_rate"] = round(resolved_count / stats["total_tickets"] * 100, 2)
+        stats["resolution_rate"] = round(counts["resolved_tickets"] / stats["total_tickets"] * 100, 2)
     
     return stats
 
@@ -0,0 +1,31 @@
+"""
+Shared fixtures for the test suite
+Run with: pytest tests/
+"""
+
+import pytest  # type: ignore[import-not-found]
+
+
+@pytest.fixture
+def make_ticket():
+    """Factory building a ticket dict in the JiraClient shape; keyword arguments override or add fields"""
+    def make(key, summary=None, description="", status="Done", updated="2024-05-01T10:00:00.000+0000", **extra):
+        ticket = {
+            "key": key,
+            "summary": f"Summary for {key}" if summary is None else summary,
+            "description": description,
+            "issue_type": "Bug",
+            "status": status,
+            "resolution": None,
+            "created": "2024-04-01T10:00:00.000+0000",
+            "updated": updated,
+            "priority": "Medium",
+            "assignee": None,
+            "reporter": None,
+            "labels": [],
+            "url": f"https://example.atlassian.net/browse/{key}",
+            "comments": []
+        }
+        ticket.update(extra)
+        return ticket
+    return make
@@ -0,0 +1,305 @@
+"""
+Tests for the Flask API endpoints
+Run with: pytest tests/
+"""
+
+import hashlib
+import hmac
+import json
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest  # type: ignore[import-not-found]
+
+api = pytest.importorskip("src.backend.api")
+
+TICKETS = [
+    {"key": f"PROD-{n}", "summary": f"Login fails {n}", "status": "Done", "priority": "High", "url": f"u/{n}"}
+    for n in range(1, 6)
+]
+
+
+class StubAgent:
+    """Answers the agent calls the query endpoints make; queries containing "fail" fail to match"""
+
+    def analyze_query(self, query):
+        return {"intent": "troubleshoot", "keywords": query.split()}
+
+    def retrieve_candidates(self, query, tickets, limit, pad=False):
+        return list(tickets)[:limit]
+
+    def match_tickets(self, query, historical_tickets, top_k):
+        if "fail" in query:
+            raise RuntimeError("LLM unavailable")
+        return [
+            {"ticket_key": t["key"], "similarity_score": 0.9, "ticket_data": t}
+            for t in list(historical_tickets)[:top_k]
+        ]
+
+    def generate_resolution(self, query, matches):
+        return "Restart the service."
+
+    def stream_resolution(self, query, matches):
+        yield "Restart "
+        yield "the service."
+
+    def index_tickets(self, tickets):
+        return len(tickets)
+
+
+class StubJira:
+    """Serves TICKETS as the corpus and as ticket details; ``store`` stands in for the mirror"""
+
+    store = None
+
+    def __init__(self):
+        self.looked_up = []
+
+    def search_tickets(self, **kwargs):
+        return list(TICKETS)
+
+    def get_tickets_by_keys(self, keys):
+        self.looked_up.extend(keys)
+        return api.TicketCollection({**t, "comments": []} for t in TICKETS if t["key"] in keys)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(api, "llm_agent", StubAgent())
+    monkeypatch.setattr(api, "jira_client", StubJira())
+    return api.app.test_client()
+
+
+class TestQuery:
+    """Test /api/query"""
+
+    def test_details_come_from_the_mirror(self, client, monkeypatch):
+        """Test that only matches missing from the mirror are looked up in JIRA, as their own timing"""
+        mirrored = {"PROD-1": {**TICKETS[0], "comments": [{"author": "Ann", "body": "Restarted it"}]}}
+        monkeypatch.setattr(api.jira_client, "store", SimpleNamespace(
+            get_tickets=lambda keys: {key: mirrored[key] for key in keys if key in mirrored}
+        ))
+        body = client.post("/api/query", json={"query": "login broken", "max_results": 2}).get_json()
+        assert [m["ticket_data"]["comments"] for m in body["matched_tickets"]] == [
+            [{"author": "Ann", "body": "Restarted it"}], []
+        ]
+        assert api.jira_client.looked_up == ["PROD-2"]
+        assert "jira.details" in body["timings"]
+
+        body = client.post("/api/query", json={"query": "login broken", "max_results": 1}).get_json()
+        assert api.jira_client.looked_up == ["PROD-2"]
+        assert "jira.details" not in body["timings"]
+
+
+def sse_events(response):
+    """(event, data) pairs of a Server-Sent Events body"""
+    events = []
+    for message in response.get_data(as_text=True).split("\n\n"):
+        if message:
+            event, data = message.split("\n", 1)
+            events.append((event.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+
+class TestQueryStream:
+    """Test /api/query/stream"""
+
+    def test_event_order(self, client):
+        """Test that stage events come first, then resolution tokens, then done"""
+        response = client.post("/api/query/stream", json={"query": "login broken", "max_results": 2})
+        assert response.status_code == 200
+        assert response.mimetype == "text/event-stream"
+
+        events = sse_events(response)
+        names = [name for name, _ in events]
+        assert set(names[:3]) == {"analysis", "candidates", "matches"}
+        assert names[3:] == ["token", "token", "done"]
+
+        data = dict(events)
+        assert [t["key"] for t in data["candidates"]["tickets"]] == ["PROD-1", "PROD-2"]
+        assert [m["ticket_data"]["comments"] for m in data["matches"]["matched_tickets"]] == [[], []]
+        assert data["matches"]["total_historical_tickets"] == 5
+        assert "".join(d["text"] for name, d in events if name == "token") == "Restart the service."
+        assert {"analysis", "fetch", "match", "details", "total"} <= set(data["done"]["timings"])
+        assert "resolution" not in data["done"]["timings"]
+
+    def test_error_event(self, client):
+        """Test that a failing stage ends the stream with an error event"""
+        events = sse_events(client.post("/api/query/stream", json={"query": "fail please"}))
+        names = [name for name, _ in events]
+        assert names[-1] == "error"
+        assert "done" not in names and "token" not in names
+        assert events[-1][1] == {"error": "LLM unavailable"}
+
+    def test_query_required(self, client):
+        """Test that a request without a query is rejected before streaming"""
+        response = client.post("/api/query/stream", json={})
+        assert response.status_code == 400
+
+
+def ndjson_lines(response):
+    """Parsed lines of a newline-delimited JSON body"""
+    body = response.get_data(as_text=True)
+    assert body.endswith("\n")
+    return [json.loads(line) for line in body.splitlines()]
+
+
+class TestQueryBatch:
+    """Test /api/query/batch"""
+
+    def test_ndjson_lines(self, client):
+        """Test one line per query, in any order, then a summary line"""
+        response = client.post("/api/query/batch", json={
+            "queries": ["login broken", {"id": "t-42", "query": "search slow", "max_results": 1}],
+            "max_results": 2
+        })
+        assert response.status_code == 200
+        assert response.mimetype == "application/x-ndjson"
+
+        *lines, summary = ndjson_lines(response)
+        by_index = {line["index"]: line for line in lines}
+        assert sorted(by_index) == [0, 1]
+        assert by_index[0]["id"] == 0 and len(by_index[0]["matched_tickets"]) == 2
+        assert by_index[1]["id"] == "t-42" and len(by_index[1]["matched_tickets"]) == 1
+        assert by_index[1]["resolution"] == "Restart the service."
+        assert summary["done"] is True
+        assert (summary["count"], summary["failed"], summary["total_historical_tickets"]) == (2, 0, 5)
+
+    def test_per_query_errors(self, client):
+        """Test that a failing query gets an error line and the others still complete"""
+        *lines, summary = ndjson_lines(client.post("/api/query/batch", json={
+            "queries": ["login broken", "fail please", "search slow"]
+        }))
+        by_index = {line["index"]: line for line in lines}
+        assert by_index[1] == {"index": 1, "id": 1, "query": "fail please", "error": "LLM unavailable"}
+        assert "resolution" in by_index[0] and "resolution" in by_index[2]
+        assert summary["failed"] == 1
+
+    def test_stages_use_their_own_pool(self, client, monkeypatch):
+        """Test that batch stages never occupy the pipeline workers of single queries"""
+        submitted = []
+        submit = api.pipeline_executor.submit
+        monkeypatch.setattr(
+            api.pipeline_executor, "submit", lambda *args, **kwargs: submitted.append(args) or submit(*args, **kwargs)
+        )
+        ndjson_lines(client.post("/api/query/batch", json={"queries": ["login broken", "search slow"]}))
+        assert submitted == []
+
+    def test_request_validation(self, client, monkeypatch):
+        """Test the size limit and malformed queries"""
+        monkeypatch.setattr(api, "MAX_BATCH_QUERIES", 3)
+        response = client.post("/api/query/batch", json={"queries": ["a", "b", "c", "d"]})
+        assert response.status_code == 400
+        assert "At most 3" in response.get_json()["error"]
+
+        assert client.post("/api/query/batch", json={"queries": []}).status_code == 400
+        assert client.post("/api/query/batch", json={"queries": "login broken"}).status_code == 400
+        response = client.post("/api/query/batch", json={"queries": ["ok", {"id": "x"}]})
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "Query 1 is missing"
+
+
+class TestJiraWebhook:
+    """Test /api/webhooks/jira authentication"""
+
+    BODY = b'{"webhookEvent": "jira:issue_updated", "issue": {"key": "PROD-1", "fields": {}}}'
+
+    @pytest.fixture
+    def submitted(self, client, monkeypatch):
+        payloads = []
+        monkeypatch.setattr(api, "webhook_ingester", SimpleNamespace(
+            submit=lambda payload: payloads.append(payload) or payload["issue"]["key"]
+        ))
+        monkeypatch.setattr(api, "JIRA_WEBHOOK_SECRET", "s3cret")
+        return payloads
+
+    def post(self, client, path="/api/webhooks/jira", **headers):
+        return client.post(path, data=self.BODY, content_type="application/json", headers=headers)
+
+    def test_signed_request_is_accepted(self, client, submitted):
+        """Test that a request signed with the secret is queued"""
+        digest = hmac.new(b"s3cret", self.BODY, hashlib.sha256).hexdigest()
+        response = self.post(client, **{"X-Hub-Signature": f"sha256={digest}"})
+        assert response.status_code == 202
+        assert response.get_json() == {"status": "accepted", "key": "PROD-1"}
+        assert len(submitted) == 1
+
+    def test_secret_in_url_is_rejected(self, client, submitted):
+        """Test that only the signature header authenticates a request"""
+        assert self.post(client, "/api/webhooks/jira?secret=s3cret").status_code == 401
+        assert self.post(client).status_code == 401
+        assert self.post(client, **{"X-Hub-Signature": "sha256=0000"}).status_code == 401
+        assert submitted == []
+
+    def test_disabled_without_secret(self, client, submitted, monkeypatch):
+        """Test that no request is accepted, signed or not, while no secret is configured"""
+        monkeypatch.setattr(api, "JIRA_WEBHOOK_SECRET", "")
+        digest = hmac.new(b"", self.BODY, hashlib.sha256).hexdigest()
+        assert self.post(client).status_code == 404
+        assert self.post(client, **{"X-Hub-Signature": f"sha256={digest}"}).status_code == 404
+        assert submitted == []
+
+
+class TestReadiness:
+    """Test /ready while the components start"""
+
+    @pytest.fixture
+    def components(self, monkeypatch):
+        """Stand-in component modules; the agent waits for ``release`` and the JIRA client raises ``error``"""
+        state = SimpleNamespace(release=threading.Event(), error=None)
+
+        class Agent:
+            def __init__(self):
+                assert state.release.wait(5)
+
+        class Client:
+            store = None
+
+            def __init__(self):
+                if state.error is not None:
+                    raise state.error
+
+        monkeypatch.setitem(sys.modules, "backend.llm_agent", SimpleNamespace(JiraLLMAgent=Agent))
+        monkeypatch.setitem(sys.modules, "backend.sync_scheduler", SimpleNamespace(SyncScheduler=None))
+        monkeypatch.setitem(sys.modules, "mcp_server.jira_mcp_server", SimpleNamespace(JiraClient=Client))
+        monkeypatch.setattr(api.app_config, "watch", lambda: None)
+        for name, value in (("llm_agent", None), ("jira_client", None), ("_init_error", None),
+                            ("_init_failed_at", 0.0), ("_warmup_thread", None)):
+            monkeypatch.setattr(api, name, value)
+        yield state
+        state.release.set()
+        if api._warmup_thread is not None:
+            api._warmup_thread.join(5)
+
+    def wait_for_init(self):
+        api._warmup_thread.join(5)
+        assert not api._warmup_thread.is_alive()
+
+    def test_ready_once_initialized(self, components):
+        """Test 503 while the components start, then 200"""
+        client = api.app.test_client()
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.get_json() == {"status": "starting"}
+
+        components.release.set()
+        self.wait_for_init()
+        response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.get_json() == {"status": "ready"}
+
+    def test_failed_initialization(self, components):
+        """Test that a failed start is reported with its error, not as starting"""
+        components.release.set()
+        components.error = ValueError("JIRA credentials not configured. Check .env file.")
+        client = api.app.test_client()
+        client.get("/ready")
+        self.wait_for_init()
+
+        response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.get_json() == {
+            "status": "failed", "error": "JIRA credentials not configured. Check .env file."
+        }
+        assert client.get("/health").get_json()["jira_client"] is False
@@ -0,0 +1,157 @@
+"""
+Tests for the asynchronous JIRA client
+Run with: pytest tests/
+"""
+
+import asyncio
+
+import pytest  # type: ignore[import-not-found]
+
+httpx = pytest.importorskip("httpx")
+
+from src.backend import async_jira_client  # noqa: E402
+from src.backend.async_jira_client import AsyncJiraClient  # noqa: E402
+from src.backend.config_manager import ConfigSnapshot  # noqa: E402
+
+CONFIG = {
+    "jira": {
+        "fields": ["summary", "status", "updated"],
+        "page_size": 2,
+        "http": {"max_retries": 2, "backoff_seconds": 0}
+    }
+}
+
+
+def raw_issue(key):
+    """Build a raw REST issue"""
+    return {
+        "key": key,
+        "fields": {
+            "summary": f"Summary {key}",
+            "status": {"name": "Done"},
+            "updated": "2024-05-01T10:00:00.000+0000",
+            "comment": {"comments": [{"author": {"displayName": "Ann"}, "body": "Fixed", "created": "x"}]}
+        }
+    }
+
+
+def make_client(handler, cloud=False, **http):
+    config = {"jira": {**CONFIG["jira"], "cloud": cloud, "http": {**CONFIG["jira"]["http"], **http}}}
+    return AsyncJiraClient(
+        "https://example.atlassian.net", "me@example.com", "token",
+        config=config, transport=httpx.MockTransport(handler)
+    )
+
+
+class TestAsyncJiraClient:
+    """Test the async client against a mock transport"""
+
+    def test_offset_pagination(self):
+        """Test that Server/DC searches fetch every page"""
+        keys = [f"PROD-{i}" for i in range(5)]
+
+        def handler(request):
+            start = int(request.url.params["startAt"])
+            size = int(request.url.params["maxResults"])
+            return httpx.Response(200, json={
+                "total": len(keys),
+                "issues": [raw_issue(k) for k in keys[start:start + size]]
+            })
+
+        async def run():
+            async with make_client(handler) as client:
+                return await client.search_tickets(projects=["PROD"], max_results=None)
+
+        tickets = asyncio.run(run())
+        assert [t["key"] for t in tickets] == keys
+        assert tickets[0]["status"] == "Done"
+        assert tickets[0]["comments"][0]["author"] == "Ann"
+        assert tickets[0]["url"] == "https://example.atlassian.net/browse/PROD-0"
+
+    def test_cursor_pagination(self):
+        """Test that Cloud searches follow nextPageToken"""
+        keys = [f"PROD-{i}" for i in range(5)]
+
+        def handler(request):
+            assert request.url.path == "/rest/api/2/search/jql"
+            start = int(request.url.params.get("nextPageToken", 0))
+            end = start + int(request.url.params["maxResults"])
+            body = {"issues": [raw_issue(k) for k in keys[start:end]], "isLast": end >= len(keys)}
+            if end < len(keys):
+                body["nextPageToken"] = str(end)
+            return httpx.Response(200, json=body)
+
+        async def run():
+            async with make_client(handler, cloud=True) as client:
+                return await client.search_tickets(max_results=3)
+
+        assert [t["key"] for t in asyncio.run(run())] == keys[:3]
+
+    def test_retry_on_rate_limit(self):
+        """Test that 429 responses are retried"""
+        attempts = []
+
+        def handler(request):
+            attempts.append(request)
+            if len(attempts) == 1:
+                return httpx.Response(429, headers={"Retry-After": "0"})
+            return httpx.Response(200, json=raw_issue("PROD-1"))
+
+        async def run():
+            async with make_client(handler) as client:
+                return await client.get_ticket_by_key("PROD-1")
+
+        assert asyncio.run(run())["key"] == "PROD-1"
+        assert len(attempts) == 2
+
+    def test_concurrent_lookups_and_errors(self):
+        """Test fan-out lookups keep order and report failures like JiraClient"""
+        def handler(request):
+            key = request.url.path.rsplit("/", 1)[-1]
+            if key == "PROD-404":
+                return httpx.Response(404, json={"errorMessages": ["Issue does not exist"]})
+            return httpx.Response(200, json=raw_issue(key))
+
+        async def run():
+            async with make_client(handler) as client:
+                return await client.get_tickets(["PROD-2", "PROD-404", "PROD-1"])
+
+        tickets = asyncio.run(run())
+        assert [t.get("key") for t in tickets] == ["PROD-2", None, "PROD-1"]
+        assert "error" in tickets[1]
+
+    def test_requests_in_flight_are_bounded(self):
+        """Test that offset pages and lookups never exceed max_connections at once"""
+        keys = [f"PROD-{i}" for i in range(20)]
+        in_flight = []
+        peak = []
+
+        async def handler(request):
+            in_flight.append(request)
+            peak.append(len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(request)
+            if request.url.path.startswith("/rest/api/2/issue/"):
+                return httpx.Response(200, json=raw_issue(request.url.path.rsplit("/", 1)[-1]))
+            start = int(request.url.params["startAt"])
+            size = int(request.url.params["maxResults"])
+            return httpx.Response(200, json={
+                "total": len(keys), "issues": [raw_issue(k) for k in keys[start:start + size]]
+            })
+
+        async def run():
+            async with make_client(handler, max_connections=3) as client:
+                tickets = await client.search_tickets(max_results=None)
+                await client.get_tickets(keys)
+                return tickets
+
+        assert [t["key"] for t in asyncio.run(run())] == keys
+        assert max(peak) == 3
+
+    def test_defaults_to_current_config(self, monkeypatch):
+        """Test that settings come from config.yaml unless a config is passed"""
+        snapshot = ConfigSnapshot({"jira": {"fields": ["summary"], "page_size": 7, "http": {"max_retries": 5}}})
+        monkeypatch.setattr(async_jira_client, "get_config", lambda: snapshot)
+        client = AsyncJiraClient("https://example.atlassian.net", "me@example.com", "token")
+        assert (client.fields, client.page_size, client.max_retries) == (["summary"], 7, 5)
+        asyncio.run(client.aclose())
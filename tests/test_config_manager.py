@@ -0,0 +1,118 @@
+"""
+Tests for the configuration snapshot and hot reload
+Run with: pytest tests/
+"""
+
+import os
+import time
+
+import pytest  # type: ignore[import-not-found]
+import yaml
+from src.backend.config_manager import ConfigManager, ConfigSnapshot
+
+CONFIG = {
+    "jira": {"projects": ["PROD", "TECH"], "fields": ["summary", "status"], "mirror": {"path": "data/tickets.db"}},
+    "llm": {"top_k_results": 5, "cache": {"ttl_seconds": 3600}},
+}
+
+
+def write_config(path, data):
+    with open(path, "w") as f:
+        yaml.safe_dump(data, f)
+    # Make the change visible even on filesystems with coarse mtimes
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def config_path(tmp_path):
+    path = tmp_path / "config.yaml"
+    write_config(path, CONFIG)
+    return str(path)
+
+
+class TestConfigSnapshot:
+    """Test snapshot lookups"""
+
+    def test_dotted_keys(self):
+        """Test that nested values are found by dotted key"""
+        snapshot = ConfigSnapshot(CONFIG)
+        assert snapshot.get("llm.top_k_results") == 5
+        assert snapshot.get("jira.mirror.path") == "data/tickets.db"
+        assert snapshot.get("llm.cache")["ttl_seconds"] == 3600
+        assert snapshot["jira"]["projects"] == ("PROD", "TECH")
+
+    def test_missing_key_default(self):
+        """Test that unknown keys return the default"""
+        snapshot = ConfigSnapshot(CONFIG)
+        assert snapshot.get("llm.candidate_pool_size", 20) == 20
+        assert snapshot.get("llm.top_k_results.extra") is None
+
+    def test_immutable(self):
+        """Test that snapshot sections and lists cannot be modified"""
+        snapshot = ConfigSnapshot(CONFIG)
+        with pytest.raises(TypeError):
+            snapshot["llm"]["top_k_results"] = 10  # type: ignore[index]
+        with pytest.raises(AttributeError):
+            snapshot["jira"]["projects"].append("SUP")
+
+    def test_to_dict_roundtrip(self):
+        """Test that to_dict returns plain, mutable data"""
+        assert ConfigSnapshot(CONFIG).to_dict() == CONFIG
+
+
+class TestConfigManager:
+    """Test reloading config.yaml"""
+
+    def test_reload_on_change(self, config_path):
+        """Test that a changed file replaces the snapshot"""
+        manager = ConfigManager(config_path)
+        before = manager.snapshot
+        assert manager.check_for_changes() is False
+
+        write_config(config_path, {**CONFIG, "llm": {"top_k_results": 8}})
+        assert manager.check_for_changes() is True
+        assert manager.get("llm.top_k_results") == 8
+        assert manager.snapshot.version == before.version + 1
+        # Readers holding the old snapshot still see the old values
+        assert before.get("llm.top_k_results") == 5
+
+    def test_invalid_file_keeps_snapshot(self, config_path):
+        """Test that unparsable or incomplete files are ignored"""
+        manager = ConfigManager(config_path)
+        with open(config_path, "w") as f:
+            f.write("jira: [unclosed\n")
+        assert manager.reload() is False
+
+        write_config(config_path, {"jira": CONFIG["jira"]})
+        assert manager.reload() is False
+        assert manager.get("llm.top_k_results") == 5
+
+    def test_missing_file_keeps_snapshot(self, config_path):
+        """Test that a file removed mid-replace does not reset to defaults"""
+        manager = ConfigManager(config_path)
+        os.remove(config_path)
+        assert manager.check_for_changes() is False
+        assert manager.get("jira.projects") == ("PROD", "TECH")
+
+    def test_watch_picks_up_change(self, config_path):
+        """Test that the watcher thread reloads a changed file"""
+        manager = ConfigManager(config_path)
+        manager.watch(interval=0.02)
+        try:
+            write_config(config_path, {**CONFIG, "llm": {"top_k_results": 3}})
+            deadline = time.monotonic() + 2
+            while manager.get("llm.top_k_results") != 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert manager.get("llm.top_k_results") == 3
+        finally:
+            manager.stop_watching()
+
+    def test_update_and_save(self, config_path):
+        """Test that updates produce a new snapshot and are saved"""
+        manager = ConfigManager(config_path)
+        manager.update({"llm": {"top_k_results": 7}})
+        assert manager.get("llm.top_k_results") == 7
+
+        manager.save()
+        assert ConfigManager(config_path).get("llm.top_k_results") == 7
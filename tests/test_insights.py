@@ -0,0 +1,134 @@
+"""
+Tests for map-reduce insight helpers
+Run with: pytest tests/
+"""
+
+import json
+
+import pytest  # type: ignore[import-not-found]
+from src.backend.insights import chunk_tickets, merge_insights
+
+
+def keys(chunks):
+    return [[t["key"] for t in chunk] for chunk in chunks]
+
+
+class TestChunkTickets:
+    """Test stable chunking of a ticket window"""
+
+    def test_orders_by_project_and_number(self):
+        """Test that chunks follow key order and never mix projects"""
+        tickets = [{"key": k} for k in ["TECH-2", "PROD-10", "PROD-9", "TECH-1"]]
+        assert keys(chunk_tickets(tickets, chunk_size=20)) == [
+            ["PROD-9", "PROD-10"],
+            ["TECH-1", "TECH-2"]
+        ]
+
+    def test_new_ticket_only_changes_its_chunk(self):
+        """Test that boundaries follow key ranges, not positions"""
+        tickets = [{"key": f"PROD-{n}"} for n in range(0, 40)]
+        before = keys(chunk_tickets(tickets, chunk_size=10))
+
+        tickets.append({"key": "PROD-5000"})
+        tickets = [t for t in tickets if t["key"] != "PROD-15"]
+        after = keys(chunk_tickets(tickets, chunk_size=10))
+
+        assert after[0] == before[0]
+        assert after[2:4] == before[2:4]
+        assert after[-1] == ["PROD-5000"]
+
+    def test_expired_tickets_keep_other_chunks(self):
+        """Test that dropping the oldest tickets leaves every other chunk as it was"""
+        tickets = [{"key": f"PROD-{n}"} for n in range(3, 95, 2)]
+        before = keys(chunk_tickets(tickets, chunk_size=10))
+        assert before[:2] == [[f"PROD-{n}" for n in range(3, 20, 2)], [f"PROD-{n}" for n in range(21, 40, 2)]]
+
+        after = keys(chunk_tickets(tickets[7:], chunk_size=10))
+        assert after[0] == ["PROD-17", "PROD-19"]
+        assert after[1:] == before[1:]
+
+    def test_sparse_ranges_are_merged(self):
+        """Test that sparse neighbouring key ranges share a chunk of at most chunk_size tickets"""
+        tickets = [{"key": f"PROD-{n}"} for n in (1, 120, 130, 260, *range(300, 340))]
+        chunks = keys(chunk_tickets(tickets, chunk_size=20))
+        assert chunks == [
+            ["PROD-1", "PROD-120", "PROD-130"],
+            ["PROD-260"],
+            [f"PROD-{n}" for n in range(300, 320)],
+            [f"PROD-{n}" for n in range(320, 340)]
+        ]
+        assert keys(chunk_tickets(tickets, chunk_size=20, merge_levels=0))[:3] == [
+            ["PROD-1"], ["PROD-120", "PROD-130"], ["PROD-260"]
+        ]
+
+        # A new ticket splits only the merged chunk it falls in
+        after = keys(chunk_tickets(tickets + [{"key": f"PROD-{n}"} for n in range(100, 118)], chunk_size=20))
+        assert after[0] == ["PROD-1"]
+        assert after[2:] == chunks[1:]
+
+
+class TestMergeInsights:
+    """Test the local reduce fallback"""
+
+    def test_ranks_by_frequency(self):
+        """Test de-duplication and ranking across partials"""
+        merged = merge_insights([
+            {"common_issues": ["Login timeout", "Slow search"]},
+            {"common_issues": ["login timeout"], "recommendations": ["Add docs"]}
+        ])
+        assert merged["common_issues"] == ["Login timeout", "Slow search"]
+        assert merged["common_resolutions"] == []
+        assert merged["recommendations"] == ["Add docs"]
+
+
+@pytest.fixture
+def agent(request, monkeypatch, tmp_path):
+    fakes = pytest.importorskip("benchmarks.fakes")
+    llm_agent = pytest.importorskip("backend.llm_agent")
+    settings = {"chunk_size": 10, "max_map_calls": 2, "max_concurrency": 2, "reduce_fan_in": 8, "max_reduce_calls": 4}
+    settings.update(getattr(request, "param", {}))
+    snapshot = llm_agent.ConfigSnapshot({"llm": {"insights": settings}, "jira": {}})
+    monkeypatch.setattr(llm_agent, "get_config", lambda: snapshot)
+    llm = fakes.FakeGroq()
+    with fakes.fake_services(str(tmp_path), fakes.FakeJira(tickets=0), llm):
+        yield llm_agent.JiraLLMAgent(), llm
+
+
+class TestExtractKeyInsights:
+    """Test the map-reduce over a ticket window"""
+
+    def test_map_calls_are_capped(self, agent):
+        """Test that a request summarises at most max_map_calls new chunks, newest first"""
+        agent, llm = agent
+        tickets = [{"key": f"PROD-{n}", "summary": f"Issue {n}", "status": "Open"} for n in range(50)]
+
+        first = agent.extract_key_insights(tickets)
+        assert first["coverage"] == {"chunks": 5, "analyzed": 2}
+        assert llm.calls["insights"] == 2
+
+        second = agent.extract_key_insights(tickets)
+        assert second["coverage"] == {"chunks": 5, "analyzed": 4}
+        assert llm.calls["insights"] == 4
+
+        assert agent.extract_key_insights(tickets)["coverage"] == {"chunks": 5, "analyzed": 5}
+        assert llm.calls["insights"] == 5
+
+    @pytest.mark.parametrize("agent", [{"max_map_calls": 100, "reduce_fan_in": 2}], indirect=True)
+    def test_reduce_is_cached_and_capped(self, agent, monkeypatch):
+        """Test that merged groups are reused and that at most max_reduce_calls merges use the LLM"""
+        agent, llm = agent
+        # A distinct reply per prompt, so that no two reduce prompts coincide
+        monkeypatch.setattr(type(llm), "_reply", lambda self, kind, prompt: json.dumps({"common_issues": [prompt]}))
+        tickets = [{"key": f"PROD-{n}", "summary": f"Issue {n}", "status": "Open"} for n in range(80)]
+
+        first = agent.extract_key_insights(tickets)
+        assert first["coverage"] == {"chunks": 8, "analyzed": 8}
+        # 8 partials take 4 + 2 + 1 merges; the last 3 are merged locally
+        assert llm.calls["insights_reduce"] == 4
+
+        agent.extract_key_insights(tickets)
+        assert llm.calls["insights_reduce"] == 7
+
+        agent.extract_key_insights(tickets)
+        assert llm.calls["insights_reduce"] == 7
+        assert llm.calls["insights"] == 8
@@ -0,0 +1,260 @@
+"""
+Tests for the JIRA client wrapper of the MCP server
+Run with: pytest tests/
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest  # type: ignore[import-not-found]
+
+jira_mcp_server = pytest.importorskip("src.mcp_server.jira_mcp_server")
+
+from benchmarks.fakes import FakeJira  # noqa: E402
+from jira.exceptions import JIRAError  # noqa: E402
+
+FIELDS = ["summary", "description", "issuetype", "status", "resolution", "created", "updated", "priority", "labels"]
+
+
+@pytest.fixture
+def jira():
+    return FakeJira(tickets=60, projects=("PROD", "TECH"))
+
+
+@pytest.fixture
+def configure(monkeypatch, tmp_path):
+    def apply(**jira_settings):
+        mirror = {
+            "enabled": True, "path": str(tmp_path / "tickets.db"),
+            "sync_interval_seconds": 120, "backfill_days": 365, "overlap_minutes": 2
+        }
+        mirror.update(jira_settings.pop("mirror", {}))
+        settings = {"projects": ["PROD", "TECH"], "fields": FIELDS, "page_size": 10, "max_workers": 3, "mirror": mirror}
+        settings.update(jira_settings)
+        snapshot = jira_mcp_server.ConfigSnapshot({"jira": settings, "llm": {}})
+        monkeypatch.setattr(jira_mcp_server, "get_config", lambda: snapshot)
+    apply()
+    return apply
+
+
+@pytest.fixture
+def make_client(monkeypatch, configure, jira):
+    monkeypatch.setenv("JIRA_URL", "https://jira.example.com")
+    monkeypatch.setenv("JIRA_EMAIL", "me@example.com")
+    monkeypatch.setenv("JIRA_API_TOKEN", "token")
+    clients = []
+    async_client = jira_mcp_server.AsyncJiraClient
+
+    def make(fake=None):
+        fake = fake or jira
+
+        class FakeAsyncJiraClient(async_client):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, transport=fake.transport(), **kwargs)
+        monkeypatch.setattr(jira_mcp_server, "JIRA", fake)
+        monkeypatch.setattr(jira_mcp_server, "AsyncJiraClient", FakeAsyncJiraClient)
+        clients.append(jira_mcp_server.JiraClient())
+        return clients[-1]
+    yield make
+    for client in clients:
+        client.close()
+
+
+def page_keys(pages):
+    return [[issue["key"] for issue in page["issues"]] for page in pages]
+
+
+class TestPagination:
+    """Test fetching search results page by page"""
+
+    JQL = "project = PROD ORDER BY updated DESC"
+
+    @pytest.mark.parametrize("cloud", [False, True])
+    def test_pages_in_order(self, make_client, cloud):
+        """Test that pages come back in result order and stop after the last page"""
+        jira = FakeJira(tickets=60, projects=("PROD", "TECH"), latency_ms=1, jitter_ms=5, cloud=cloud)
+        client = make_client(jira)
+        expected = [issue["key"] for issue in jira._matching(self.JQL)]
+
+        iter_pages = client._iter_cursor_pages if cloud else client._iter_offset_pages
+        pages = page_keys(iter_pages(self.JQL, None))
+        assert [len(page) for page in pages] == [10, 10, 10]
+        assert sum(pages, []) == expected
+        assert jira.calls["search"] == 3
+        assert [ticket["key"] for ticket in client._iter_issues(self.JQL)] == expected
+
+    @pytest.mark.parametrize("cloud", [False, True])
+    def test_max_results_shortens_last_page(self, make_client, cloud):
+        """Test that no more than max_results issues are requested"""
+        jira = FakeJira(tickets=60, projects=("PROD", "TECH"), cloud=cloud)
+        client = make_client(jira)
+
+        iter_pages = client._iter_cursor_pages if cloud else client._iter_offset_pages
+        assert [len(page) for page in page_keys(iter_pages(self.JQL, 25))] == [10, 10, 5]
+        assert jira.calls["search"] == 3
+        assert len(list(client._iter_issues(self.JQL, max_results=25))) == 25
+
+    def test_single_page(self, make_client, jira):
+        """Test that a result fitting the first page makes one request"""
+        client = make_client()
+        pages = page_keys(client._iter_offset_pages("key in (PROD-1, PROD-2)", None))
+        assert len(pages) == 1 and sorted(pages[0]) == ["PROD-1", "PROD-2"]
+        assert jira.calls["search"] == 1
+        assert page_keys(client._iter_offset_pages("key in (PROD-404)", None)) == [[]]
+
+    @pytest.mark.parametrize("cloud", [False, True])
+    def test_failed_page_raises(self, make_client, monkeypatch, cloud):
+        """Test that a page failing part way through is raised, not skipped"""
+        jira = FakeJira(tickets=60, projects=("PROD", "TECH"), cloud=cloud)
+        client = make_client(jira)
+        fetch_page = client._fetch_page
+
+        def failing(jql, max_results, start_at=0, page_token=None, fields=None):
+            if (page_token or start_at) and int(page_token or start_at) >= 20:
+                raise JIRAError("Service unavailable", status_code=503)
+            return fetch_page(jql, max_results, start_at, page_token, fields)
+        monkeypatch.setattr(client, "_fetch_page", failing)
+
+        iter_pages = client._iter_cursor_pages if cloud else client._iter_offset_pages
+        pages = iter_pages(self.JQL, None)
+        assert len(next(pages)["issues"]) == 10
+        assert len(next(pages)["issues"]) == 10
+        with pytest.raises(JIRAError):
+            next(pages)
+
+
+class TestMirrorSync:
+    """Test syncing projects into the local mirror"""
+
+    def test_sync_locks_are_per_project(self, make_client, configure, jira):
+        """Test that a sync in progress holds up neither other projects nor requests"""
+        client = make_client()
+        assert client.sync(["PROD", "TECH"]) == 60
+        configure(mirror={"sync_interval_seconds": 0})
+
+        lock = client._sync_locks["PROD"]
+        lock.acquire()
+        try:
+            assert client.sync_project("TECH") is not None
+            searches = jira.calls["search"]
+            # The request path serves the mirror instead of waiting for the sync
+            assert client.sync(["PROD"]) == 0
+            assert client.sync_project("PROD", blocking=False) is None
+            assert jira.calls["search"] == searches
+        finally:
+            lock.release()
+
+        assert client.sync_project("PROD") is not None
+        assert jira.calls["search"] > searches
+
+
+class TestGetTicketsByKeys:
+    """Test batched ticket lookups"""
+
+    def test_mirror_hits_and_misses(self, make_client, jira):
+        """Test that only keys of freshly synced projects are answered from the mirror"""
+        client = make_client()
+        client.sync(["PROD"])
+        searches = jira.calls["search"]
+
+        tickets = client.get_tickets_by_keys(["PROD-1", "PROD-2", "TECH-1"])
+        assert list(tickets.keys()) == ["PROD-1", "PROD-2", "TECH-1"]
+        assert jira.calls["search"] == searches + 1
+        # Fetched tickets are written to the mirror
+        assert "TECH-1" in client.store.get_tickets(["TECH-1"])
+
+    def test_misses_are_fetched_in_batches(self, make_client, jira):
+        """Test that misses are fetched page_size keys per request, in the order requested"""
+        client = make_client()
+        keys = [f"TECH-{i}" for i in range(25, 0, -1)]
+        tickets = client.get_tickets_by_keys(keys + ["TECH-404"])
+        assert list(tickets.keys()) == keys
+        assert jira.calls["search"] == 3
+        assert jira.calls["issue"] == 0
+
+    def test_invalid_keys_never_reach_jql(self, make_client, jira, monkeypatch):
+        """Test that keys which are not issue keys are dropped before building JQL"""
+        client = make_client()
+        queries = []
+        offset_page = jira._offset_page
+        monkeypatch.setattr(
+            jira, "_offset_page", lambda jql, *args: queries.append(jql) or offset_page(jql, *args)
+        )
+
+        tickets = client.get_tickets_by_keys([
+            "PROD-1) OR project = TECH OR key in (PROD-2", "prod-3 ", "PROD", "1-PROD", "", None, 4
+        ])
+        assert list(tickets.keys()) == ["PROD-3"]
+        assert queries and all("PROD-3" in jql and " OR " not in jql for jql in queries)
+        assert len(client.get_tickets_by_keys(["PROD-1 OR key = PROD-2"])) == 0
+
+    @pytest.mark.parametrize("in_event_loop", [False, True])
+    def test_failed_batch_falls_back_to_single_lookups(self, make_client, jira, monkeypatch, in_event_loop):
+        """Test that a rejected key-in batch is looked up key by key"""
+        client = make_client()
+
+        def rejected(jql, *args):
+            raise JIRAError("An issue with key 'PROD-404' does not exist", status_code=400)
+        monkeypatch.setattr(jira, "_offset_page", rejected)
+
+        keys = ["PROD-2", "PROD-404", "PROD-1"]
+        if in_event_loop:
+            async def lookup():
+                return client.get_tickets_by_keys(keys)
+            tickets = asyncio.run(lookup())
+        else:
+            tickets = client.get_tickets_by_keys(keys)
+
+        assert list(tickets.keys()) == ["PROD-2", "PROD-1"]
+        assert tickets["PROD-1"]["status"] == jira.by_key["PROD-1"]["fields"]["status"]["name"]
+        assert jira.calls["issue"] == 3
+
+    def test_batches_share_one_async_client(self, make_client, monkeypatch):
+        """Test that lookups reuse one long-lived async client and send their batches together"""
+        jira = FakeJira(tickets=60, projects=("PROD", "TECH"), latency_ms=100)
+        client = make_client(jira)
+        created = []
+        async_client = jira_mcp_server.AsyncJiraClient
+        monkeypatch.setattr(
+            jira_mcp_server, "AsyncJiraClient", lambda *args: created.append(1) or async_client(*args)
+        )
+
+        started = time.perf_counter()
+        assert len(client.get_tickets_by_keys([f"PROD-{i}" for i in range(1, 31)])) == 30
+        # Three batches of page_size keys, in flight at the same time
+        assert time.perf_counter() - started < 0.25
+        assert len(client.get_tickets_by_keys(["TECH-1", "TECH-2"])) == 2
+        assert created == [1]
+        assert jira.calls["search"] == 4
+
+
+class TestPayloadMetrics:
+    """Test measuring JIRA response sizes"""
+
+    def response(self, url, body, **headers):
+        requests = pytest.importorskip("requests")
+        response = requests.Response()
+        response.url = url
+        response._content = body
+        response.headers.update(headers)
+        return response
+
+    def test_sizes_come_from_the_response(self, make_client, monkeypatch):
+        """Test that search and issue bodies are measured without serialising them again"""
+        jira = FakeJira(tickets=10)
+        jira._session = pytest.importorskip("requests").Session()
+        make_client(jira)
+        assert jira_mcp_server.observe_payload in jira._session.hooks["response"]
+
+        observed = []
+        monkeypatch.setattr(jira_mcp_server, "JIRA_PAYLOAD_BYTES", SimpleNamespace(
+            observe=lambda size, operation: observed.append((operation, size))
+        ))
+        base = "https://jira.example.com/rest/api/2"
+        jira_mcp_server.observe_payload(self.response(f"{base}/search?jql=x", b'{"issues": []}'))
+        jira_mcp_server.observe_payload(
+            self.response(f"{base}/issue/PROD-1", b"{}" * 50, **{"Content-Length": "35"})
+        )
+        jira_mcp_server.observe_payload(self.response(f"{base}/serverInfo", b"{}"))
+        assert observed == [("search", 14), ("issue", 35)]
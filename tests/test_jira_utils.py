@@ -0,0 +1,51 @@
+"""
+Tests for JIRA helpers shared by the JIRA clients
+Run with: pytest tests/
+"""
+
+import pytest  # type: ignore[import-not-found]
+from src.backend.jira_utils import format_ticket, profile_fields, ticket_keys
+
+JIRA_CONFIG = {
+    "fields": ["summary", "description", "status", "comment"],
+    "field_profiles": {"list": ["summary", "status"]}
+}
+
+RAW_ISSUE = {
+    "key": "PROD-1",
+    "fields": {
+        "summary": "Login fails",
+        "description": "Users cannot log in",
+        "status": {"name": "Done"},
+        "comment": {"comments": [{"author": {"displayName": "Jane"}, "body": "Fixed", "created": "2024-05-02"}]}
+    }
+}
+
+
+class TestFieldProfiles:
+    """Test field profile resolution and projection"""
+
+    def test_profile_fields(self):
+        """Test named profiles and the detail default"""
+        assert profile_fields(JIRA_CONFIG, "list") == ["summary", "status"]
+        assert profile_fields(JIRA_CONFIG) == JIRA_CONFIG["fields"]
+        assert profile_fields(JIRA_CONFIG, "detail") == JIRA_CONFIG["fields"]
+        with pytest.raises(ValueError):
+            profile_fields(JIRA_CONFIG, "unknown")
+
+    def test_ticket_keys(self):
+        """Test mapping JIRA fields to ticket dict keys"""
+        assert ticket_keys(["issuetype", "comment"]) == ["key", "url", "issue_type", "comments"]
+
+    def test_format_ticket_projection(self):
+        """Test that only requested fields are returned"""
+        ticket = format_ticket(RAW_ISSUE, "https://example.atlassian.net", ["summary", "status"])
+        assert ticket == {
+            "key": "PROD-1",
+            "url": "https://example.atlassian.net/browse/PROD-1",
+            "summary": "Login fails",
+            "status": "Done"
+        }
+
+        full = format_ticket(RAW_ISSUE, "https://example.atlassian.net")
+        assert full["comments"] == [{"author": "Jane", "body": "Fixed", "created": "2024-05-02"}]
@@ -0,0 +1,85 @@
+"""
+Tests for candidate retrieval and keyword matching in the LLM agent
+Run with: pytest tests/
+"""
+
+import pytest  # type: ignore[import-not-found]
+
+SUMMARIES = [
+    "Dashboard loads slowly",
+    "Login timeout after password reset",
+    "Export to CSV drops columns",
+    "Login page shows blank screen",
+    "Search results missing archived tickets",
+    "Timeout on login with SSO, login retried",
+    "Email notifications delayed"
+]
+
+
+def corpus():
+    """Tickets newest first, as the mirror returns them"""
+    return [
+        {"key": f"PROD-{len(SUMMARIES) - i}", "summary": summary, "status": "Done",
+         "resolution": "Fixed" if i % 2 else None, "updated": f"2024-05-0{7 - i}T10:00:00.000+0000"}
+        for i, summary in enumerate(SUMMARIES)
+    ]
+
+
+@pytest.fixture
+def agent(monkeypatch, tmp_path):
+    fakes = pytest.importorskip("benchmarks.fakes")
+    llm_agent = pytest.importorskip("backend.llm_agent")
+    snapshot = llm_agent.ConfigSnapshot({"llm": {"candidate_pool_size": 3}, "jira": {}})
+    monkeypatch.setattr(llm_agent, "get_config", lambda: snapshot)
+    llm = fakes.FakeGroq(failure_rate=1.0)
+    with fakes.fake_services(str(tmp_path), fakes.FakeJira(tickets=0), llm):
+        yield llm_agent.JiraLLMAgent()
+
+
+def keys(tickets):
+    return [ticket["key"] for ticket in tickets]
+
+
+class TestRetrieveCandidates:
+    """Test local ranking before the matching prompt"""
+
+    def test_best_matches_first(self, agent):
+        """Test that BM25 matches are ranked by relevance, not recency"""
+        candidates = agent.retrieve_candidates("login timeout", corpus(), limit=3, pad=False)
+        assert keys(candidates) == ["PROD-2", "PROD-6", "PROD-4"]
+
+    def test_padded_with_newest_tickets(self, agent):
+        """Test that too few matches are topped up with the newest other tickets, without duplicates"""
+        candidates = agent.retrieve_candidates("csv export", corpus(), limit=4)
+        assert keys(candidates) == ["PROD-5", "PROD-7", "PROD-6", "PROD-4"]
+        assert len(set(keys(candidates))) == 4
+
+        assert keys(agent.retrieve_candidates("csv export", corpus(), limit=4, pad=False)) == ["PROD-5"]
+
+    def test_duplicate_tickets_are_collapsed(self, agent):
+        """Test that a ticket listed twice in the corpus is a single candidate"""
+        tickets = corpus()
+        candidates = agent.retrieve_candidates("login", tickets + tickets[:3], limit=5)
+        assert len(set(keys(candidates))) == len(candidates) == 5
+
+    def test_small_corpus_is_returned_as_is(self, agent):
+        """Test that a corpus within the limit skips ranking"""
+        tickets = corpus()[:3]
+        assert keys(agent.retrieve_candidates("login", tickets)) == ["PROD-7", "PROD-6", "PROD-5"]
+
+
+class TestKeywordFallback:
+    """Test matching when the LLM cannot be used"""
+
+    def test_failed_llm_falls_back_to_keywords(self, agent):
+        """Test that a failed matching call still returns BM25 matches with their tickets"""
+        matches = agent.match_tickets("login timeout", corpus(), top_k=2)
+        assert [m["ticket_key"] for m in matches] == ["PROD-2", "PROD-6"]
+        assert all(m["reasoning"] == "Keyword match" for m in matches)
+        assert matches[0]["ticket_data"]["summary"] == "Timeout on login with SSO, login retried"
+        assert all(m["has_solution"] and m["solution_summary"] == "Fixed" for m in matches)
+        assert all(0 < m["relevance_score"] <= 10 for m in matches)
+
+    def test_no_keyword_matches(self, agent):
+        """Test that a query sharing no terms with the corpus matches nothing"""
+        assert agent.match_tickets("kubernetes", corpus(), top_k=3) == []
@@ -0,0 +1,123 @@
+"""
+Tests for the LLM dispatcher (coalescing, rate limits, priorities)
+Run with: pytest tests/
+"""
+
+import threading
+import time
+
+import pytest
+
+from src.backend.llm_dispatch import BACKGROUND, INTERACTIVE, LLMDispatcher, TokenBucket
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+
+class TestTokenBucket:
+    """Test the refilling budget"""
+
+    def test_waits_for_refill(self):
+        """Test that an empty bucket reports the time to refill"""
+        bucket = TokenBucket(per_minute=60)
+        now = time.monotonic()
+        assert bucket.wait_time(60, now) == 0.0
+        bucket.consume(60)
+        assert bucket.wait_time(30, now) == pytest.approx(30.0, abs=0.1)
+
+    def test_oversized_request_waits_for_full_bucket(self):
+        """Test that a request larger than the bucket is not starved forever"""
+        bucket = TokenBucket(per_minute=60)
+        assert bucket.wait_time(1000) == 0.0
+
+
+class TestLLMDispatcher:
+    """Test request dispatch"""
+
+    def test_coalesces_identical_calls(self):
+        """Test that concurrent calls with one key send one request"""
+        dispatcher = LLMDispatcher()
+        release = threading.Event()
+        calls = []
+
+        def send():
+            calls.append(1)
+            release.wait(5)
+            return "answer"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(dispatcher.call(send, key="prompt")))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert calls == [1]
+        assert results == ["answer"] * 5
+        assert dispatcher.coalesced == 4
+
+    def test_interactive_overtakes_background(self):
+        """Test that queued interactive calls are admitted before background ones"""
+        dispatcher = LLMDispatcher(requests_per_minute=600)
+        dispatcher.requests.consume(dispatcher.requests.level)
+        order = []
+
+        def submit(name, priority):
+            dispatcher.call(lambda: order.append(name), priority=priority)
+
+        background = [threading.Thread(target=submit, args=(f"bg{i}", BACKGROUND)) for i in range(2)]
+        for thread in background:
+            thread.start()
+        time.sleep(0.02)
+        interactive = threading.Thread(target=submit, args=("query", INTERACTIVE))
+        interactive.start()
+        for thread in background + [interactive]:
+            thread.join()
+
+        assert order[0] == "query"
+
+    def test_retries_rate_limited_calls(self):
+        """Test that a 429 is retried instead of raised"""
+        dispatcher = LLMDispatcher(max_retries=2, backoff_seconds=0.01)
+        attempts = []
+
+        def send():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise RateLimitError("slow down")
+            return "ok"
+
+        assert dispatcher.call(send) == "ok"
+        assert dispatcher.retries == 1
+
+    def test_rate_limited_attempts_return_their_tokens(self):
+        """Test that only the attempt that went through keeps its token reservation"""
+        dispatcher = LLMDispatcher(tokens_per_minute=6000, max_retries=3, backoff_seconds=0.01)
+        attempts = []
+
+        def send():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise RateLimitError("slow down")
+            return "ok"
+
+        assert dispatcher.call(send, tokens=1000) == "ok"
+        assert dispatcher.retries == 2
+        assert dispatcher.tokens.level == pytest.approx(5000, abs=50)
+
+    def test_other_errors_propagate(self):
+        """Test that non rate-limit errors are not retried"""
+        dispatcher = LLMDispatcher()
+
+        def send():
+            raise ValueError("bad prompt")
+
+        with pytest.raises(ValueError):
+            dispatcher.call(send, key="prompt")
+        assert dispatcher.retries == 0
@@ -0,0 +1,104 @@
+"""
+Tests for the metrics registry and request tracing
+Run with: pytest tests/
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore[import-not-found]
+from src.backend.metrics import MetricsRegistry, record_span, timed, trace
+from src.backend.pipeline import Pipeline
+
+
+@pytest.fixture
+def registry():
+    return MetricsRegistry()
+
+
+class TestRegistry:
+    """Test metric recording and rendering"""
+
+    def test_counter_renders_total(self, registry):
+        """Test that counters add up per label set and render with a _total suffix"""
+        counter = registry.counter("app_fallbacks", "Fallbacks", ["path"])
+        counter.inc(path="analysis")
+        counter.inc(2, path="analysis")
+        counter.inc(path="resolution")
+
+        text = registry.render()
+        assert "# TYPE app_fallbacks counter" in text
+        assert 'app_fallbacks_total{path="analysis"} 3' in text
+        assert 'app_fallbacks_total{path="resolution"} 1' in text
+
+    def test_histogram_buckets_are_cumulative(self, registry):
+        """Test that histogram buckets count every observation at or below the bound"""
+        histogram = registry.histogram("app_seconds", "Latency", ["stage"], buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value, stage="match")
+
+        text = registry.render()
+        assert 'app_seconds_bucket{stage="match",le="0.1"} 1' in text
+        assert 'app_seconds_bucket{stage="match",le="1"} 3' in text
+        assert 'app_seconds_bucket{stage="match",le="+Inf"} 4' in text
+        assert 'app_seconds_sum{stage="match"} 4.25' in text
+        assert histogram.count(stage="match") == 4
+
+    def test_labels_must_match(self, registry):
+        """Test that recording with the wrong labels raises"""
+        counter = registry.counter("app_lookups", "Lookups", ["source"])
+        with pytest.raises(ValueError):
+            counter.inc(origin="mirror")
+
+    def test_registering_twice_returns_same_metric(self, registry):
+        """Test that modules re-registering a metric share it"""
+        first = registry.counter("app_calls", "Calls")
+        second = registry.counter("app_calls", "Calls")
+        assert first is second
+
+    def test_gauge_callback_read_at_render(self, registry):
+        """Test that callback gauges reflect the value at render time"""
+        state = {"hits": 1}
+        registry.gauge_callback("app_cache", "Cache hits", ["cache"], lambda: [(("response",), state["hits"])])
+        state["hits"] = 7
+        assert 'app_cache{cache="response"} 7' in registry.render()
+
+    def test_label_values_escaped(self, registry):
+        """Test that quotes in label values are escaped"""
+        counter = registry.counter("app_requests", "Requests", ["endpoint"])
+        counter.inc(endpoint='/a"b')
+        assert 'app_requests_total{endpoint="/a\\"b"} 1' in registry.render()
+
+
+class TestTrace:
+    """Test per-request span collection"""
+
+    def test_spans_summed_by_name(self, registry):
+        """Test that repeated spans accumulate milliseconds"""
+        histogram = registry.histogram("app_llm_seconds", "LLM latency", ["prompt"])
+        with trace() as spans:
+            record_span("llm.analysis", 0.010)
+            record_span("llm.analysis", 0.005)
+            with timed(histogram, span="llm.matching", prompt="matching"):
+                pass
+
+        assert spans["llm.analysis"] == pytest.approx(15.0)
+        assert "llm.matching" in spans
+        assert histogram.count(prompt="matching") == 1
+
+    def test_no_trace_is_noop(self):
+        """Test that spans outside a trace are dropped"""
+        record_span("llm.analysis", 0.010)
+
+    def test_pipeline_stages_share_trace(self):
+        """Test that spans recorded in pipeline stages reach the request's trace"""
+        observed = []
+        with ThreadPoolExecutor(max_workers=2) as executor, trace() as spans:
+            pipeline = Pipeline(executor, on_stage=lambda name, seconds: observed.append(name))
+            pipeline.add("fetch", lambda: record_span("jira.search", 0.002))
+            pipeline.add("match", lambda fetch: record_span("llm.matching", 0.003), depends_on=["fetch"])
+            pipeline.start()
+            pipeline.result("match")
+
+        assert set(spans) == {"jira.search", "llm.matching"}
+        assert sorted(observed) == ["fetch", "match"]
+        assert set(pipeline.timings) >= {"fetch", "match"}
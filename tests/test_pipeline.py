@@ -0,0 +1,80 @@
+"""
+Tests for the concurrent query pipeline
+Run with: pytest tests/
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore[import-not-found]
+from src.backend.pipeline import Pipeline
+
+
+@pytest.fixture
+def executor():
+    pool = ThreadPoolExecutor(max_workers=4)
+    yield pool
+    pool.shutdown(wait=True)
+
+
+class TestPipeline:
+    """Test stage scheduling"""
+
+    def test_dependencies_receive_results(self, executor):
+        """Test that stages get their dependencies' results in order"""
+        pipeline = Pipeline(executor)
+        pipeline.add("a", lambda: 2)
+        pipeline.add("b", lambda: 3)
+        pipeline.add("c", lambda a, b: a * 10 + b, depends_on=["a", "b"])
+
+        results = pipeline.run()
+        assert results == {"a": 2, "b": 3, "c": 23}
+        assert set(pipeline.timings) == {"a", "b", "c", "total"}
+
+    def test_independent_stages_overlap(self, executor):
+        """Test that independent stages run concurrently"""
+        barrier = threading.Barrier(2, timeout=2)
+        pipeline = Pipeline(executor)
+        pipeline.add("left", barrier.wait)
+        pipeline.add("right", barrier.wait)
+
+        started = time.perf_counter()
+        pipeline.run(timeout=5)
+        assert time.perf_counter() - started < 2
+
+    def test_errors_propagate_to_dependents(self, executor):
+        """Test that a failing stage fails the stages depending on it"""
+        def fail():
+            raise RuntimeError("jira down")
+
+        pipeline = Pipeline(executor)
+        pipeline.add("fetch", fail)
+        pipeline.add("match", lambda tickets: tickets, depends_on=["fetch"])
+        pipeline.start()
+
+        with pytest.raises(RuntimeError, match="jira down"):
+            pipeline.result("match", timeout=5)
+
+    def test_unknown_dependency(self, executor):
+        """Test that dependencies must be registered first"""
+        pipeline = Pipeline(executor)
+        with pytest.raises(ValueError):
+            pipeline.add("match", lambda tickets: tickets, depends_on=["fetch"])
+
+    def test_rejected_submit_fails_the_stage(self, executor):
+        """Test that run() raises instead of hanging when the executor refuses a stage"""
+        release = threading.Event()
+        pipeline = Pipeline(executor)
+        pipeline.add("fetch", release.wait)
+        pipeline.add("match", lambda fetched: fetched, depends_on=["fetch"])
+        pipeline.start()
+
+        # The dependent stage is submitted only after the pool has shut down
+        executor.shutdown(wait=False)
+        release.set()
+        with pytest.raises(RuntimeError, match="shutdown"):
+            pipeline.run(timeout=5)
+
+        with pytest.raises(RuntimeError, match="shutdown"):
+            Pipeline(executor).add("fetch", lambda: 1).run(timeout=5)
@@ -0,0 +1,56 @@
+"""
+Tests for token-budgeted prompt packing
+Run with: pytest tests/
+"""
+
+from src.backend.prompt_budget import PromptPacker, TokenCounter
+
+
+class TestTokenCounter:
+    """Test token counting and truncation"""
+
+    def test_count(self):
+        """Test that longer text costs more tokens"""
+        counter = TokenCounter("llama-3.1-70b-versatile")
+        assert counter.count("") == 0
+        assert counter.count(None) == 0
+        assert 0 < counter.count("short text") < counter.count("short text " * 20)
+
+    def test_truncate(self):
+        """Test truncating to a token limit"""
+        counter = TokenCounter()
+        text = "database connection pool exhausted " * 50
+        truncated = counter.truncate(text, 20)
+        assert truncated.endswith("...")
+        assert counter.count(truncated) <= 20 + counter.count("...")
+        assert counter.truncate("short", 20) == "short"
+        assert counter.truncate("short", 0) == ""
+
+
+class TestPromptPacker:
+    """Test greedy budget filling"""
+
+    def test_stops_at_budget(self):
+        """Test that blocks are added until the budget is used"""
+        counter = TokenCounter()
+        packer = PromptPacker(counter, budget=counter.count("block\n") * 3)
+        for _ in range(5):
+            packer.add("block\n")
+        assert len(packer) == 3
+        assert packer.text() == "block\n" * 3
+        assert packer.remaining == 0
+
+    def test_optional_parts_skipped_when_too_large(self):
+        """Test that required parts win over optional detail"""
+        counter = TokenCounter()
+        packer = PromptPacker(counter, budget=counter.count("a\n") * 2 + 1)
+        assert packer.add("a\n", ["x" * 400, "b\n"])
+        assert packer.text() == "a\nb\n"
+
+    def test_skips_blocks_that_do_not_fit(self):
+        """Test that a smaller, later block can use leftover budget"""
+        counter = TokenCounter()
+        packer = PromptPacker(counter, budget=10)
+        assert not packer.add("y" * 400)
+        assert packer.add("small\n")
+        assert len(packer) == 1
@@ -0,0 +1,76 @@
+"""
+Tests for the LLM response cache
+Run with: pytest tests/
+"""
+
+from src.backend.response_cache import ResponseCache, corpus_fingerprint, normalize_query
+
+
+class TestResponseCache:
+    """Test caching, near-duplicate lookup and eviction"""
+
+    def test_normalized_exact_hit(self):
+        """Test that whitespace and case do not affect the key"""
+        cache = ResponseCache()
+        cache.set("analysis", "Authentication errors in the API", {"priority": "high"})
+        assert cache.get("analysis", "  authentication   errors in the api ") == {"priority": "high"}
+        assert cache.hits == 1
+
+    def test_near_duplicate_hit(self):
+        """Test that similar queries share an entry above the threshold"""
+        cache = ResponseCache(similarity_threshold=0.6)
+        cache.set("analysis", "authentication errors in the API", "cached")
+        assert cache.get("analysis", "API authentication errors") == "cached"
+        assert cache.near_hits == 1
+        assert cache.get("analysis", "dashboard loads slowly") is None
+        assert cache.misses == 1
+
+    def test_scope_isolation(self):
+        """Test that entries for a different corpus are not returned"""
+        cache = ResponseCache()
+        cache.set("matches", "login fails", ["PROD-1"], scope="v1")
+        assert cache.get("matches", "login fails", scope="v2") is None
+        assert cache.get("resolution", "login fails", scope="v1") is None
+
+    def test_ttl_expiry(self):
+        """Test that expired entries are not returned"""
+        cache = ResponseCache(ttl_seconds=-1)
+        cache.set("analysis", "login fails", "stale")
+        assert cache.get("analysis", "login fails") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        cache = ResponseCache(max_entries=2)
+        cache.set("analysis", "first query", 1)
+        cache.set("analysis", "second query", 2)
+        cache.get("analysis", "first query")
+        cache.set("analysis", "third query", 3)
+        assert cache.get("analysis", "second query") is None
+        assert cache.get("analysis", "first query") == 1
+
+    def test_invalidate(self):
+        """Test dropping a namespace"""
+        cache = ResponseCache()
+        cache.set("analysis", "login fails", 1)
+        cache.set("matches", "login fails", 2)
+        cache.invalidate("matches")
+        assert cache.get("matches", "login fails") is None
+        assert cache.get("analysis", "login fails") == 1
+
+
+class TestCorpusFingerprint:
+    """Test corpus fingerprints"""
+
+    def test_changes_with_updates(self):
+        """Test that updating a ticket changes the fingerprint"""
+        tickets = [{"key": "PROD-1", "updated": "a"}, {"key": "PROD-2", "updated": "b"}]
+        before = corpus_fingerprint(tickets)
+        assert corpus_fingerprint(tickets) == before
+        tickets[1]["updated"] = "c"
+        assert corpus_fingerprint(tickets) != before
+
+    def test_normalize_query(self):
+        """Test query normalisation"""
+        assert normalize_query("  Login   FAILS!! ") == "login fails!!"
+        assert normalize_query(None) == ""
@@ -0,0 +1,125 @@
+"""
+Tests for the BM25 ticket search index
+Run with: pytest tests/
+"""
+
+import pytest  # type: ignore[import-not-found]
+from src.backend.search_index import BM25Index, ticket_tokens
+from src.backend.utils import tokenize
+
+
+@pytest.fixture
+def tickets(make_ticket):
+    return [
+        make_ticket("PROD-1", "API authentication error on login", "Token expired for OAuth clients"),
+        make_ticket("PROD-2", "Dashboard loads slowly", "Charts take a long time to render"),
+        make_ticket("TECH-3", "Database connection timeout", "Authentication to the replica works"),
+    ]
+
+
+class TestTokenize:
+    """Test shared tokenisation"""
+
+    def test_tokenize_strips_punctuation(self):
+        """Test that punctuation does not stick to tokens"""
+        assert tokenize("Error, API-auth failed!") == ["error", "api", "auth", "failed"]
+
+    def test_tokenize_keeps_repeats(self):
+        """Test that repeated words are kept for term frequencies"""
+        assert tokenize("fail fail ok") == ["fail", "fail"]
+        assert tokenize(None) == []
+
+
+class TestBM25Index:
+    """Test the BM25 index"""
+
+    def test_ranking(self, tickets):
+        """Test that summary matches outrank description matches"""
+        index = BM25Index()
+        assert index.update_tickets(tickets) == 3
+
+        results = index.search("authentication error")
+        assert [key for key, _ in results][:2] == ["PROD-1", "TECH-3"]
+        assert index.search("nothing relevant here") == []
+
+    def test_incremental_update(self, tickets, make_ticket):
+        """Test that only changed tickets are reindexed"""
+        index = BM25Index()
+        index.update_tickets(tickets)
+        assert index.update_tickets(tickets) == 0
+
+        tickets[1] = make_ticket("PROD-2", "Authentication popup loops", updated="2024-05-02T10:00:00.000+0000")
+        assert index.update_tickets(tickets) == 1
+        assert "PROD-2" in [key for key, _ in index.search("authentication")]
+        assert index.search("dashboard") == []
+
+    def test_remove_and_key_filter(self, tickets):
+        """Test removal and restricting results to a key set"""
+        index = BM25Index()
+        index.update_tickets(tickets)
+
+        assert [key for key, _ in index.search("authentication", keys={"TECH-3"})] == ["TECH-3"]
+        assert index.remove("PROD-1") is True
+        assert index.remove("PROD-1") is False
+        assert "PROD-1" not in index
+        assert len(index) == 2
+
+    def test_persistence(self, tickets, tmp_path):
+        """Test saving and reloading the index"""
+        path = str(tmp_path / "index.json")
+        index = BM25Index(path)
+        index.update_tickets(tickets)
+        index.save()
+
+        reloaded = BM25Index(path)
+        assert len(reloaded) == 3
+        assert reloaded.search("authentication error") == index.search("authentication error")
+        assert reloaded.update_tickets(tickets) == 0
+
+    def test_unreadable_file_starts_empty(self, tickets, tmp_path):
+        """Test that a truncated or malformed index file is ignored and rebuilt"""
+        path = tmp_path / "index.json"
+        path.write_text('{"docs": {"PROD-1": ["2024-05-01", {"login": 2')
+        index = BM25Index(str(path))
+        assert len(index) == 0
+
+        path.write_text('{"docs": {"PROD-1": "not a document"}}')
+        assert BM25Index(str(path)).load() is False
+
+        assert index.update_tickets(tickets) == 3
+        index.save()
+        assert len(BM25Index(str(path))) == 3
+        assert [p.name for p in tmp_path.iterdir()] == ["index.json"]
+
+    def test_read_only_never_saves(self, tickets, tmp_path):
+        """Test that a read-only index loads the file but keeps updates in memory"""
+        path = str(tmp_path / "index.json")
+        writer = BM25Index(path)
+        writer.update_tickets(tickets[:2])
+        writer.save()
+
+        reader = BM25Index(path, read_only=True)
+        reader.update_tickets(tickets)
+        reader.save()
+        assert len(reader) == 3
+        assert len(BM25Index(path)) == 2
+
+    def test_reload_if_changed(self, tickets, tmp_path):
+        """Test that a reader picks up the file once another process saves it"""
+        path = str(tmp_path / "index.json")
+        writer = BM25Index(path)
+        writer.update_tickets(tickets[:1])
+        writer.save()
+
+        reader = BM25Index(path, read_only=True)
+        assert reader.reload_if_changed() is False
+        writer.update_tickets(tickets)
+        writer.save()
+        assert writer.reload_if_changed() is False
+        assert reader.reload_if_changed() is True
+        assert len(reader) == 3
+
+    def test_ticket_tokens_weights_summary(self, make_ticket):
+        """Test that summary tokens are counted twice"""
+        tokens = ticket_tokens(make_ticket("PROD-1", "login", "login"))
+        assert tokens.count("login") == 3
@@ -0,0 +1,116 @@
+"""
+Tests for the background sync scheduler
+Run with: pytest tests/
+"""
+
+import time
+
+import pytest  # type: ignore[import-not-found]
+from src.backend import sync_scheduler
+from src.backend.config_manager import ConfigSnapshot
+from src.backend.sync_scheduler import SyncScheduler
+
+
+class FakeClient:
+    """Stands in for JiraClient.sync_project"""
+
+    def __init__(self):
+        self.calls = []
+        self.failing = set()
+        self.results = {}
+
+    def sync_project(self, project, days_back=None, min_interval=None):
+        self.calls.append((project, days_back, min_interval))
+        if project in self.failing:
+            raise ConnectionError("JIRA unavailable")
+        return self.results.get(project, (1, [{"key": f"{project}-1"}]))
+
+
+@pytest.fixture
+def configure(monkeypatch):
+    def apply(**scheduler):
+        settings = {"interval_seconds": 60, "jitter": 0, "backoff_seconds": 10, "max_backoff_seconds": 25}
+        settings.update(scheduler)
+        snapshot = ConfigSnapshot({
+            "jira": {"projects": ["PROD", "TECH"], "mirror": {"backfill_days": 30, "scheduler": settings}},
+            "llm": {}
+        })
+        monkeypatch.setattr(sync_scheduler, "get_config", lambda: snapshot)
+    apply()
+    return apply
+
+
+class TestSyncScheduler:
+    """Test scheduling, backoff and index refresh"""
+
+    def test_first_run_syncs_every_project(self, configure):
+        """Test that all configured projects are synced and rescheduled"""
+        client = FakeClient()
+        scheduler = SyncScheduler(client)
+        assert scheduler.run_pending() == 2
+        assert [call[0] for call in client.calls] == ["PROD", "TECH"]
+        assert client.calls[0][1:] == (30, 30.0)
+
+        # Nothing is due until the interval has passed
+        assert scheduler.run_pending() == 0
+        assert scheduler._next_run["PROD"] == pytest.approx(time.monotonic() + 60, abs=1)
+
+    def test_project_intervals(self, configure):
+        """Test that per-project intervals override the default"""
+        configure(project_intervals={"TECH": 15})
+        scheduler = SyncScheduler(FakeClient())
+        scheduler.run_pending()
+        assert scheduler._next_run["TECH"] == pytest.approx(time.monotonic() + 15, abs=1)
+        assert scheduler._next_run["PROD"] == pytest.approx(time.monotonic() + 60, abs=1)
+
+    def test_failures_back_off(self, configure):
+        """Test that failed syncs are retried with doubling, capped delays"""
+        client = FakeClient()
+        client.failing.add("PROD")
+        scheduler = SyncScheduler(client)
+
+        delays = []
+        for _ in range(3):
+            scheduler._next_run["PROD"] = 0
+            scheduler.run_pending()
+            delays.append(scheduler._next_run["PROD"] - time.monotonic())
+        assert delays == pytest.approx([10, 20, 25], abs=1)
+
+        # A success resets the backoff
+        client.failing.clear()
+        scheduler._next_run["PROD"] = 0
+        scheduler.run_pending()
+        assert "PROD" not in scheduler._failures
+        assert scheduler.sync_all() == []
+
+    def test_refreshes_indexes_on_change(self, configure):
+        """Test that on_synced gets fetched tickets only when something changed"""
+        client = FakeClient()
+        client.results = {"PROD": (2, [{"key": "PROD-1"}, {"key": "PROD-2"}]), "TECH": (0, [{"key": "TECH-1"}])}
+        synced = []
+        scheduler = SyncScheduler(client, on_synced=lambda project, tickets: synced.append((project, len(tickets))))
+        scheduler.run_pending()
+        assert synced == [("PROD", 2)]
+
+    def test_skipped_and_removed_projects(self, configure):
+        """Test that recent syncs elsewhere are skipped and removed projects dropped"""
+        client = FakeClient()
+        client.results = {"PROD": None, "TECH": None}
+        scheduler = SyncScheduler(client, on_synced=lambda project, tickets: pytest.fail("not expected"))
+        scheduler.run_pending()
+        assert [call[0] for call in client.calls] == ["PROD", "TECH"]
+
+        scheduler._next_run["OLD"] = 0
+        scheduler.run_pending()
+        assert "OLD" not in scheduler._next_run
+
+    def test_background_thread_stops(self, configure):
+        """Test that the scheduler thread runs and stops promptly"""
+        client = FakeClient()
+        scheduler = SyncScheduler(client).start()
+        deadline = time.monotonic() + 2
+        while len(client.calls) < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        scheduler.stop(timeout=2)
+        assert len(client.calls) == 2
+        assert not scheduler._thread.is_alive()
@@ -0,0 +1,131 @@
+"""
+Tests for the local SQLite ticket mirror
+Run with: pytest tests/
+"""
+
+import pytest  # type: ignore[import-not-found]
+from src.backend import ticket_store
+from src.backend.ticket_store import TicketStore, to_timestamp
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TicketStore(str(tmp_path / "tickets.db"))
+    yield store
+    store.close()
+
+
+class TestTicketStore:
+    """Test the ticket mirror"""
+
+    def test_to_timestamp(self):
+        """Test JIRA date parsing"""
+        assert to_timestamp("2024-05-01T10:00:00.000+0000") == to_timestamp("2024-05-01T10:00:00Z")
+        assert to_timestamp(None) == 0.0
+        assert to_timestamp("not a date") == 0.0
+
+    def test_upsert_counts_only_changes(self, store, make_ticket):
+        """Test that unchanged tickets are not rewritten"""
+        tickets = [make_ticket("PROD-1"), make_ticket("TECH-2")]
+        assert store.upsert_tickets(tickets) == 2
+        assert store.upsert_tickets(tickets) == 0
+
+        tickets[0]["status"] = "Closed"
+        assert store.upsert_tickets(tickets) == 1
+
+    def test_search_filters_and_order(self, store, make_ticket):
+        """Test filtering by project, status and update time"""
+        store.upsert_tickets([
+            make_ticket("PROD-1", updated="2024-05-01T10:00:00.000+0000"),
+            make_ticket("PROD-2", status="Open", updated="2024-05-03T10:00:00.000+0000"),
+            make_ticket("TECH-1", updated="2024-05-02T10:00:00.000+0000"),
+        ])
+
+        keys = [t["key"] for t in store.search()]
+        assert keys == ["PROD-2", "TECH-1", "PROD-1"]
+
+        keys = [t["key"] for t in store.search(projects=["PROD"], statuses=["done"])]
+        assert keys == ["PROD-1"]
+
+        since = to_timestamp("2024-05-02T00:00:00.000+0000")
+        keys = [t["key"] for t in store.search(since=since, max_results=1)]
+        assert keys == ["PROD-2"]
+
+    def test_delete(self, store, make_ticket):
+        """Test removing tickets"""
+        store.upsert_tickets([make_ticket("PROD-1")])
+        assert store.delete_tickets(["PROD-1", "PROD-9"]) == 1
+        assert store.search() == []
+
+    def test_sync_state(self, store):
+        """Test per-project sync bookkeeping"""
+        assert store.get_sync_state("PROD") is None
+        store.set_sync_state("PROD", 100.0, 0.0)
+        store.set_sync_state("PROD", 200.0, 50.0)
+        assert store.get_sync_state("PROD") == {"last_sync": 200.0, "covered_since": 50.0}
+
+    def test_get_tickets_by_key(self, store, make_ticket):
+        """Test batched key lookup"""
+        store.upsert_tickets([make_ticket("PROD-1"), make_ticket("TECH-2")])
+
+        found = store.get_tickets(["TECH-2", "PROD-1", "PROD-404"])
+        assert set(found) == {"PROD-1", "TECH-2"}
+        assert found["TECH-2"]["summary"] == "Summary for TECH-2"
+        assert store.get_tickets([]) == {}
+
+    def test_rollups_follow_upserts_and_deletes(self, store, make_ticket):
+        """Test that statistics buckets are maintained incrementally"""
+        store.upsert_tickets([
+            make_ticket("PROD-1", status="Open", priority="High"),
+            make_ticket("PROD-2", status="Done", resolution="Fixed"),
+            make_ticket("TECH-1", status="Done", issue_type="Task")
+        ])
+        stats = store.get_statistics()
+        assert stats["total_tickets"] == 3
+        assert stats["resolved_tickets"] == 1
+        assert stats["by_status"] == {"Open": 1, "Done": 2}
+        assert stats["by_priority"] == {"High": 1, "Medium": 2}
+        assert stats["by_type"] == {"Bug": 2, "Task": 1}
+
+        store.upsert_tickets([make_ticket("PROD-1", status="Done", priority="High")])
+        store.delete_tickets(["TECH-1"])
+        stats = store.get_statistics(projects=["PROD"])
+        assert stats["by_status"] == {"Done": 2}
+        assert stats["by_project"] == {"PROD": 2}
+
+    def test_rollups_window_by_day(self, store, make_ticket):
+        """Test summing only the buckets inside the window"""
+        store.upsert_tickets([
+            make_ticket("PROD-1", updated="2024-05-01T12:00:00.000+0000"),
+            make_ticket("PROD-2", updated="2024-06-01T12:00:00.000+0000")
+        ])
+        assert store.get_statistics(since_day="2024-05-15")["total_tickets"] == 1
+        assert store.get_statistics(since_day="2024-07-01")["total_tickets"] == 0
+
+    def test_rebuild_rollups(self, store, make_ticket):
+        """Test recomputing buckets from scratch"""
+        store.upsert_tickets([make_ticket("PROD-1"), make_ticket("PROD-2")])
+        before = store.get_statistics()
+        store.rebuild_rollups()
+        assert store.get_statistics() == before
+
+    def test_search_projects_keys(self, store, make_ticket):
+        """Test returning only some ticket keys"""
+        store.upsert_tickets([make_ticket("PROD-1", labels=["api"], comments=[{"body": "x"}])])
+        assert store.search(keys=["key", "status", "labels"]) == [
+            {"key": "PROD-1", "status": "Done", "labels": ["api"]}
+        ]
+
+    def test_search_projects_value_types(self, store, make_ticket):
+        """Test that projected strings, nulls, numbers and missing keys keep their JSON types"""
+        store.upsert_tickets([make_ticket("PROD-1", summary='{"not": "an object"}', resolution=None, votes=3)])
+        assert store.search(keys=["summary", "resolution", "votes", "missing"]) == [
+            {"summary": '{"not": "an object"}', "resolution": None, "votes": 3, "missing": None}
+        ]
+
+    def test_old_sqlite_is_rejected(self, tmp_path, monkeypatch):
+        """Test that an SQLite without upserts fails at startup with a clear error"""
+        monkeypatch.setattr(ticket_store.sqlite3, "sqlite_version_info", (3, 31, 1))
+        monkeypatch.setattr(ticket_store.sqlite3, "sqlite_version", "3.31.1")
+        with pytest.raises(RuntimeError, match="3.35.0 or newer.*3.31.1"):
+            TicketStore(str(tmp_path / "tickets.db"))
@@ -0,0 +1,118 @@
+"""
+Tests for ticket records and the keyed ticket collection
+Run with: pytest tests/
+"""
+
+import json
+
+import pytest  # type: ignore[import-not-found]
+from src.backend.tickets import Ticket, TicketCollection, to_jsonable
+
+
+def make_tickets(*keys):
+    return [{"key": key, "summary": f"Summary for {key}"} for key in keys]
+
+
+class TestTicketCollection:
+    """Test ordered, keyed ticket access"""
+
+    def test_list_behaviour(self):
+        """Test iteration order, length, indexing and slicing"""
+        tickets = TicketCollection(make_tickets("PROD-2", "PROD-1", "TECH-9"))
+        assert [t["key"] for t in tickets] == ["PROD-2", "PROD-1", "TECH-9"]
+        assert len(tickets) == 3
+        assert tickets[0]["key"] == "PROD-2"
+        assert tickets[-1]["key"] == "TECH-9"
+        assert list(tickets[:2].keys()) == ["PROD-2", "PROD-1"]
+        assert tickets == make_tickets("PROD-2", "PROD-1", "TECH-9")
+
+    def test_key_lookup(self):
+        """Test lookup and membership by key"""
+        tickets = TicketCollection(make_tickets("PROD-1", "TECH-9"))
+        assert tickets["TECH-9"]["summary"] == "Summary for TECH-9"
+        assert tickets.get("PROD-404") is None
+        assert "PROD-1" in tickets
+        assert {"key": "TECH-9"} in tickets
+        assert "PROD-404" not in tickets
+        with pytest.raises(KeyError):
+            tickets["PROD-404"]
+
+    def test_duplicate_key_replaces_in_place(self):
+        """Test that re-adding a key keeps its position"""
+        tickets = TicketCollection(make_tickets("PROD-1", "PROD-2"))
+        tickets.append({"key": "PROD-1", "summary": "Updated"})
+        assert list(tickets.keys()) == ["PROD-1", "PROD-2"]
+        assert tickets[0]["summary"] == "Updated"
+
+    def test_of_reuses_collections(self):
+        """Test that existing collections are not re-indexed"""
+        tickets = TicketCollection(make_tickets("PROD-1"))
+        assert TicketCollection.of(tickets) is tickets
+        assert isinstance(TicketCollection.of(make_tickets("PROD-1")), TicketCollection)
+        assert tickets.to_list() == make_tickets("PROD-1")
+
+
+class TestTicket:
+    """Test the compact ticket record"""
+
+    def ticket_dict(self, comments=None):
+        return {
+            "key": "PROD-7",
+            "summary": "Login fails",
+            "description": "Users cannot log in",
+            "issue_type": "Bug",
+            "status": "Done",
+            "resolution": "Fixed",
+            "created": "2024-05-01T10:00:00.000+0000",
+            "updated": "2024-05-02T10:00:00.000+0000",
+            "priority": "High",
+            "assignee": "Jane Smith",
+            "reporter": "John Doe",
+            "labels": ["auth"],
+            "url": "https://example.atlassian.net/browse/PROD-7",
+            "comments": comments or []
+        }
+
+    def test_round_trip(self):
+        """Test that to_dict reproduces the format_ticket shape"""
+        data = self.ticket_dict([{"author": "Jane Smith", "body": "Fixed it", "created": "2024-05-02"}])
+        ticket = Ticket.from_dict(data)
+        assert ticket.to_dict() == data
+        assert json.loads(json.dumps(ticket, default=to_jsonable)) == data
+
+    def test_partial_ticket_keeps_only_fetched_fields(self):
+        """Test that a ticket fetched with a field profile emits only those fields"""
+        data = {"key": "PROD-7", "status": "Done", "resolution": None, "labels": [], "url": "https://x/PROD-7"}
+        ticket = Ticket.from_dict(data)
+        assert ticket.to_dict() == data
+        assert TicketCollection([ticket]).to_list() == [data]
+        assert list(ticket) == list(data)
+        assert "description" not in ticket
+        assert ticket.get("description", "missing") == "missing"
+        assert len(Ticket("PROD-8").to_dict()) == 14
+
+    def test_reads_like_a_dict(self):
+        """Test mapping access used throughout the agent and API"""
+        ticket = Ticket.from_dict(self.ticket_dict())
+        assert ticket["key"] == "PROD-7"
+        assert ticket.get("status") == "Done"
+        assert ticket.get("missing", "default") == "default"
+        assert {**ticket}["priority"] == "High"
+        assert ticket.project == "PROD"
+        assert not hasattr(ticket, "__dict__")
+
+    def test_interns_repeated_strings(self):
+        """Test that tickets share status and label strings"""
+        first = Ticket.from_dict(json.loads(json.dumps(self.ticket_dict())))
+        second = Ticket.from_dict(json.loads(json.dumps(self.ticket_dict())))
+        assert first.status is second.status
+        assert first.labels[0] is second.labels[0]
+
+    def test_comments_decoded_on_access(self):
+        """Test large comment lists are stored compressed and decoded lazily"""
+        comments = [{"author": "Jane Smith", "body": "x" * 500, "created": "2024-05-02"}] * 3
+        ticket = Ticket.from_dict(self.ticket_dict(comments))
+        assert isinstance(ticket._comments, bytes)
+        assert len(ticket._comments) < len(json.dumps(comments))
+        assert [c.get("body") for c in ticket["comments"]] == ["x" * 500] * 3
+        assert Ticket("PROD-8").comments == []
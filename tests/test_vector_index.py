@@ -0,0 +1,160 @@
+"""
+Tests for the hashed-embedding vector index
+Run with: pytest tests/
+"""
+
+import json
+import os
+
+import pytest  # type: ignore[import-not-found]
+
+np = pytest.importorskip("numpy")
+
+from src.backend.vector_index import HashingVectorizer, VectorIndex  # noqa: E402
+
+
+@pytest.fixture
+def tickets(make_ticket):
+    return [
+        make_ticket("PROD-1", "Users cannot authenticate with SSO", "Login redirect loops"),
+        make_ticket("PROD-2", "Dashboard charts render slowly", "Large datasets take minutes"),
+        make_ticket("TECH-3", "Database connection pool exhausted", "Timeouts under load"),
+    ]
+
+
+class TestHashingVectorizer:
+    """Test the hashing vectoriser"""
+
+    def test_normalised_and_stable(self):
+        """Test that vectors are unit length and deterministic"""
+        vectorizer = HashingVectorizer(dim=256)
+        a = vectorizer.transform_text("authentication failure")
+        b = vectorizer.transform_text("authentication failure")
+        assert a.shape == (256,)
+        assert np.isclose(np.linalg.norm(a), 1.0)
+        assert np.array_equal(a, b)
+
+    def test_subword_overlap(self):
+        """Test that related word forms are closer than unrelated words"""
+        vectorizer = HashingVectorizer()
+        base = vectorizer.transform_text("authentication")
+        related = vectorizer.transform_text("authenticate")
+        unrelated = vectorizer.transform_text("dashboard")
+        assert base @ related > base @ unrelated
+
+
+class TestVectorIndex:
+    """Test the vector index"""
+
+    def test_search(self, tickets):
+        """Test ranking by cosine similarity"""
+        index = VectorIndex(dim=512)
+        assert index.update_tickets(tickets) == 3
+        assert index.update_tickets(tickets) == 0
+
+        results = index.search("sso authentication fails", top_k=2)
+        assert results[0][0] == "PROD-1"
+        assert len(results) <= 2
+
+        results = index.search("database timeouts", keys={"PROD-2", "TECH-3"})
+        assert results[0][0] == "TECH-3"
+
+    def test_remove_reuses_rows(self, tickets):
+        """Test that removed rows are recycled"""
+        index = VectorIndex(dim=128)
+        index.update_tickets(tickets)
+        assert index.remove("PROD-2") is True
+        assert "PROD-2" not in index
+        index.add("SUP-4", ["printer", "offline"])
+        assert len(index) == 3
+        assert index.search("printer")[0][0] == "SUP-4"
+
+    def test_persistence_is_memory_mapped(self, tickets, tmp_path):
+        """Test that a saved index reloads as a memory-mapped float16 matrix"""
+        path = str(tmp_path / "vectors")
+        index = VectorIndex(path, dim=128)
+        index.update_tickets(tickets)
+        index.save()
+
+        reloaded = VectorIndex(path, dim=128)
+        assert isinstance(reloaded._matrix, np.memmap)
+        assert reloaded._matrix.dtype == np.float16
+        assert len(reloaded) == 3
+        assert reloaded.search("dashboard charts")[0][0] == "PROD-2"
+        assert reloaded.update_tickets(tickets) == 0
+
+    def test_processes_sharing_files_keep_their_rows(self, tickets, tmp_path):
+        """Test that instances on one path never write into each other's vectors"""
+        path = str(tmp_path / "vectors")
+        index = VectorIndex(path, dim=128)
+        index.update_tickets(tickets)
+        index.save()
+
+        first = VectorIndex(path, dim=128)
+        second = VectorIndex(path, dim=128)
+        first.add("B-1", ["printer", "offline"])
+        second.add("C-1", ["payment", "gateway"])
+        second.save()
+
+        assert first.search("payment gateway", keys={"B-1"}) == []
+        assert first.search("printer offline")[0][0] == "B-1"
+        reloaded = VectorIndex(path, dim=128)
+        assert "C-1" in reloaded and "B-1" not in reloaded
+        assert reloaded.search("payment gateway")[0][0] == "C-1"
+
+    def test_save_replaces_generation(self, tickets, tmp_path):
+        """Test that saving leaves one matrix file and no temporary files"""
+        path = str(tmp_path / "vectors")
+        index = VectorIndex(path, dim=128)
+        index.update_tickets(tickets)
+        index.save()
+        index.add("SUP-4", ["printer", "offline"])
+        index.save()
+
+        assert sorted(os.listdir(tmp_path)) == sorted(["vectors.json", f"vectors.{index._generation}.npy"])
+
+    def test_mismatched_files_are_rebuilt(self, tickets, tmp_path):
+        """Test that a key map not matching its matrix is ignored"""
+        path = str(tmp_path / "vectors")
+        index = VectorIndex(path, dim=128)
+        index.update_tickets(tickets)
+        index.save()
+
+        with open(f"{path}.json") as f:
+            meta = json.load(f)
+        meta["keys"].append("PROD-9")
+        meta["rows"] += 1
+        with open(f"{path}.json", "w") as f:
+            json.dump(meta, f)
+
+        reloaded = VectorIndex(path, dim=128)
+        assert len(reloaded) == 0
+        assert reloaded.update_tickets(tickets) == 3
+
+        with open(f"{path}.json", "w") as f:
+            f.write('{"dim": 128, "dtype": "float16", "keys": [')
+        assert len(VectorIndex(path, dim=128)) == 0
+
+    def test_read_only_never_saves(self, tickets, tmp_path):
+        """Test that a read-only index never writes the shared files"""
+        path = str(tmp_path / "vectors")
+        reader = VectorIndex(path, dim=128, read_only=True)
+        reader.update_tickets(tickets)
+        reader.save()
+        assert len(reader) == 3
+        assert os.listdir(tmp_path) == []
+
+    def test_reload_if_changed(self, tickets, tmp_path):
+        """Test that a reader maps the new generation once another process saves"""
+        path = str(tmp_path / "vectors")
+        writer = VectorIndex(path, dim=128)
+        writer.update_tickets(tickets[:1])
+        writer.save()
+
+        reader = VectorIndex(path, dim=128, read_only=True)
+        assert reader.reload_if_changed() is False
+        writer.update_tickets(tickets)
+        writer.save()
+        assert writer.reload_if_changed() is False
+        assert reader.reload_if_changed() is True
+        assert reader.search("database timeouts")[0][0] == "TECH-3"
@@ -0,0 +1,192 @@
+"""
+Tests for JIRA webhook ingestion
+Run with: pytest tests/
+"""
+
+import hashlib
+import hmac
+import time
+
+import pytest  # type: ignore[import-not-found]
+from src.backend import webhooks
+from src.backend.config_manager import ConfigSnapshot
+from src.backend.ticket_store import TicketStore
+from src.backend.webhooks import WebhookIngester, verify_signature
+
+FIELDS = ["summary", "description", "issuetype", "status", "updated", "comment"]
+
+
+def issue_event(key, summary="Login fails", updated="2024-05-01T10:00:00.000+0000", event="jira:issue_updated", **fields):
+    return {
+        "webhookEvent": event,
+        "issue": {
+            "key": key,
+            "fields": {"summary": summary, "status": {"name": "Open"}, "updated": updated, **fields}
+        }
+    }
+
+
+@pytest.fixture
+def configure(monkeypatch):
+    def apply(**settings):
+        snapshot = ConfigSnapshot({
+            "jira": {
+                "projects": ["PROD"],
+                "fields": FIELDS,
+                "mirror": {"webhooks": {"debounce_seconds": 0.05, "max_delay_seconds": 1, **settings}}
+            },
+            "llm": {}
+        })
+        monkeypatch.setattr(webhooks, "get_config", lambda: snapshot)
+    apply()
+    return apply
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = TicketStore(str(tmp_path / "tickets.db"))
+    yield store
+    store.close()
+
+
+class TestWebhookIngester:
+    """Test applying webhook events to the mirror"""
+
+    def test_burst_collapses_to_one_write(self, configure, store):
+        """Test that repeated edits of an issue are written once, newest last"""
+        indexed = []
+        ingester = WebhookIngester(store, "https://jira.example.com", on_upserted=indexed.append)
+        for i in range(5):
+            ingester.submit(issue_event("PROD-1", summary=f"Edit {i}", updated=f"2024-05-01T10:0{i}:00.000+0000"))
+        ingester.submit(issue_event("PROD-2", event="jira:issue_created"))
+        assert ingester.pending == 2
+
+        assert ingester.flush() == (2, 0)
+        assert store.get_tickets(["PROD-1"])["PROD-1"]["summary"] == "Edit 4"
+        assert len(indexed) == 1 and len(indexed[0]) == 2
+        assert ingester.flush() == (0, 0)
+
+    def test_partial_payload_keeps_mirrored_fields(self, configure, store):
+        """Test that fields missing from the payload are kept from the mirror"""
+        store.upsert_tickets([{
+            "key": "PROD-1", "summary": "Old", "description": "Steps to reproduce",
+            "updated": "2024-05-01T09:00:00.000+0000",
+            "comments": [{"author": "Ann", "body": "Seen it", "created": "2024-05-01T09:00:00.000+0000"}]
+        }])
+        ingester = WebhookIngester(store, "https://jira.example.com")
+        ingester.submit(issue_event("PROD-1", summary="New"))
+        ingester.flush()
+
+        ticket = store.get_tickets(["PROD-1"])["PROD-1"]
+        assert ticket["summary"] == "New"
+        assert ticket["status"] == "Open"
+        assert ticket["description"] == "Steps to reproduce"
+        assert len(ticket["comments"]) == 1
+
+    def test_out_of_order_events(self, configure, store):
+        """Test that an older version never replaces a newer one"""
+        ingester = WebhookIngester(store, None)
+        ingester.submit(issue_event("PROD-1", summary="Newer", updated="2024-05-01T11:00:00.000+0000"))
+        ingester.submit(issue_event("PROD-1", summary="Older", updated="2024-05-01T10:00:00.000+0000"))
+        ingester.flush()
+        assert store.get_tickets(["PROD-1"])["PROD-1"]["summary"] == "Newer"
+
+    def test_comment_events(self, configure, store):
+        """Test that comment events add, edit and remove mirrored comments"""
+        ingester = WebhookIngester(store, None)
+        comment = {"author": {"displayName": "Ann"}, "body": "Restarted it", "created": "2024-05-01T10:00:00.000+0000"}
+        ingester.submit({**issue_event("PROD-1"), "issue_event_type_name": "issue_commented", "comment": comment})
+        ingester.submit({
+            **issue_event("PROD-1"), "issue_event_type_name": "issue_comment_edited",
+            "comment": {**comment, "body": "Restarted the service"}
+        })
+        ingester.flush()
+        assert [c["body"] for c in store.get_tickets(["PROD-1"])["PROD-1"]["comments"]] == ["Restarted the service"]
+
+        ingester.submit({**issue_event("PROD-1"), "issue_event_type_name": "issue_comment_deleted", "comment": comment})
+        ingester.flush()
+        assert store.get_tickets(["PROD-1"])["PROD-1"]["comments"] == []
+
+    def test_delete(self, configure, store):
+        """Test that deleted issues leave the mirror and the indexes"""
+        store.upsert_tickets([{"key": "PROD-1", "summary": "Gone soon"}])
+        removed = []
+        ingester = WebhookIngester(store, None, on_deleted=removed.extend)
+        ingester.submit({"webhookEvent": "jira:issue_deleted", "issue": {"key": "PROD-1"}})
+        assert ingester.flush() == (0, 1)
+        assert store.get_tickets(["PROD-1"]) == {}
+        assert removed == ["PROD-1"]
+
+    @pytest.mark.parametrize("failing", ["upsert_tickets", "delete_tickets"])
+    def test_failed_write_is_requeued(self, configure, store, monkeypatch, failing):
+        """Test that a batch the mirror rejects is kept, ahead of newer events, for the next flush"""
+        store.upsert_tickets([{"key": "PROD-9", "summary": "Gone soon"}])
+        ingester = WebhookIngester(store, None)
+        ingester.submit(issue_event("PROD-1", summary="First", updated="2024-05-01T10:00:00.000+0000"))
+        ingester.submit({"webhookEvent": "jira:issue_deleted", "issue": {"key": "PROD-9"}})
+
+        write = getattr(store, failing)
+        monkeypatch.setattr(store, failing, lambda *args: (_ for _ in ()).throw(OSError("disk I/O error")))
+        with pytest.raises(OSError):
+            ingester.flush()
+        assert ingester.pending == 2
+
+        ingester.submit(issue_event("PROD-1", summary="Second", updated="2024-05-01T11:00:00.000+0000"))
+        monkeypatch.setattr(store, failing, write)
+        # A delete that went through before the failure is simply repeated
+        assert ingester.flush()[0] == 1
+        assert list(store.get_tickets(["PROD-1", "PROD-9"])) == ["PROD-1"]
+        assert store.get_tickets(["PROD-1"])["PROD-1"]["summary"] == "Second"
+        assert ingester.pending == 0
+
+    def test_ignored_events(self, configure, store):
+        """Test that other events and projects are not queued"""
+        ingester = WebhookIngester(store, None)
+        assert ingester.submit({"webhookEvent": "sprint_started"}) is None
+        assert ingester.submit(issue_event("OTHER-1")) is None
+        assert ingester.submit(issue_event("prod-7")) == "PROD-7"
+        assert ingester.pending == 1
+
+    def test_background_thread_debounces(self, configure, store):
+        """Test that the background thread writes once the burst settles, and on stop"""
+        ingester = WebhookIngester(store, None).start()
+        try:
+            ingester.submit(issue_event("PROD-1"))
+            deadline = time.monotonic() + 2
+            while ingester.pending and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert "PROD-1" in store.get_tickets(["PROD-1"])
+
+            configure(debounce_seconds=60, max_delay_seconds=60)
+            ingester.submit(issue_event("PROD-2"))
+        finally:
+            ingester.stop(timeout=2)
+        assert "PROD-2" in store.get_tickets(["PROD-2"])
+
+    def test_max_batch_writes_at_once(self, configure, store):
+        """Test that a full batch does not wait for the debounce"""
+        configure(debounce_seconds=60, max_delay_seconds=60, max_batch=3)
+        ingester = WebhookIngester(store, None).start()
+        try:
+            for i in range(3):
+                ingester.submit(issue_event(f"PROD-{i}"))
+            deadline = time.monotonic() + 2
+            while ingester.pending and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert len(store.get_tickets(["PROD-0", "PROD-1", "PROD-2"])) == 3
+        finally:
+            ingester.stop(timeout=2)
+
+
+class TestVerifySignature:
+    """Test webhook signature checks"""
+
+    def test_signature(self):
+        """Test that only an HMAC of the body with the secret is accepted"""
+        body = b'{"webhookEvent": "jira:issue_updated"}'
+        digest = hmac.new(b"s3cret", body, hashlib.sha256).hexdigest()
+        assert verify_signature(body, f"sha256={digest}", "s3cret")
+        assert not verify_signature(body, f"sha256={digest}", "other")
+        assert not verify_signature(body + b" ", f"sha256={digest}", "s3cret")
+        assert not verify_signature(body, None, "s3cret")
+        assert not verify_signature(body, f"md5={digest}", "s3cret")